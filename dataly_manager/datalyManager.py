@@ -1,5 +1,6 @@
 #datalyManager.py
 import streamlit as st
+import importlib
 import os
 import sys
 
@@ -9,16 +10,9 @@ ROOT_DIR = os.path.dirname(APP_DIR)
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-# 절대 임포트로 통일
-from dataly_manager.ui.table_to_excel_ui import render_table_to_excel
-from dataly_manager.ui.photo_to_excel_ui import render_photo_to_excel
-from dataly_manager.ui.home_ui import render_home_ui
-from dataly_manager.ui.wsd_to_excel_ui import render_wsd_to_excel_ui
-from dataly_manager.ui.srl_argument_del_ui import render_srl_argument_del_ui
-from dataly_manager.ui.final_json_to_excel_ui import render_final_json_to_excel
 
-
-st.markdown("""
+# 정적 CSS/푸터: 모듈 상수로 한 번만 만들고, st.html이 있으면 마크다운 처리 없이 전달
+APP_CSS = """
     <style>
     .main-title {font-size:2.1rem; font-weight:bold; color:#174B99; margin-bottom:0;}
     .sub-desc {font-size:1.1rem; color:#222;}
@@ -27,7 +21,25 @@ st.markdown("""
     div.stButton > button:first-child {background:#174B99; color:white; font-weight:bold; border-radius:8px;}
     .stTabs [data-baseweb="tab-list"] {background:#F6FAFD;}
     </style>
-""", unsafe_allow_html=True)
+"""
+
+FOOTER_HTML = """
+<hr>
+<div class="footer">
+문의: 검증 엔지니어 | Powered by Streamlit<br>
+Copyright &copy; 2025. All rights reserved.
+</div>
+"""
+
+
+def _render_html(html):
+    if hasattr(st, "html"):
+        st.html(html)
+    else:  # 구버전 Streamlit
+        st.markdown(html, unsafe_allow_html=True)
+
+
+_render_html(APP_CSS)
 
 col1, col2 = st.columns([0.15, 0.85])
 with col1:
@@ -36,45 +48,30 @@ with col2:
     st.markdown('<div class="main-title">Dataly Manager</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-desc">업무 자동화, 평가 데이터 변환, 관리, 수합 웹앱</div>', unsafe_allow_html=True)
 
-tabs = st.tabs([
-    "🏠 홈",
-    "📊 표 변환 (JSON→Excel)",
-    "🖼️ 사진 변환 (JSON→Excel)",
-    "✅ 최종 사진 JSON → Excel",
-    "🧹 SRL 불필요 값 삭제",
-    "📄 SRL_ZA 변환 (JSON→Excel)"
-])
+# 탭 구성: (탭 이름, UI 모듈, 렌더 함수명) — 탭 추가/삭제는 여기서만
+TAB_CONFIG = [
+    ("🏠 홈", "dataly_manager.ui.home_ui", "render_home_ui"),
+    ("📊 표 변환 (JSON→Excel)", "dataly_manager.ui.table_to_excel_ui", "render_table_to_excel"),
+    ("🖼️ 사진 변환 (JSON→Excel)", "dataly_manager.ui.photo_to_excel_ui", "render_photo_to_excel"),
+    ("✅ 최종 사진 JSON → Excel", "dataly_manager.ui.final_json_to_excel_ui", "render_final_json_to_excel"),
+    ("🧹 SRL 불필요 값 삭제", "dataly_manager.ui.srl_argument_del_ui", "render_srl_argument_del_ui"),   # SRL 인자 정리
+    ("📄 SRL_ZA 변환 (JSON→Excel)", "dataly_manager.ui.wsd_to_excel_ui", "render_wsd_to_excel_ui"),   # WSD/DP/SRL/ZA → 엑셀
+]
 
-# 홈 - home_ui.py 사용
-with tabs[0]:
-    render_home_ui()
 
-# 표 변환 (JSON→Excel) — table_to_excel.py 사용
-with tabs[1]:
-    render_table_to_excel()
+def _render_tab(module_name, func_name):
+    # 두 번째부터는 sys.modules에 캐시된 모듈을 그대로 사용
+    getattr(importlib.import_module(module_name), func_name)()
 
-# 사진 변환 (JSON→Excel) — photo_to_excel.py 사용
-with tabs[2]:
-    render_photo_to_excel()
 
-with tabs[3]:
-    render_final_json_to_excel()     # ✅ 추가
+# 모든 탭을 매번 렌더링 (건너뛴 탭은 업로드/입력 위젯 상태가 사라지므로 탭 전환 시에도 유지되도록)
+tabs = st.tabs([label for label, _, _ in TAB_CONFIG])
 
-# 새 탭: SRL 인자 정리
-with tabs[4]:
-    render_srl_argument_del_ui()
+for tab, (_, module_name, func_name) in zip(tabs, TAB_CONFIG):
+    with tab:
+        _render_tab(module_name, func_name)
 
-# ✅ WSD/DP/SRL/ZA → 엑셀 변환
-with tabs[5]:
-    render_wsd_to_excel_ui()
-
-st.markdown("""
-<hr>
-<div class="footer">
-문의: 검증 엔지니어 | Powered by Streamlit<br>
-Copyright &copy; 2025. All rights reserved.
-</div>
-""", unsafe_allow_html=True)
+_render_html(FOOTER_HTML)
 
 # st.markdown("""
 # <style>
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+엑셀(.xlsx) 읽기 헬퍼
+- pd.read_excel(ef, sheet_name=...)과 같은 {시트명: DataFrame}을 반환
+- openpyxl read-only로 값만 훑고, keep(헤더명)이 True인 열만 DataFrame으로 만듦
+  (셀 변환/행 정리/타입 추론은 pandas openpyxl 리더와 동일하게 맞춤)
+- openpyxl로 열 수 없는 파일(.xls 등)은 pd.read_excel로 폴백
+"""
+import zipfile
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+
+def _convert(v):
+    # pandas OpenpyxlReader._convert_cell과 같은 규칙 (빈 셀 "", 정수값 float → int)
+    if v is None:
+        return ""
+    if type(v) is float:
+        iv = int(v)
+        return iv if iv == v else v
+    return v
+
+
+def _header_names(header: List) -> List[str]:
+    # pandas 헤더 규칙: 빈 이름은 "Unnamed: i", 중복은 "x.1", "x.2" ...
+    names, seen = [], {}
+    for i, h in enumerate(header):
+        name = str(h) if h != "" else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _sheet_to_frame(ws, keep: Optional[Callable[[str], bool]]) -> pd.DataFrame:
+    ws.reset_dimensions()  # read-only 시트의 잘못된 dimension 정보 무시 (pandas와 동일)
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    header = [_convert(v) for v in header]
+    while header and header[-1] == "":
+        header.pop()
+    # 헤더 밖의 열(pandas에서는 "Unnamed: k")은 포함하지 않음
+    names = _header_names(header)
+    idx = [i for i, name in enumerate(names) if keep is None or keep(name)]
+
+    body, last_with_data = [], -1
+    for row in rows:
+        if any(v is not None and v != "" for v in row):
+            last_with_data = len(body)
+        body.append([_convert(row[i]) if i < len(row) else "" for i in idx])
+    del body[last_with_data + 1:]  # 끝의 빈 행 제거 (중간 빈 행은 pandas처럼 유지)
+
+    if not idx:
+        return pd.DataFrame(index=pd.RangeIndex(len(body)))
+
+    data = [[names[i] for i in idx]] + body
+    try:
+        return TextParser(data, header=0, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def read_sheets(
+    ef,
+    sheet_names: Optional[Iterable[str]] = None,
+    keep: Optional[Callable[[str], bool]] = None,
+    ignore_missing: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    ef의 시트를 {시트명: DataFrame}으로 읽음 (sheet_names=None이면 모든 시트, 순서 유지).
+    - sheet_names에 없는 시트가 있으면 pd.read_excel처럼 ValueError (ignore_missing=True면 건너뜀)
+    - keep이 주어지면 헤더명이 keep(name)을 만족하는 열만 포함
+    """
+    try:
+        wb = load_workbook(ef, read_only=True, data_only=True, keep_links=False)
+    except (InvalidFileException, zipfile.BadZipFile):
+        ef.seek(0)
+        if sheet_names is None or ignore_missing:
+            sheets = pd.read_excel(ef, sheet_name=None)
+            if sheet_names is not None:
+                sheets = {nm: sheets[nm] for nm in sheet_names if nm in sheets}
+        else:
+            sheets = pd.read_excel(ef, sheet_name=list(sheet_names))
+        if keep is None:
+            return sheets
+        return {nm: df[[c for c in df.columns if keep(str(c))]] for nm, df in sheets.items()}
+
+    try:
+        names = wb.sheetnames if sheet_names is None else list(sheet_names)
+        out = {}
+        for nm in names:
+            if nm not in wb.sheetnames:
+                if ignore_missing:
+                    continue
+                raise ValueError(f"Worksheet named '{nm}' not found")
+            out[nm] = _sheet_to_frame(wb[nm], keep)
+        return out
+    finally:
+        wb.close()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 로드/덤프 헬퍼
+- orjson이 설치되어 있으면 사용, 없으면 표준 json으로 폴백
+- dumps()는 json.dumps(obj, ensure_ascii=False, indent=2)와 같은 형태의 문자열 반환
+  (dumps_bytes()는 같은 내용을 UTF-8 bytes로 — orjson 결과를 decode/encode 하지 않음)
+- iter_items()는 ijson이 있으면 전체 트리를 만들지 않고 항목 단위로 스트리밍
+- looks_like_json()은 앞부분만 보고 JSON 객체/배열이 아닌 업로드를 빠르게 걸러냄
+"""
+import codecs
+import json
+from io import BytesIO
+from typing import Any, Iterator, Union
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # 선택 의존성
+    ijson = None
+
+
+def loads(raw: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """bytes/str JSON 파싱 (orjson 우선)"""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # BOM/NaN 등 표준 json만 허용하는 입력은 폴백
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    return json.loads(raw)
+
+
+def dumps(obj: Any) -> str:
+    """들여쓰기 2칸, 비ASCII 그대로 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass  # 64비트 초과 정수 등은 폴백
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """dumps()와 같은 내용을 UTF-8 bytes로 반환 (파일/ZIP 쓰기, 다운로드용)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # 64비트 초과 정수 등은 폴백
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+_JSON_WS = b" \t\r\n"
+_SNIFF_BYTES = 4096
+
+
+def looks_like_json(raw: Union[bytes, bytearray, memoryview]) -> bool:
+    """
+    BOM/공백을 건너뛴 첫 글자가 '{' 또는 '['인지 확인 (전체를 파싱하지 않음).
+    - 앞부분이 모두 공백이면 판단을 보류하고 True (실제 파싱에서 판정)
+    """
+    head = bytes(raw[:_SNIFF_BYTES])
+    if head.startswith(codecs.BOM_UTF8):
+        head = head[3:]
+    head = head.lstrip(_JSON_WS)
+    if not head:
+        return len(raw) > _SNIFF_BYTES
+    return head[:1] in (b"{", b"[")
+
+
+def iter_items(raw: Union[bytes, bytearray, memoryview], prefix: str) -> Iterator[Any]:
+    """
+    raw JSON에서 prefix 경로(ijson 표기, 예: "document.item")의 항목을 하나씩 반환.
+    - 경로가 없거나 타입이 다르면 아무것도 반환하지 않음
+    - 파싱 오류는 ValueError로 통일
+    """
+    if ijson is None:
+        yield from _walk_prefix(loads(raw), prefix.split(".") if prefix else [])
+        return
+
+    # bytes는 BytesIO가 복사 없이 공유하므로 BOM은 잘라내지 않고 건너뜀
+    stream = BytesIO(raw)
+    if bytes(raw[:3]) == codecs.BOM_UTF8:
+        stream.seek(3)
+    try:
+        yield from ijson.items(stream, prefix, use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+
+def _walk_prefix(obj: Any, parts) -> Iterator[Any]:
+    if not parts:
+        yield obj
+        return
+    head, rest = parts[0], parts[1:]
+    if head == "item":
+        if isinstance(obj, list):
+            for it in obj:
+                yield from _walk_prefix(it, rest)
+    elif isinstance(obj, dict) and head in obj:
+        yield from _walk_prefix(obj[head], rest)
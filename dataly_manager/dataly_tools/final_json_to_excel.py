@@ -20,7 +20,6 @@
   EX[].exp_sentence 내부에 "[Type] sentence" 혹은 "sentence" 문자열들
 """
 
-import json
 import math
 import re
 import zipfile
@@ -28,11 +27,17 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple, Optional, Union
 from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
 
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+
+from dataly_manager.dataly_tools import excel_read, fast_json
 
 # 표시 순서(메타 키)
 META_ORDER = [
@@ -40,6 +45,10 @@ META_ORDER = [
     "title", "url", "Medium_category", "domain", "media_id",
     "publisher", "term", "source_id",
 ]
+# metadata 셀 문자열 틀 (META_ORDER 순서, 마지막 줄만 쉼표 없음)
+META_CELL_PREFIX = "metadata : "
+_META_CELL_TEMPLATE = META_CELL_PREFIX + "{{\n" + ",\n".join(f'  "{k}": "{{}}"' for k in META_ORDER) + "\n}}"
+_META_URL_IDX = META_ORDER.index("url")
 
 _ILLEGAL_XML_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
 
@@ -49,9 +58,18 @@ THIN_BORDER = Border(
 )
 HEADER_FILL = PatternFill(start_color="EEECE1", end_color="EEECE1", fill_type="solid")
 LINK_BLUE = "0563C1"
+TOP_ALIGN = Alignment(vertical="top")
+WRAP_ALIGN = Alignment(vertical="top", wrap_text=True)
+HEADER_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
+# 병합 범위 안쪽 칸 테두리 (merge_cells가 만드는 MergedCell과 동일: 좌/우, 마지막 행은 아래 포함)
+MERGED_MID_BORDER = Border(left=Side(style="thin"), right=Side(style="thin"))
+MERGED_END_BORDER = Border(left=Side(style="thin"), right=Side(style="thin"), bottom=Side(style="thin"))
+LINK_FONT = Font(color=LINK_BLUE, underline="none")  # 밑줄 끄기: 일부 버전은 None 대신 "none"이 안전
 
 # [타입] 문장 형태 파싱용 ([Type] 내용)
 TYPE_BRACKET_RE = re.compile(r"^\s*\[(.+?)\]\s*(.*)$")
+# "설명 문장12" → 12 (라벨 정렬용)
+_LABEL_NUM_RE = re.compile(r"(\d+)")
 
 META_NOTE_RE = re.compile(r'"note"\s*:\s*"(?P<note>.*?)"', re.DOTALL)
 
@@ -64,23 +82,32 @@ def xls_safe(val) -> str:
     if val is None:
         return ""
     s = str(val)
-    s = s.replace("\x00", "")
-    s = _ILLEGAL_XML_RE.sub("", s)
-    return s
+    # 널문자도 _ILLEGAL_XML_RE 범위에 포함. 제어문자가 없는 셀(대부분)은 그대로 반환
+    if _ILLEGAL_XML_RE.search(s) is None:
+        return s
+    return _ILLEGAL_XML_RE.sub("", s)
 
 
 def _parse_metadata_cell(cell_text: Any) -> Dict[str, Any]:
     """
-    'metadata : { ... }' 형태의 멀티라인 문자열에서 { ... } 만 추출하여 json.loads 시도.
+    'metadata : { ... }' 형태의 멀티라인 문자열에서 { ... } 만 추출하여 JSON 파싱 시도 (orjson 우선).
     엑셀에서 따옴표가 이중("...")으로 들어간 경우도 복원.
     실패 시 최소한 "note"만 정규식으로 추출.
     """
-    if cell_text is None:
-        return {}
-    s = str(cell_text).strip()
+    if not isinstance(cell_text, str):
+        return {}  # None/NaN(병합 셀 아래 행)/숫자 등은 {..}를 담을 수 없음
+    s = cell_text.strip()
     if not s:
         return {}
 
+    # 빠른 경로: 이 도구가 내보낸 'metadata : {...}' 또는 '{...}' 셀은 찾기/자르기 없이 바로 파싱
+    body = s[len(META_CELL_PREFIX):] if s.startswith(META_CELL_PREFIX) else s
+    if body[0] == "{" and body[-1] == "}":
+        try:
+            return fast_json.loads(body)
+        except Exception:
+            pass  # 따옴표 이중화 등은 아래 일반 경로에서 보정
+
     i, j = s.find("{"), s.rfind("}")
     if i == -1 or j == -1 or i >= j:
         s_fix = s.replace('""', '"')
@@ -90,7 +117,7 @@ def _parse_metadata_cell(cell_text: Any) -> Dict[str, Any]:
     blob = s[i:j + 1].strip()
     for candidate in (blob, blob.replace('""', '"')):
         try:
-            return json.loads(candidate)
+            return fast_json.loads(candidate)
         except Exception:
             pass
 
@@ -99,77 +126,58 @@ def _parse_metadata_cell(cell_text: Any) -> Dict[str, Any]:
     return {"note": m.group("note")} if m else {}
 
 
-def _collect_metadata_by_id(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
-    """
-    엑셀 DF에서 id별로 metadata 셀을 파싱해 전체 metadata dict를 수집.
-    - id는 ffill
-    - 각 id에 대해 '비어있지 않은 첫 metadata dict'를 채택
-    """
-    if "id" not in df.columns or "metadata" not in df.columns:
-        return {}
+def _excel_ids(df: pd.DataFrame) -> pd.Series:
+    # 병합 셀 보정(ffill) + 문자열화 + 공백 제거한 id 열 (id별 수집 함수들이 함께 사용)
+    return df["id"].ffill().astype(str).str.strip()
 
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str)
 
-    out: Dict[str, Dict[str, Any]] = {}
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
-        if not _id:
-            continue
-        meta_dict = _parse_metadata_cell(row["metadata"])
-        if meta_dict and _id not in out:
-            out[_id] = meta_dict
-    return out
-
-
-def _collect_note_by_id(df: pd.DataFrame) -> Dict[str, str]:
+def _collect_meta_maps_by_id(
+    df: pd.DataFrame, ids: Optional[pd.Series] = None
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], Dict[str, str]]:
     """
-    엑셀 DF에서 id별로 metadata 셀을 파싱해 note를 수집.
-    - id는 ffill
-    - 각 id에 대해 '비어있지 않은 첫 note'를 채택
+    엑셀 DF를 한 번만 훑어 id별 (metadata dict, Medium_category, note)를 수집.
+    - id는 ffill (병합 셀 보정), Medium_category도 ffill
+    - metadata 셀은 행마다 한 번만 파싱해 metadata/note에 함께 사용
+    - 각 id에 대해 '비어있지 않은 첫 값'을 채택
+    - ids: 이미 만든 _excel_ids(df) 결과가 있으면 재사용
+    반환: (metadata_map, medium_map, note_map)
     """
-    if "id" not in df.columns or "metadata" not in df.columns:
-        return {}
+    metadata_map: Dict[str, Dict[str, Any]] = {}
+    medium_map: Dict[str, str] = {}
+    note_map: Dict[str, str] = {}
+    if "id" not in df.columns:
+        return metadata_map, medium_map, note_map
 
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str)
+    has_meta = "metadata" in df.columns
+    # Medium_category가 없거나 전부 빈 셀이면 ffill/문자열 변환과 행별 확인을 생략
+    mc_col = df.get("Medium_category")
+    has_mc = mc_col is not None and bool(mc_col.notna().any())
+    if not (has_meta or has_mc):
+        return metadata_map, medium_map, note_map
 
-    out: Dict[str, str] = {}
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
+    # 열이 없으면 None/"" 로 채워 같은 zip 루프를 사용 (각 map이 비게 됨)
+    ids = (_excel_ids(df) if ids is None else ids).tolist()
+    metas = df["metadata"].tolist() if has_meta else [None] * len(ids)
+    mcs = mc_col.ffill().fillna("").astype(str).tolist() if has_mc else [""] * len(ids)
+
+    for _id, meta_cell, mc in zip(ids, metas, mcs):
         if not _id:
             continue
-        meta_dict = _parse_metadata_cell(row["metadata"])
-        note = str(meta_dict.get("note", "") or "").strip()
-        if note and _id not in out:
-            out[_id] = note
-    return out
 
+        if has_mc and _id not in medium_map:
+            mc = mc.strip()
+            if mc:
+                medium_map[_id] = mc
 
-def _collect_medium_by_id(df: pd.DataFrame) -> Dict[str, str]:
-    """
-    엑셀에서 id별 Medium_category 값을 수집.
-    - 병합 셀 보정을 위해 id, Medium_category ffill
-    - 각 id에 대해 '비어있지 않은 첫 값'을 채택
-    """
-    if "id" not in df.columns:
-        return {}
-
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str)
+        if has_meta and (_id not in metadata_map or _id not in note_map):
+            meta_dict = _parse_metadata_cell(meta_cell)
+            if meta_dict and _id not in metadata_map:
+                metadata_map[_id] = meta_dict
+            note = str(meta_dict.get("note", "") or "").strip()
+            if note and _id not in note_map:
+                note_map[_id] = note
 
-    if "Medium_category" not in tmp.columns:
-        return {}
-
-    tmp["Medium_category"] = tmp["Medium_category"].ffill().fillna("").astype(str)
-
-    out: Dict[str, str] = {}
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
-        mc = row["Medium_category"].strip()
-        if _id and mc and _id not in out:
-            out[_id] = mc
-    return out
+    return metadata_map, medium_map, note_map
 
 
 def _strip_brackets(s: str) -> str:
@@ -181,24 +189,72 @@ def _strip_brackets(s: str) -> str:
     return s
 
 
+@lru_cache(maxsize=4096)
+def _label_sort_key(k):
+    # 라벨 종류는 몇 개 안 되므로 정규식 파싱 결과를 라벨별로 캐시
+    k = str(k)
+    m = _LABEL_NUM_RE.search(k)
+    return (0, int(m.group(1))) if m else (1, k)
+
+
+@lru_cache(maxsize=1024)
+def _bracket_feature(typ: str) -> str:
+    # 엑셀 유형 → 신형 feature "[유형]" (이미 대괄호가 있으면 이중 괄호 방지)
+    # 유형 종류는 몇 개 안 되므로 같은 문자열 객체를 재사용
+    t = typ
+    if t.startswith("[") and t.endswith("]"):
+        t = t[1:-1].strip()
+    return f"[{t}]" if t else ""
+
+
+@lru_cache(maxsize=1024)
+def _label_name(idx: int) -> str:
+    # 신형 exp_sentence 라벨 "설명 문장{idx}" (문서마다 같은 키 문자열 재사용)
+    return f"설명 문장{idx}"
+
+
 def _sort_label_keys(keys):
     # "설명 문장1", "설명 문장2" ... 같은 키를 숫자 기준 정렬
-    def key_fn(k):
-        k = str(k)
-        m = re.search(r"(\d+)", k)
-        return (0, int(m.group(1))) if m else (1, k)
-    return sorted(list(keys), key=key_fn)
+    return sorted(keys, key=_label_sort_key)
 
 
 # =========================
 # JSON -> Excel (정방향)
 # =========================
+def _split_type(text: str) -> Tuple[str, str]:
+    """"[Type] sentence" → (Type, sentence), 대괄호가 없으면 ("", text)"""
+    m = TYPE_BRACKET_RE.match(text) if "[" in text else None
+    if m:
+        return m.group(1).strip(), m.group(2).strip()
+    return "", text
+
+
+def _extend_old_values(values: Iterable[Any], out: List[Tuple[str, str]]) -> None:
+    # 구형 값: 문자열 또는 문자열 리스트
+    for v in values:
+        for s in (v if isinstance(v, list) else [v]):
+            if s:
+                out.append(_split_type(str(s).strip()))
+
+
+def _extend_new_format(exp: Dict[str, Any], out: List[Tuple[str, str]]) -> None:
+    # 신형 값: label -> {"feature": "[...]", "sent": "..."} (라벨 번호순)
+    for label in _sort_label_keys(exp.keys()):
+        v = exp[label]
+        if not isinstance(v, dict):
+            continue
+        sent = str(v.get("sent", "") or "").strip()
+        if sent:
+            out.append((_strip_brackets(v.get("feature", "") or ""), sent))
+
+
 def extract_sentences(doc: Dict[str, Any]) -> List[Tuple[str, str]]:
     """
     EX.exp_sentence 내부를 탐색해 (type, sentence) 튜플 리스트로 반환
 
     지원 형식:
     A) 구형: "[Type] sentence" 또는 "sentence"
+       (list[dict{...}] / dict{key: str|list} / str)
     B) 신형:
        "exp_sentence": {
          "설명 문장1": {"feature": "[대상 식별 문장]", "sent": "..."},
@@ -209,63 +265,20 @@ def extract_sentences(doc: Dict[str, Any]) -> List[Tuple[str, str]]:
 
     for ex in doc.get("EX", []):
         exp = ex.get("exp_sentence")
-        if exp is None:
-            continue
-
-        # ===== 신형(dict: label -> {feature, sent}) =====
-        if isinstance(exp, dict):
-            is_new = any(isinstance(v, dict) and ("sent" in v or "feature" in v) for v in exp.values())
-            if is_new:
-                for label in _sort_label_keys(exp.keys()):
-                    v = exp.get(label, {})
-                    if not isinstance(v, dict):
-                        continue
-                    typ = _strip_brackets(v.get("feature", "") or "")
-                    sent = str(v.get("sent", "") or "").strip()
-                    if sent:
-                        out.append((typ, sent))
-                continue
-
-        # ===== 구형(list[dict{...}] / dict / str) =====
-        if isinstance(exp, list):
+        kind = _classify_exp(exp)
+        # 값 중 하나라도 {sent/feature} dict이면 신형, 아니면 구형 dict
+        if kind == "new":
+            _extend_new_format(exp, out)
+        elif kind == "dict":
+            _extend_old_values(exp.values(), out)
+        elif kind == "list":
             for item in exp:
-                if not isinstance(item, dict):
-                    continue
-                for _k, v in item.items():
-                    seq = v if isinstance(v, list) else [v]
-                    for s in seq:
-                        if not s:
-                            continue
-                        text = str(s).strip()
-                        m = TYPE_BRACKET_RE.match(text)
-                        if m:
-                            out.append((m.group(1).strip(), m.group(2).strip()))
-                        else:
-                            out.append(("", text))
-            continue
-
-        if isinstance(exp, dict):
-            for k, v in exp.items():
-                seq = v if isinstance(v, list) else [v]
-                for s in seq:
-                    if not s:
-                        continue
-                    text = str(s).strip()
-                    m = TYPE_BRACKET_RE.match(text)
-                    if m:
-                        out.append((m.group(1).strip(), m.group(2).strip()))
-                    else:
-                        out.append(("", text))
-            continue
-
-        if isinstance(exp, str):
+                if isinstance(item, dict):
+                    _extend_old_values(item.values(), out)
+        elif kind == "str":
             text = exp.strip()
             if text:
-                m = TYPE_BRACKET_RE.match(text)
-                if m:
-                    out.append((m.group(1).strip(), m.group(2).strip()))
-                else:
-                    out.append(("", text))
+                out.append(_split_type(text))
 
     return out
 
@@ -284,14 +297,9 @@ def format_metadata_and_url(meta: Dict[str, Any]) -> Tuple[str, str]:
     metadata를 멀티라인 문자열로 정리하고, url만 분리해서 반환
     """
     url_only = _clean_url(meta.get("url", ""))
-    lines = ['metadata : {']
-    for k in META_ORDER:
-        v = meta.get(k, "")
-        if k == "url":
-            v = url_only or meta.get("url", "")
-        lines.append(f'  "{k}": "{v}",' if k != META_ORDER[-1] else f'  "{k}": "{v}"')
-    lines.append("}")
-    return "\n".join(lines), url_only
+    values = [meta.get(k, "") for k in META_ORDER]
+    values[_META_URL_IDX] = url_only or values[_META_URL_IDX]
+    return _META_CELL_TEMPLATE.format(*values), url_only
 
 
 def extract_mdfcn_memo(mdfcn_infos):
@@ -308,7 +316,7 @@ def extract_mdfcn_memo(mdfcn_infos):
         if not raw:
             continue
         try:
-            arr = json.loads(raw)
+            arr = fast_json.loads(raw)
             if isinstance(arr, list):
                 for obj in arr:
                     val = str((obj or {}).get("value", "")).strip()
@@ -323,15 +331,31 @@ def extract_mdfcn_memo(mdfcn_infos):
     return "\n\n".join(out)
 
 
+# 행 튜플 필드 순서: 엑셀 A~G열 + 하이퍼링크용 meta_url(엑셀 열에는 포함 안 함)
+ROW_FIELDS = (
+    "id", "worker_id_cnst", "Medium_category", "유형", "설명 문장",
+    "metadata", "mdfcn_memo(검수자 수정 이력)", "meta_url",
+)
+
+
 def to_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     JSON(dict) -> 행 리스트
     """
-    rows: List[Dict[str, Any]] = []
+    return [dict(zip(ROW_FIELDS, t)) for t in _to_row_tuples(data)]
+
+
+def _to_row_tuples(data: Dict[str, Any]) -> List[Tuple[str, ...]]:
+    """
+    JSON(dict) -> ROW_FIELDS 순서의 행 튜플 리스트
+    (엑셀 작성용: 행마다 dict를 만들고 키로 다시 꺼내지 않음)
+    """
+    rows: List[Tuple[str, ...]] = []
     docs = data.get("document", [])
     if not isinstance(docs, list):
         return rows
 
+    append = rows.append
     for doc in docs:
         img_id = str(doc.get("id", ""))
         meta = doc.get("metadata", {}) or {}
@@ -343,151 +367,127 @@ def to_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
 
         pairs = extract_sentences(doc) or [("", "")]
         for typ, sent in pairs:
-            rows.append({
-                "id": img_id,
-                "worker_id_cnst": worker_id_cnst,
-                "Medium_category": medium_category,
-                "유형": typ,
-                "설명 문장": sent,
-                "metadata": md_text,
-                "meta_url": md_url,  # 하이퍼링크용(엑셀 열에는 포함 안 함)
-                "mdfcn_memo(검수자 수정 이력)": memo_text,
-            })
+            append((img_id, worker_id_cnst, medium_category, typ, sent, md_text, memo_text, md_url))
     return rows
 
 
 def estimate_wrapped_lines(text: str, col_chars: int) -> int:
     if not text:
         return 1
+    per_line = max(col_chars, 5) * 1.08
+    s = str(text)
+    if "\n" not in s:  # 대부분의 셀: 문단 하나 → split/루프 없이 계산
+        return max(1, math.ceil(len(s) / per_line))
     total = 0
-    width = max(col_chars, 5)
-    for para in str(text).split("\n"):
-        total += max(1, math.ceil(len(para) / (width * 1.08)))
+    for para in s.split("\n"):
+        total += max(1, math.ceil(len(para) / per_line))
     return max(1, total)
 
 
-def _write_excel_to_bytes(all_rows: List[Dict[str, Any]]) -> bytes:
+def _styled_cell(ws, value, **styles) -> WriteOnlyCell:
+    # 공유 스타일 객체(TOP_ALIGN/WRAP_ALIGN/THIN_BORDER 등)를 공개 속성으로 지정 (워크북에는 조합별로 한 번만 등록됨)
+    cell = WriteOnlyCell(ws, value=value)
+    for name, style in styles.items():
+        setattr(cell, name, style)
+    return cell
+
+
+def _write_excel_to_bytes(all_rows: List[Tuple[str, ...]]) -> bytes:
     """
-    행 리스트 -> Excel bytes
+    행 튜플(ROW_FIELDS 순서) 리스트 -> Excel bytes
+    - write-only 워크북으로 행을 바로 스트리밍 (셀 격자를 메모리에 만들지 않음)
+    - 열 너비/틀 고정/행 높이/병합 범위는 행을 쓰기 전에 정해야 하므로 그룹 정보를 먼저 계산
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "result"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("result")
 
     headers = [
         "id", "worker_id_cnst", "Medium_category",
         "유형", "설명 문장", "metadata", "mdfcn_memo\n(검수자 수정 이력)"
     ]
-    ws.append(headers)
-
-    # 헤더 스타일
-    for c in range(1, len(headers) + 1):
-        cell = ws.cell(row=1, column=c)
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        cell.border = THIN_BORDER
-        cell.fill = HEADER_FILL
 
     # 열 너비(문자폭 기준 추정)
     widths = {1: 12, 2: 16, 3: 14, 4: 16, 5: 80, 6: 60, 7: 50}
     for col_idx, w in widths.items():
         ws.column_dimensions[get_column_letter(col_idx)].width = w
+    ws.freeze_panes = "A2"
 
-    # 그룹 시작/개수 추적
-    start_row_by_group: Dict[Tuple[str], int] = {}
-    count_by_group: Dict[Tuple[str], int] = {}
-
-    current_row = 2
-    for row in all_rows:
-        ws.append([
-            xls_safe(row.get("id", "")),
-            xls_safe(row.get("worker_id_cnst", "")),
-            xls_safe(row.get("Medium_category", "")),
-            xls_safe(row.get("유형", "")),
-            xls_safe(row.get("설명 문장", "")),
-            xls_safe(row.get("metadata", "")),
-            xls_safe(row.get("mdfcn_memo(검수자 수정 이력)", "")),
-        ])
-        for c in range(1, len(headers) + 1):
-            ws.cell(row=current_row, column=c).alignment = Alignment(
-                vertical="top", wrap_text=(c in (5, 6, 7))
-            )
-            ws.cell(row=current_row, column=c).border = THIN_BORDER
-
-        key = (row.get("id", ""),)
-        if key not in start_row_by_group:
-            start_row_by_group[key] = current_row
-            count_by_group[key] = 0
-        count_by_group[key] += 1
-        current_row += 1
-
-    # 병합: 같은 id 블록에서 [id, worker, Medium_category, metadata, mdfcn_memo] 병합
-    merge_cols = [1, 2, 3, 6, 7]
-    for key, start in start_row_by_group.items():
-        cnt = count_by_group[key]
+    # 같은 id가 연속된 구간(시작 행, 개수) + metadata 하이퍼링크(같은 id 첫 행의 http(s) URL)를 한 번에 수집
+    # (병합은 연속 구간 단위 — 같은 id가 떨어져 나와도 병합 범위가 겹치지 않음)
+    runs: List[List[int]] = []
+    seen_ids = set()
+    link_by_row: Dict[int, str] = {}
+    http_prefixes = ("http://", "https://")
+
+    prev_id = None
+    for r, row in enumerate(all_rows, start=2):
+        doc_id = row[0]
+        if doc_id not in seen_ids:
+            seen_ids.add(doc_id)
+            if doc_id:
+                url = str(row[7] or "").strip()
+                if url.startswith(http_prefixes):
+                    link_by_row[r] = url
+        if runs and doc_id == prev_id:
+            runs[-1][1] += 1
+        else:
+            runs.append([r, 1])
+        prev_id = doc_id
+
+    # 병합: 같은 id 연속 구간에서 [id, worker, Medium_category, metadata, mdfcn_memo] 병합
+    merge_cols = (1, 2, 3, 6, 7)
+    merged_start_rows = set()
+    merged_end_by_row: Dict[int, int] = {}  # 병합 범위 안쪽(시작 행 제외) 행 -> 범위 끝 행
+    merge_ranges = []
+    for start, cnt in runs:
         if cnt > 1:
             end = start + cnt - 1
+            merged_start_rows.add(start)
+            for r in range(start + 1, end + 1):
+                merged_end_by_row[r] = end
             for col in merge_cols:
-                ws.merge_cells(start_row=start, start_column=col, end_row=end, end_column=col)
-                ws.cell(row=start, column=col).alignment = Alignment(vertical="top", wrap_text=True)
+                merge_ranges.append(CellRange(min_col=col, min_row=start, max_col=col, max_row=end))
+    # 범위끼리 겹치지 않으므로 merged_cells.add()(기존 범위 전체와 비교, O(n²)) 대신 한 번에 구성
+    ws.merged_cells = MultiCellRange(merge_ranges)
 
-    # metadata 하이퍼링크(같은 id 첫 행만)
-    first_url_by_id: Dict[str, str] = {}
-    for _r, row in enumerate(all_rows, start=2):
-        rid = row.get("id", "")
-        if rid and rid not in first_url_by_id:
-            first_url_by_id[rid] = row.get("meta_url", "") or ""
+    ws.append([_styled_cell(ws, h, alignment=HEADER_ALIGN, border=THIN_BORDER, fill=HEADER_FILL) for h in headers])
 
-    from openpyxl.cell.cell import MergedCell
-    try:
-        from openpyxl.worksheet.hyperlink import Hyperlink
-    except Exception:
-        Hyperlink = None  # 구버전 대비
-
-    for key, start in start_row_by_group.items():
-        doc_id = key[0]
-        url = str(first_url_by_id.get(doc_id, "") or "").strip()
-        if not (url and url.startswith(("http://", "https://"))):
-            continue
-
-        c = ws.cell(row=start, column=6)
-
-        if isinstance(c, MergedCell):
-            if Hyperlink is not None:
-                ws._hyperlinks.append(Hyperlink(ref=c.coordinate, target=url, display=url))
-        else:
-            try:
-                c.hyperlink = url
-            except AttributeError:
-                if Hyperlink is not None:
-                    ws._hyperlinks.append(Hyperlink(ref=c.coordinate, target=url, display=url))
+    LINE_HEIGHT_PT = 18
+    group_starts = {start for start, _ in runs}
+    for r, row in enumerate(all_rows, start=2):
+        values = [xls_safe(v) for v in row[:7]]
+        merged_end = merged_end_by_row.get(r)
+        cells = []
+        for c, v in enumerate(values, start=1):
+            if merged_end is not None and c in merge_cols:
+                # 병합 범위 안쪽 칸: 값 없이 좌/우(마지막 행은 아래까지) 테두리만
+                cell = _styled_cell(ws, None, border=MERGED_END_BORDER if r == merged_end else MERGED_MID_BORDER)
+                values[c - 1] = ""
+            elif c in (5, 6, 7) or (r in merged_start_rows and c in merge_cols):
+                cell = _styled_cell(ws, v, alignment=WRAP_ALIGN, border=THIN_BORDER)
+            else:
+                cell = _styled_cell(ws, v, alignment=TOP_ALIGN, border=THIN_BORDER)
+            cells.append(cell)
 
-        c.font = Font(color=LINK_BLUE, underline="none")
-        c.alignment = Alignment(vertical="top", wrap_text=True)
-        c.border = THIN_BORDER
+        url = link_by_row.get(r)
+        if url and merged_end is None:
+            cells[5].hyperlink = url
+            cells[5].font = LINK_FONT
 
-    # 행 높이 대략 조정
-    LINE_HEIGHT_PT = 18
-    group_starts = set(start_row_by_group.values())
-    for r in range(2, current_row):
-        desc = ws.cell(row=r, column=5).value or ""
-        desc_lines = estimate_wrapped_lines(desc, widths[5])
+        # 행 높이 대략 조정 (그룹 첫 행은 metadata/memo도 고려)
+        need = estimate_wrapped_lines(values[4], widths[5])
         if r in group_starts:
-            meta_plain = ws.cell(row=r, column=6).value or ""
-            memo_plain = ws.cell(row=r, column=7).value or ""
             need = max(
-                desc_lines,
-                estimate_wrapped_lines(meta_plain, widths[6]),
-                estimate_wrapped_lines(memo_plain, widths[7]),
+                need,
+                estimate_wrapped_lines(values[5], widths[6]),
+                estimate_wrapped_lines(values[6], widths[7]),
             )
-        else:
-            need = desc_lines
         ws.row_dimensions[r].height = max(1, need) * LINE_HEIGHT_PT
 
-    ws.freeze_panes = "A2"
+        ws.append(cells)
 
     bio = BytesIO()
     wb.save(bio)
-    bio.seek(0)
     return bio.getvalue()
 
 
@@ -495,10 +495,7 @@ def photo_json_to_xlsx_bytes(data: Dict[str, Any]) -> bytes:
     """
     datalyManager에서 호출하는 공개 API
     """
-    rows = to_rows(data)
-    if not rows:
-        return _write_excel_to_bytes([])
-    return _write_excel_to_bytes(rows)
+    return _write_excel_to_bytes(_to_row_tuples(data))
 
 
 def _read_excel_multi(ef, sheet_name: Optional[Union[Iterable[str], str]] = None) -> pd.DataFrame:
@@ -512,12 +509,16 @@ def _read_excel_multi(ef, sheet_name: Optional[Union[Iterable[str], str]] = None
     """
     need_cols = ["id", "설명 문장"]
     opt_cols = ["유형", "Medium_category"]
+    read_cols = set(need_cols + opt_cols + ["metadata"])
+
+    # 변환에 쓰는 열만 읽음 (나머지 열은 DataFrame으로 만들지 않음)
+    def _keep(c: str) -> bool:
+        return c in read_cols
 
     if sheet_name is None:
-        sheets = pd.read_excel(ef, sheet_name=None)
+        sheets = excel_read.read_sheets(ef, keep=_keep)
         dfs = []
         for name, df in sheets.items():
-            df = df.copy()
             for c in need_cols + opt_cols:
                 if c not in df.columns:
                     df[c] = ""
@@ -528,8 +529,7 @@ def _read_excel_multi(ef, sheet_name: Optional[Union[Iterable[str], str]] = None
         return pd.concat(dfs, ignore_index=True)
 
     if isinstance(sheet_name, str):
-        df = pd.read_excel(ef, sheet_name=sheet_name)
-        df = df.copy()
+        df = excel_read.read_sheets(ef, [sheet_name], keep=_keep)[sheet_name]
         for c in need_cols + opt_cols:
             if c not in df.columns:
                 df[c] = ""
@@ -541,12 +541,12 @@ def _read_excel_multi(ef, sheet_name: Optional[Union[Iterable[str], str]] = None
     except TypeError:
         raise TypeError("sheet_name은 None, 문자열, 또는 문자열 리스트여야 합니다.")
 
-    all_sheets = pd.read_excel(ef, sheet_name=None)
+    all_sheets = excel_read.read_sheets(ef, names, keep=_keep, ignore_missing=True)
     dfs = []
     for nm in names:
         if nm not in all_sheets:
             continue
-        df = all_sheets[nm].copy()
+        df = all_sheets[nm]
         for c in need_cols + opt_cols:
             if c not in df.columns:
                 df[c] = ""
@@ -583,11 +583,100 @@ def _delete_slot(slot_descriptor):
             container.pop(label, None)
 
 
-def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
+def _classify_exp(exp: Any) -> Optional[str]:
+    """
+    exp_sentence 구조 판별 (신형 여부 any(...) 검사는 여기서 한 번만).
+    반환: "new"(label -> {feature, sent}) / "list" / "dict"(구형 dict) / "str" / None
+    """
+    if isinstance(exp, dict):
+        # any(제너레이터)보다 일반 루프 + 조기 반환이 호출 비용이 적음
+        for v in exp.values():
+            if isinstance(v, dict) and ("sent" in v or "feature" in v):
+                return "new"
+        return "dict"
+    if isinstance(exp, list):
+        return "list"
+    if isinstance(exp, str):
+        return "str"
+    return None
+
+
+def _exp_kind(exp: Any, kinds: Optional[Dict[int, Tuple[Any, Optional[str]]]]) -> Optional[str]:
+    # kinds: {id(exp): (exp, 종류)} — 같은 객체일 때만 재사용, 없으면 새로 판별
+    hit = kinds.get(id(exp)) if kinds else None
+    if hit is not None and hit[0] is exp:
+        return hit[1]
+    return _classify_exp(exp)
+
+
+def _delete_slots(slot_descriptors) -> None:
+    """
+    슬롯 목록(순회 순서)을 뒤에서부터 삭제.
+    같은 리스트의 연속 인덱스(남은 슬롯 일괄 삭제 등)는 pop을 반복하지 않고 슬라이스 한 번으로 삭제
+    """
+    i = len(slot_descriptors) - 1
+    while i >= 0:
+        desc = slot_descriptors[i]
+        if desc[0] == "list" and 0 <= desc[2] < len(desc[1]):
+            lst, hi = desc[1], desc[2]
+            lo = hi
+            while i > 0:
+                prev = slot_descriptors[i - 1]
+                if prev[0] != "list" or prev[1] is not lst or prev[2] != lo - 1 or lo == 0:
+                    break
+                lo -= 1
+                i -= 1
+            del lst[lo:hi + 1]
+        else:
+            _delete_slot(desc)
+        i -= 1
+
+
+def _is_clean_text(v: Any) -> bool:
+    # 정리해도 그대로 남는 문자열 (비어 있지 않고 앞뒤 공백 없음)
+    return isinstance(v, str) and v != "" and v.strip() == v
+
+
+def _is_clean_value(v: Any) -> bool:
+    # 구형 값(str 또는 list[str])이 정리 후에도 그대로인지
+    if isinstance(v, list):
+        return bool(v) and all(_is_clean_text(s) for s in v)
+    return _is_clean_text(v)
+
+
+def _needs_cleanup(exp: Any, kind: Optional[str]) -> bool:
+    """
+    _cleanup_exp_sentences가 exp를 바꿀지 미리 확인.
+    이미 정리된 구조(대부분의 JSON)는 새 dict/list를 만들지 않고 그대로 둠.
+    """
+    if kind == "new":
+        # 정리 결과는 {"feature", "sent"} 순서의 dict만 남으므로 키 순서까지 같아야 그대로
+        for v in exp.values():
+            if not isinstance(v, dict) or tuple(v) != ("feature", "sent"):
+                return True
+            feature, sent = v["feature"], v["sent"]
+            if not (isinstance(feature, str) and isinstance(sent, str)):
+                return True
+            if feature.strip() != feature or sent.strip() != sent or not (feature or sent):
+                return True
+        return False
+    if kind == "list":
+        return not (exp and all(
+            isinstance(item, dict) and item and all(_is_clean_value(v) for v in item.values())
+            for item in exp
+        ))
+    if kind == "dict":
+        return not (exp and all(_is_clean_value(v) for v in exp.values()))
+    return False
+
+
+def _cleanup_exp_sentences(doc: Dict[str, Any], kinds: Optional[Dict[int, Tuple[Any, Optional[str]]]] = None) -> None:
     """
     빈 문자열/빈 리스트/빈 딕셔너리를 걷어내서 exp_sentence 구조를 가볍게 정리.
     (키 자체도 제거)
+    값이 이미 문자열이면 str() 변환 없이 strip (결과는 str(v or "").strip()과 동일)
     ✅ 신형(dict: label -> {feature,sent})도 정리
+    - kinds: _iter_sentence_slots_with_old가 기록한 구조 판별 결과 (있으면 재사용)
     """
     ex_list = doc.get("EX", [])
     if not isinstance(ex_list, list):
@@ -597,40 +686,40 @@ def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
         exp = ex.get("exp_sentence")
         if exp is None:
             continue
+        kind = _exp_kind(exp, kinds)
+        if not _needs_cleanup(exp, kind):
+            continue
 
         # 신형: dict(label -> {feature, sent})
-        if isinstance(exp, dict):
-            is_new = any(isinstance(v, dict) and ("sent" in v or "feature" in v) for v in exp.values())
-            if is_new:
-                new_exp = {}
-                for k, v in exp.items():
-                    if not isinstance(v, dict):
-                        continue
-                    feature = str(v.get("feature", "") or "").strip()
-                    sent = str(v.get("sent", "") or "").strip()
-                    # 둘 다 비면 제거
-                    if not feature and not sent:
-                        continue
-                    new_exp[k] = {"feature": feature, "sent": sent}
-                if new_exp:
-                    ex["exp_sentence"] = new_exp
-                else:
-                    ex.pop("exp_sentence", None)
-                continue
+        if kind == "new":
+            new_exp = {}
+            for k, v in exp.items():
+                if not isinstance(v, dict):
+                    continue
+                feature = str(v.get("feature", "") or "").strip()
+                sent = str(v.get("sent", "") or "").strip()
+                # 둘 다 비면 제거
+                if not feature and not sent:
+                    continue
+                new_exp[k] = {"feature": feature, "sent": sent}
+            if new_exp:
+                ex["exp_sentence"] = new_exp
+            else:
+                ex.pop("exp_sentence", None)
 
         # list 형태 (기존)
-        if isinstance(exp, list):
+        elif kind == "list":
             new_exp = []
             for item in exp:
                 if isinstance(item, dict):
                     new_item = {}
                     for k, v in item.items():
                         if isinstance(v, list):
-                            vv = [str(s).strip() for s in v if str(s or "").strip()]
+                            vv = [t for s in v if (t := s.strip() if type(s) is str else str(s or "").strip())]
                             if vv:
                                 new_item[k] = vv
                         else:
-                            s = str(v or "").strip()
+                            s = v.strip() if type(v) is str else str(v or "").strip()
                             if s:
                                 new_item[k] = s
                     if new_item:
@@ -640,15 +729,15 @@ def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
                 ex.pop("exp_sentence", None)
 
         # dict 형태 (구형 dict: key -> str/list[str])
-        elif isinstance(exp, dict):
+        elif kind == "dict":
             new_exp = {}
             for k, v in exp.items():
                 if isinstance(v, list):
-                    vv = [str(s).strip() for s in v if str(s or "").strip()]
+                    vv = [t for s in v if (t := s.strip() if type(s) is str else str(s or "").strip())]
                     if vv:
                         new_exp[k] = vv
                 else:
-                    s = str(v or "").strip()
+                    s = v.strip() if type(v) is str else str(v or "").strip()
                     if s:
                         new_exp[k] = s
             if new_exp:
@@ -665,7 +754,8 @@ def _compose_text_with_type(old_text: str, new_sentence: str, excel_type: str) -
     t_new = "" if excel_type is None else str(excel_type).strip()
 
     old_text_str = str(old_text or "")
-    m = TYPE_BRACKET_RE.match(old_text_str)
+    # "[" 가 없으면 정규식이 맞을 수 없으므로 호출 생략 (대부분의 문장)
+    m = TYPE_BRACKET_RE.match(old_text_str) if "[" in old_text_str else None
     old_type = (m.group(1).strip() if m else "")
     old_body = (m.group(2).strip() if m else old_text_str.strip())
 
@@ -678,7 +768,7 @@ def _compose_text_with_type(old_text: str, new_sentence: str, excel_type: str) -
     return f"[{final_type}] {body}".strip() if final_type else body
 
 
-def _iter_sentence_slots_with_old(doc: Dict[str, Any]):
+def _iter_sentence_slots_with_old(doc: Dict[str, Any], kinds: Optional[Dict[int, Tuple[Any, Optional[str]]]] = None):
     """
     사진 JSON의 EX[*].exp_sentence에서 실제 '문장 슬롯'을 순서대로 찾아
     (slot_descriptor, old_text) 를 yield.
@@ -686,6 +776,8 @@ def _iter_sentence_slots_with_old(doc: Dict[str, Any]):
     ✅ 신형 슬롯:
       slot_descriptor = ("new_obj", exp_dict, label_key)
       old_text = (old_feature, old_sent)  # tuple
+
+    kinds가 주어지면 exp별 구조 판별 결과를 {id(exp): (exp, 종류)}로 기록 (_cleanup_exp_sentences에서 재사용)
     """
     ex_list = doc.get("EX", [])
     if not isinstance(ex_list, list):
@@ -695,22 +787,22 @@ def _iter_sentence_slots_with_old(doc: Dict[str, Any]):
         exp = ex.get("exp_sentence")
         if exp is None:
             continue
+        kind = _classify_exp(exp)
+        if kinds is not None:
+            kinds[id(exp)] = (exp, kind)
 
         # ✅ 신형: dict(label -> {feature, sent})
-        if isinstance(exp, dict):
-            is_new = any(isinstance(v, dict) and ("sent" in v or "feature" in v) for v in exp.values())
-            if is_new:
-                for label in _sort_label_keys(exp.keys()):
-                    obj = exp.get(label, {})
-                    if not isinstance(obj, dict):
-                        continue
-                    old_feature = "" if obj.get("feature") is None else str(obj.get("feature"))
-                    old_sent = "" if obj.get("sent") is None else str(obj.get("sent"))
-                    yield (("new_obj", exp, label), (old_feature, old_sent))
-                continue
+        if kind == "new":
+            for label in _sort_label_keys(exp.keys()):
+                obj = exp.get(label, {})
+                if not isinstance(obj, dict):
+                    continue
+                old_feature = "" if obj.get("feature") is None else str(obj.get("feature"))
+                old_sent = "" if obj.get("sent") is None else str(obj.get("sent"))
+                yield (("new_obj", exp, label), (old_feature, old_sent))
 
         # 구형: list[ dict{key: list[str] or str}, ... ]
-        if isinstance(exp, list):
+        elif kind == "list":
             for item in exp:
                 if isinstance(item, dict):
                     for k, v in item.items():
@@ -719,10 +811,9 @@ def _iter_sentence_slots_with_old(doc: Dict[str, Any]):
                                 yield (("list", v, i), ("" if s is None else str(s)))
                         else:
                             yield (("dict_scalar", item, k), ("" if v is None else str(v)))
-            continue
 
         # 구형: dict(key -> list[str]/str)
-        elif isinstance(exp, dict):
+        elif kind == "dict":
             for k, v in exp.items():
                 if isinstance(v, list):
                     for i, s in enumerate(v):
@@ -730,51 +821,52 @@ def _iter_sentence_slots_with_old(doc: Dict[str, Any]):
                 else:
                     yield (("dict_scalar", exp, k), ("" if v is None else str(v)))
 
-        elif isinstance(exp, str):
+        elif kind == "str":
             yield (("dict_scalar", ex, "exp_sentence"), exp)
 
 
 def _assign_text_to_slot(slot_descriptor, new_text: str):
+    # 현재 값과 같으면 쓰지 않음 (이미 반영된 JSON을 다시 돌리는 경우가 흔함)
     mode = slot_descriptor[0]
     if mode == "list":
         lst, idx = slot_descriptor[1], slot_descriptor[2]
-        lst[idx] = new_text
+        if lst[idx] != new_text:
+            lst[idx] = new_text
     elif mode == "dict_scalar":
         obj, key = slot_descriptor[1], slot_descriptor[2]
-        obj[key] = new_text
+        if obj.get(key) != new_text:
+            obj[key] = new_text
     # "new_obj"는 apply_excel_desc_to_photo_json에서 직접 처리
 
 
-def _collect_excel_pairs_by_id(df: pd.DataFrame, skip_blank: bool = True) -> Dict[str, List[Tuple[str, str]]]:
+def _collect_excel_pairs_by_id(
+    df: pd.DataFrame, skip_blank: bool = True, ids: Optional[pd.Series] = None
+) -> Dict[str, List[Tuple[str, str]]]:
     """
     엑셀에서 id별 (유형, 설명 문장) 시퀀스를 원본 행 순서대로 수집.
     - 병합 셀로 인해 비는 id/유형은 ffill로 채움
     - skip_blank=True면 빈 '설명 문장'은 건너뜀
+    - ids: 이미 만든 _excel_ids(df) 결과가 있으면 재사용
     반환: { id: [(type, sentence), ...], ... }
     """
     required = {"id", "설명 문장"}
     if not required.issubset(set(df.columns)):
         raise ValueError("엑셀에 'id', '설명 문장' 컬럼이 필요합니다.")
 
-    tmp = df.copy()
-    if "id" in tmp.columns:
-        tmp["id"] = tmp["id"].ffill()
-    if "유형" in tmp.columns:
-        tmp["유형"] = tmp["유형"].ffill()
-
-    tmp["id"] = tmp["id"].astype(str)
-    if "유형" not in tmp.columns:
-        tmp["유형"] = ""
-    tmp["유형"] = tmp["유형"].fillna("").astype(str)
-    tmp["설명 문장"] = tmp["설명 문장"].fillna("").astype(str)
+    # 병합 셀 보정: DataFrame 전체를 복사하지 않고 필요한 열만 변환 (strip/빈 문장 제외도 열 단위로)
+    if ids is None:
+        ids = _excel_ids(df)
+    sents = df["설명 문장"].fillna("").astype(str).str.strip()
+    if "유형" in df.columns:
+        types = df["유형"].ffill().fillna("").astype(str).str.strip()
+    else:
+        types = pd.Series("", index=df.index)  # 유형 컬럼이 없어도 동작하게
+    if skip_blank:
+        keep = sents != ""
+        ids, types, sents = ids[keep], types[keep], sents[keep]
 
     bucket: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
-        typ = row["유형"].strip()
-        sent = row["설명 문장"].strip()
-        if skip_blank and not sent:
-            continue
+    for _id, typ, sent in zip(ids.tolist(), types.tolist(), sents.tolist()):
         bucket[_id].append((typ, sent))
     return bucket
 
@@ -793,10 +885,10 @@ def apply_excel_desc_to_photo_json(
       - feature는 엑셀 '유형'을 "[...]"로 감싸 저장(엑셀에 대괄호가 없어도 자동)
       - sent는 엑셀 '설명 문장' 그대로 저장
     """
-    mapping = _collect_excel_pairs_by_id(excel_df, skip_blank=skip_blank)
-    metadata_map = _collect_metadata_by_id(excel_df)
-    medium_map = _collect_medium_by_id(excel_df)
-    note_map = _collect_note_by_id(excel_df)
+    # id 열 보정(ffill/strip)은 한 번만 하고 두 수집 함수가 함께 사용
+    ids = _excel_ids(excel_df) if "id" in excel_df.columns else None
+    mapping = _collect_excel_pairs_by_id(excel_df, skip_blank=skip_blank, ids=ids)
+    metadata_map, medium_map, note_map = _collect_meta_maps_by_id(excel_df, ids=ids)
 
     docs = json_obj.get("document", [])
     if not isinstance(docs, list):
@@ -829,10 +921,13 @@ def apply_excel_desc_to_photo_json(
 
         # 2-2) 설명 문장/유형 반영
         seq = mapping.get(doc_id, [])
-        slots = list(_iter_sentence_slots_with_old(doc))
+        # 슬롯은 리스트로 만들지 않고 엑셀 행과 함께 한 번만 순회
+        kinds: Dict[int, Tuple[Any, Optional[str]]] = {}
+        slot_iter = _iter_sentence_slots_with_old(doc, kinds)
+        first_slot = next(slot_iter, None)
 
         # exp_sentence가 전혀 없고, 엑셀 시퀀스가 있으면 신형 구조로 생성
-        if not slots and seq:
+        if first_slot is None and seq:
             ex_list = doc.get("EX")
             if not isinstance(ex_list, list) or not ex_list:
                 doc["EX"] = [{"exp_sentence": {}}]
@@ -856,23 +951,17 @@ def apply_excel_desc_to_photo_json(
                 if not (typ or sent):
                     continue
 
-                t = typ
-                if t.startswith("[") and t.endswith("]"):
-                    t = t[1:-1].strip()
-                feature_out = f"[{t}]" if t else ""
-
-                exp[f"설명 문장{idx}"] = {"feature": feature_out, "sent": sent}
+                exp[_label_name(idx)] = {"feature": _bracket_feature(typ), "sent": sent}
                 idx += 1
 
             _cleanup_exp_sentences(doc)
             continue
 
-        n = min(len(seq), len(slots))
-        delete_slot_indices = []
+        slots = chain((first_slot,), slot_iter) if first_slot is not None else iter(())
+        delete_slots = []  # 삭제할 슬롯 (순회 순서)
 
-        for i in range(n):
-            (slot_desc, old_val) = slots[i]
-            typ, new_sent = seq[i]
+        # zip은 seq를 먼저 꺼내므로 엑셀 행이 끝나면 남은 슬롯은 소비되지 않음
+        for (typ, new_sent), (slot_desc, old_val) in zip(seq, slots):
             typ_clean = (typ or "").strip()
             sent_clean = (new_sent or "").strip()
 
@@ -882,15 +971,12 @@ def apply_excel_desc_to_photo_json(
                 old_feature, old_sent = old_val
 
                 if typ_clean == "" and sent_clean == "":
-                    delete_slot_indices.append(i)
+                    delete_slots.append(slot_desc)
                     continue
 
                 # feature: 엑셀 유형 있으면 교체, 없으면 기존 유지
                 if typ_clean:
-                    t = typ_clean
-                    if t.startswith("[") and t.endswith("]"):
-                        t = t[1:-1].strip()
-                    feature_out = f"[{t}]" if t else ""
+                    feature_out = _bracket_feature(typ_clean)
                 else:
                     feature_out = str(old_feature or "").strip()
 
@@ -901,31 +987,58 @@ def apply_excel_desc_to_photo_json(
                 if not isinstance(obj, dict):
                     obj = {}
                     exp_dict[label] = obj
-                obj["feature"] = feature_out
-                obj["sent"] = sent_out
+                if obj.get("feature") != feature_out or obj.get("sent") != sent_out:
+                    obj["feature"] = feature_out
+                    obj["sent"] = sent_out
                 continue
 
             # ===== 구형 슬롯 처리(문자열) =====
-            (slot_desc2, old_text) = slots[i]
             if typ_clean == "" and sent_clean == "":
-                delete_slot_indices.append(i)
+                delete_slots.append(slot_desc)
                 continue
 
-            composed = _compose_text_with_type(old_text, sent_clean, typ_clean)
-            _assign_text_to_slot(slot_desc2, composed)
+            composed = _compose_text_with_type(old_val, sent_clean, typ_clean)
+            _assign_text_to_slot(slot_desc, composed)
 
-        # 엑셀 행 수 < JSON 슬롯 수면, 남은 슬롯은 뒤에서부터 삭제해 개수 일치
-        if len(slots) > len(seq):
-            delete_slot_indices.extend(range(n, len(slots)))
+        # 엑셀 행 수 < JSON 슬롯 수면, 남은 슬롯도 삭제해 개수 일치
+        delete_slots.extend(slot_desc for slot_desc, _ in slots)
 
-        for idx in sorted(delete_slot_indices, reverse=True):
-            _delete_slot(slots[idx][0])
+        # 리스트 인덱스가 밀리지 않도록 뒤에서부터 삭제
+        _delete_slots(delete_slots)
+        for slot_desc in delete_slots:
+            if slot_desc[0] == "new_obj":
+                # 신형 라벨을 지우면 구조 판별이 달라질 수 있으므로 정리 때 다시 판별
+                kinds.pop(id(slot_desc[1]), None)
 
-        _cleanup_exp_sentences(doc)
+        _cleanup_exp_sentences(doc, kinds)
 
     return json_obj
 
 
+def _pick_zip_members(zf: zipfile.ZipFile):
+    """
+    ZIP에서 JSON 1개, XLSX 1개를 추출 대상으로 선택 (중앙 디렉터리 목록을 한 번만 순회).
+    - JSON은 project_*.json 우선, 그 외 첫 번째 .json
+    - Excel은 .xlsx 우선(.xls는 의존성에 따라 미지원일 수 있음)
+    """
+    json_member = first_json = xlsx_member = xls_member = None
+    for m in zf.namelist():
+        low = m.lower()
+        if low.endswith(".json"):
+            if first_json is None:
+                first_json = m
+            if json_member is None and Path(m).name.startswith("project_"):
+                json_member = m
+        elif low.endswith(".xlsx"):
+            if xlsx_member is None:
+                xlsx_member = m
+        elif low.endswith(".xls") and xls_member is None:
+            xls_member = m
+
+    # JSON 우선순위: project_* → 첫 번째 .json / Excel 우선순위: .xlsx → .xls
+    return json_member or first_json, xlsx_member or xls_member
+
+
 def apply_excel_desc_to_json_from_zip(
     zip_bytes: bytes,
     sheet_name: Optional[str] = None,
@@ -939,35 +1052,21 @@ def apply_excel_desc_to_json_from_zip(
         raise TypeError("zip_bytes는 bytes/bytearray여야 합니다.")
 
     with zipfile.ZipFile(BytesIO(zip_bytes), "r") as zf:
-        json_members = [m for m in zf.namelist() if m.lower().endswith(".json")]
-        xlsx_members = [m for m in zf.namelist() if m.lower().endswith(".xlsx")]
-        xls_members = [m for m in zf.namelist() if m.lower().endswith(".xls")]
-
-        json_member = None
-        for m in json_members:
-            if Path(m).name.startswith("project_"):
-                json_member = m
-                break
-        if json_member is None and json_members:
-            json_member = json_members[0]
-
-        excel_member = xlsx_members[0] if xlsx_members else (xls_members[0] if xls_members else None)
+        json_member, excel_member = _pick_zip_members(zf)
 
         if not json_member:
             raise FileNotFoundError("ZIP 안에 JSON 파일이 없습니다.")
         if not excel_member:
             raise FileNotFoundError("ZIP 안에 Excel 파일(.xlsx/.xls)이 없습니다.")
 
-        with zf.open(json_member) as jf:
-            json_obj = json.loads(jf.read().decode("utf-8"))
+        json_obj = fast_json.loads(zf.read(json_member))
 
-        with zf.open(excel_member) as ef:
-            df = _read_excel_multi(ef, sheet_name=sheet_name)
+        # 엑셀은 메모리 버퍼로 읽음 (ZipExtFile은 뒤로 seek할 때마다 처음부터 다시 압축 해제)
+        df = _read_excel_multi(BytesIO(zf.read(excel_member)), sheet_name=sheet_name)
 
         updated = apply_excel_desc_to_photo_json(json_obj, df, skip_blank=skip_blank)
 
         base = Path(json_member).name
         out_name = (base[:-5] if base.lower().endswith(".json") else base) + "_updated.json"
 
-        text = json.dumps(updated, ensure_ascii=False, indent=2)
-        return text.encode("utf-8"), out_name
+        return fast_json.dumps_bytes(updated), out_name
@@ -1,9 +1,12 @@
 import os
-import json
-import copy
 import re
 import random
-import shutil  # zip 압축용
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from dataly_manager.dataly_tools import fast_json
+
+LOAD_WORKERS = min(16, (os.cpu_count() or 1) * 2)  # A/B 파일 읽기+파싱 동시 작업 수
 
 def ensure_folder(path):
     if not os.path.exists(path):
@@ -20,6 +23,66 @@ def find_subfolder(parent, candidates):
             return p
     return None
 
+def write_zip(zip_path, blobs):
+    """
+    (파일명, bytes) 목록을 ZIP으로 기록
+    - 이미 직렬화한 bytes를 그대로 넣으므로 디스크의 결과 파일을 다시 읽지 않음
+    - JSON은 압축이 잘 되므로 ZIP_DEFLATED(compresslevel=1)로 빠르게 압축
+    """
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for name, blob in blobs:
+            zf.writestr(name, blob)
+
+def _new_eval():
+    """빈 평가 dict를 새로 만듦 (deepcopy보다 리터럴 생성이 훨씬 빠름)"""
+    return {
+        "id": "evaluatorAJ",
+        "content": {"description": None, "claims": None, "arguments": None, "comment": ""},
+        "organization": {"completion": None, "comment": ""},
+        "expression": {"accuracy": None, "comment": ""}
+    }
+
+def _merge_pair(data_a, data_b):
+    """A팀 원본 + B팀 SC1 → 병합 결과 dict (B팀 SC1이 없으면 None)"""
+    sc1_b = data_b.get("SC1")
+    if not isinstance(sc1_b, dict):
+        return None
+    # data_b는 이 병합에서만 쓰고 버리는 파싱 결과이므로 sc1_b의 값은 복사 없이 공유
+    # (결과는 직렬화만 하므로 기사별 SC2가 같은 하위 객체를 가리켜도 출력은 동일)
+    sc2 = dict(sc1_b)
+    sc2["ai_flag"] = False
+    sc2["evaluation"] = None  # 키 위치만 잡아 두고 기사마다 새로 채움
+
+    if isinstance(data_a.get("document"), list):
+        articles = data_a["document"]
+    else:
+        articles = [data_a]
+    corpus_id = data_a.get("id")
+    corpus_meta = data_a.get("metadata")
+
+    for art in articles:
+        if isinstance(art.get("SC1"), dict):
+            art["SC1"]["ai_flag"] = False
+            art["SC1"]["evaluation"] = _new_eval()
+        else:
+            art["SC1"] = {"ai_flag": False, "evaluation": _new_eval()}
+        art["SC2"] = {**sc2, "evaluation": _new_eval()}
+
+    return {
+        "id": corpus_id,
+        "metadata": corpus_meta,
+        "document": articles
+    }
+
+def _json_children(folder):
+    """folder 바로 아래의 .json 파일 → {접두어 뗀 파일명: 전체 경로} (scandir 한 번)"""
+    with os.scandir(folder) as it:
+        return {strip_prefix(e.name): e.path for e in it if e.name.endswith(".json")}
+
+def _load_json_file(path):
+    with open(path, 'rb') as f:
+        return fast_json.loads(f.read())
+
 def merge_newspaper_eval(week_num=1, files_per_week=102, base_dir=None):
     if base_dir is None:
         raise ValueError("base_dir는 반드시 지정되어야 합니다. (ZIP 해제 경로)")
@@ -32,75 +95,42 @@ def merge_newspaper_eval(week_num=1, files_per_week=102, base_dir=None):
     if not dir_a or not dir_b:
         raise FileNotFoundError(f"'A' 또는 'B' 폴더를 찾을 수 없습니다. base_dir: {base_dir}")
 
-    default_eval = {
-        "id": "evaluatorAJ",
-        "content": {"description": None, "claims": None, "arguments": None, "comment": ""},
-        "organization": {"completion": None, "comment": ""},
-        "expression": {"accuracy": None, "comment": ""}
-    }
-
-    a_files = {strip_prefix(fn): fn for fn in os.listdir(dir_a) if fn.endswith(".json")}
-    b_files = {strip_prefix(fn): fn for fn in os.listdir(dir_b) if fn.endswith(".json")}
+    # {접두어 뗀 파일명: 전체 경로} — 읽을 때 경로를 다시 조합하지 않음
+    a_files = _json_children(dir_a)
+    b_files = _json_children(dir_b)
     candidate_keys = sorted(set(a_files.keys()) & set(b_files.keys()))
 
+    # merge_base를 한 번만 훑어 이전 주차(1 ~ week_num-1) 폴더만 확인 (주차마다 isdir 하지 않음)
+    prev_weeks = {f"{w}주차" for w in range(1, week_num)}
     used_keys = set()
-    for prev_week in range(1, week_num):
-        prev_dir = os.path.join(merge_base, f"{prev_week}주차")
-        if not os.path.isdir(prev_dir):
-            continue
-        for f in os.listdir(prev_dir):
-            if f.endswith(".json"):
-                key = strip_prefix(f)
-                used_keys.add(key)
+    with os.scandir(merge_base) as it:
+        for e in it:
+            if e.name in prev_weeks and e.is_dir():
+                used_keys.update(_json_children(e.path))
     remain_keys = [k for k in candidate_keys if k not in used_keys]
     remain_keys = remain_keys[:files_per_week]
 
-    out_files = []
+    def merge_one(key):
+        return _merge_pair(_load_json_file(a_files[key]), _load_json_file(b_files[key]))
+
+    # 결과 파일은 다음 주차의 사용 여부 확인에 쓰이므로 디스크에도 남기고,
+    # ZIP은 같은 bytes로 바로 만듦 (output_dir를 다시 훑거나 읽지 않음)
+    out_blobs = []
     count = 0
-    for key in remain_keys:
-        a_path = os.path.join(dir_a, a_files[key])
-        b_path = os.path.join(dir_b, b_files[key])
-        with open(a_path, 'r', encoding='utf-8') as fa:
-            data_a = json.load(fa)
-        with open(b_path, 'r', encoding='utf-8') as fb:
-            data_b = json.load(fb)
-
-        sc1_b = data_b.get("SC1")
-        if not isinstance(sc1_b, dict):
+    # 읽기/파싱/병합은 스레드 풀에서, 쓰기와 로그는 키 순서대로 여기서 처리
+    # (읽기 실패 시 주차 폴더에 일부만 남지 않도록 모두 끝난 뒤 씀)
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as ex:
+        results = list(ex.map(merge_one, remain_keys))
+    for key, merged in zip(remain_keys, results):
+        if merged is None:
             print(f"'{key}'에 B팀 SC1 없음, 건너뜀")
             continue
-        sc2 = copy.deepcopy(sc1_b)
-        sc2["ai_flag"] = False
-        sc2["evaluation"] = copy.deepcopy(default_eval)
-
-        if isinstance(data_a.get("document"), list):
-            articles = data_a["document"]
-            corpus_id = data_a.get("id")
-            corpus_meta = data_a.get("metadata")
-        else:
-            articles = [data_a]
-            corpus_id = data_a.get("id")
-            corpus_meta = data_a.get("metadata")
-
-        for art in articles:
-            if isinstance(art.get("SC1"), dict):
-                art["SC1"]["ai_flag"] = False
-                art["SC1"]["evaluation"] = copy.deepcopy(default_eval)
-            else:
-                art["SC1"] = {"ai_flag": False, "evaluation": copy.deepcopy(default_eval)}
-            art["SC2"] = copy.deepcopy(sc2)
-
-        merged = {
-            "id": corpus_id,
-            "metadata": corpus_meta,
-            "document": articles
-        }
 
         out_name = f"{week_num}_{key}.json"
-        out_path = os.path.join(output_dir, out_name)
-        with open(out_path, 'w', encoding='utf-8') as fo:
-            json.dump(merged, fo, ensure_ascii=False, indent=2)
-        out_files.append(out_path)
+        blob = fast_json.dumps_bytes(merged)
+        with open(os.path.join(output_dir, out_name), 'wb') as fo:
+            fo.write(blob)
+        out_blobs.append((out_name, blob))
         print(f"완료: {out_name}")
         count += 1
 
@@ -109,6 +139,6 @@ def merge_newspaper_eval(week_num=1, files_per_week=102, base_dir=None):
 
     # zip 파일 생성
     zip_path = os.path.join(output_dir, f"merged_{week_num}주차.zip")
-    shutil.make_archive(zip_path.replace('.zip', ''), 'zip', output_dir)
+    write_zip(zip_path, out_blobs)
 
     return msg, output_dir, zip_path
@@ -1,9 +1,12 @@
 #dataly_tools/newspaper_eval_merged.py
 import os
-import json
-import glob
+from io import BytesIO
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, PatternFill, Border, Side
+from openpyxl.worksheet.cell_range import CellRange
+
+from dataly_manager.dataly_tools import fast_json
 
 def get_team_and_worker(folder_name):
     return folder_name[0], folder_name[1:]
@@ -23,16 +26,94 @@ thin_border = Border(
     bottom=Side(style='thin')
 )
 
-def write_eval_table(ws, row_start, team_label, data, center, left):
+# 셀마다 새로 만들지 않도록 공유하는 스타일 객체
+NO_FILL = PatternFill(fill_type=None)
+AVG_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")  # 평균 행
+INCOMPLETE_HEADER_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+LEFT_WRAP_ALIGN = Alignment(horizontal='left', vertical='top', wrap_text=True)
+
+
+class _SheetRows:
+    """
+    write-only 시트는 위에서부터 한 행씩만 쓸 수 있으므로, ws.cell/ws.merge_cells와 같은 좌표로
+    아직 내보내지 않은 행의 셀만 잠시 모아 두었다가 flush(row)에서 그 앞 행까지 순서대로 append
+    - 스타일은 WriteOnlyCell의 공개 속성(alignment/fill/border/number_format)에 공유 스타일 객체를 지정
+    - 열 너비는 첫 flush 전에, 행 높이는 그 행을 flush하기 전에 ws.column_dimensions/row_dimensions에 지정
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.rows = {}  # 아직 내보내지 않은 행 번호 → {열 번호: WriteOnlyCell}
+        self.next_row = 1  # 다음에 append될 행 번호
+
+    def cell(self, row, column, value=None, **styles):
+        cell = WriteOnlyCell(self.ws, value=value)
+        for name, style in styles.items():
+            setattr(cell, name, style)
+        self.rows.setdefault(row, {})[column] = cell
+        return cell
+
+    def merge_cells(self, start_row, start_column, end_row, end_column):
+        """
+        ws.merge_cells와 같은 결과: 시작 셀 외의 셀은 비우고,
+        시작 셀에 이미 테두리가 있으면 범위 가장자리 셀에 그 테두리를 이어 줌
+        """
+        self.ws.merged_cells.add(CellRange(min_col=start_column, min_row=start_row, max_col=end_column, max_row=end_row))
+        for r in range(start_row, end_row + 1):
+            row = self.rows.get(r)
+            if row:
+                for c in range(start_column, end_column + 1):
+                    if (r, c) != (start_row, start_column):
+                        row.pop(c, None)
+
+        anchor = self.rows.get(start_row, {}).get(start_column)
+        if anchor is None or not anchor.has_style:
+            return
+        border = anchor.border
+        cols = range(start_column, end_column + 1)
+        rows = range(start_row, end_row + 1)
+        edges = {
+            "top": [(start_row, c) for c in cols],
+            "left": [(r, start_column) for r in rows],
+            "right": [(r, end_column) for r in rows],
+            "bottom": [(end_row, c) for c in cols],
+        }
+        for name, coords in edges.items():
+            side = getattr(border, name)
+            if side is None or side.style is None:
+                continue
+            edge = Border(**{name: side})
+            for r, c in coords:
+                row = self.rows.setdefault(r, {})
+                cell = row.get(c)
+                if cell is None:
+                    cell = row[c] = WriteOnlyCell(self.ws)
+                cell.border += edge
+
+    def flush(self, before=None):
+        """before 행 앞까지(생략하면 남은 행 전부) 행 순서대로 append하고 버퍼에서 제거"""
+        if before is None:
+            before = max(self.rows, default=0) + 1
+        for r in range(self.next_row, before):
+            row = self.rows.pop(r, None)
+            if not row:
+                self.ws.append([])
+                continue
+            cells = [None] * max(row)
+            for c, cell in row.items():
+                cells[c - 1] = cell
+            self.ws.append(cells)
+        self.next_row = max(self.next_row, before)
+
+
+def write_eval_table(sheet, row_start, team_label, data):
     team = team_label[0]
-    fill_color = TEAM_FILLS.get(team, PatternFill(fill_type=None))
+    fill_color = TEAM_FILLS.get(team, NO_FILL)
 
     headers = ["순번", "평가준거", "평가항목", "점수 (1~7)", "근거", "점수 (1~7)", "근거"]
     for col, header in enumerate(headers, start=1):
-        cell = ws.cell(row=row_start, column=col, value=header)
-        cell.alignment = center
-        cell.fill = fill_color
-        cell.border = thin_border
+        sheet.cell(row=row_start, column=col, value=header, alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
 
     sc1 = data.get("SC1", {})
     sc2 = data.get("SC2", {})
@@ -54,8 +135,7 @@ def write_eval_table(ws, row_start, team_label, data, center, left):
     }
 
     current_row = row_start + 1
-    score1_rows = []
-    score2_rows = []
+    score_spans = []  # 카테고리별 점수 행 범위 (시작 행, 끝 행)
 
     for cat_eng, cat_kor in cat_map.items():
         sc1_cat = sc1_eval.get(cat_eng, {})
@@ -87,137 +167,186 @@ def write_eval_table(ws, row_start, team_label, data, center, left):
                 sc2_comment = sc2_cat.get("comment", "")
 
             row_num = current_row
-            score1_rows.append(row_num)
-            score2_rows.append(row_num)
-
-            cell = ws.cell(row=row_num, column=2, value=str(idx))
-            cell.alignment = center
-            cell.fill = fill_color
-            cell.border = thin_border
-
-            cell = ws.cell(row=row_num, column=3, value=criterion_kor)
-            cell.alignment = center
-            cell.fill = fill_color
-            cell.border = thin_border
-
-            cell = ws.cell(row=row_num, column=4, value=score1 if isinstance(score1, (int, float)) else None)
-            cell.alignment = center
-            cell.fill = fill_color
-            cell.border = thin_border
-
-            cell = ws.cell(row=row_num, column=5, value=sc1_comment)
-            cell.alignment = left
-            cell.fill = fill_color
-            cell.border = thin_border
-
-            cell = ws.cell(row=row_num, column=6, value=score2 if isinstance(score2, (int, float)) else None)
-            cell.alignment = center
-            cell.fill = fill_color
-            cell.border = thin_border
-
-            cell = ws.cell(row=row_num, column=7, value=sc2_comment)
-            cell.alignment = left
-            cell.fill = fill_color
-            cell.border = thin_border
+
+            sheet.cell(row=row_num, column=2, value=str(idx), alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
+            sheet.cell(row=row_num, column=3, value=criterion_kor, alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
+            sheet.cell(row=row_num, column=4, value=score1 if isinstance(score1, (int, float)) else None, alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
+            sheet.cell(row=row_num, column=5, value=sc1_comment, alignment=LEFT_WRAP_ALIGN, fill=fill_color, border=thin_border)
+            sheet.cell(row=row_num, column=6, value=score2 if isinstance(score2, (int, float)) else None, alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
+            sheet.cell(row=row_num, column=7, value=sc2_comment, alignment=LEFT_WRAP_ALIGN, fill=fill_color, border=thin_border)
 
             current_row += 1
 
+        score_spans.append((cat_start_row, current_row - 1))
+
         # 카테고리명 병합
-        ws.merge_cells(start_row=cat_start_row, start_column=2, end_row=current_row - 1, end_column=2)
-        cell = ws.cell(row=cat_start_row, column=2, value=cat_kor)
-        cell.alignment = center
-        cell.fill = fill_color
-        cell.border = thin_border
+        sheet.merge_cells(start_row=cat_start_row, start_column=2, end_row=current_row - 1, end_column=2)
+        sheet.cell(row=cat_start_row, column=2, value=cat_kor, alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
 
         # 내용 총점 행 (엑셀 수식으로 계산)
         if cat_eng == "content":
-            ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-            cell = ws.cell(row=current_row, column=2, value=f"{cat_kor} 총점")
-            cell.alignment = center
-            cell.fill = PatternFill(fill_type=None)
-            cell.border = thin_border
+            sheet.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
+            sheet.cell(row=current_row, column=2, value=f"{cat_kor} 총점", alignment=CENTER_ALIGN, fill=NO_FILL, border=thin_border)
 
-            # 점수 합계 수식
-            d_cells = [f"D{r}" for r in range(cat_start_row, current_row)]
-            f_cells = [f"F{r}" for r in range(cat_start_row, current_row)]
+            # 점수 합계 수식 (행 번호 목록은 D/F열이 함께 사용 → "D9,D10,D11")
+            score_rows = [str(r) for r in range(cat_start_row, current_row)]
 
-            cell = ws.cell(row=current_row, column=4, value=f"=SUM({','.join(d_cells)})")
-            cell.alignment = center
-            cell.border = thin_border
-
-            cell = ws.cell(row=current_row, column=6, value=f"=SUM({','.join(f_cells)})")
-            cell.alignment = center
-            cell.border = thin_border
+            sheet.cell(row=current_row, column=4, value=f"=SUM(D{',D'.join(score_rows)})", alignment=CENTER_ALIGN, border=thin_border)
+            sheet.cell(row=current_row, column=6, value=f"=SUM(F{',F'.join(score_rows)})", alignment=CENTER_ALIGN, border=thin_border)
 
             # 빈칸
             for col in [5, 7]:
-                cell = ws.cell(row=current_row, column=col)
-                cell.border = thin_border
+                sheet.cell(row=current_row, column=col, border=thin_border)
 
             current_row += 1
 
     # 전체 총점 행 (엑셀 수식으로 계산)
-    ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-    cell = ws.cell(row=current_row, column=2, value="전체 총점")
-    cell.alignment = center
-    cell.fill = fill_color
-    cell.border = thin_border
-
-    d_sum = "+".join([f"D{r}" for r in score1_rows])
-    f_sum = "+".join([f"F{r}" for r in score2_rows])
-
-    cell = ws.cell(row=current_row, column=4, value=f"=ROUND(({d_sum}-5)*16.7/5, 1)")
-    cell.number_format = '0.0'
-    cell.alignment = center
-    cell.fill = fill_color
-    cell.border = thin_border
-
-    cell = ws.cell(row=current_row, column=6, value=f"=ROUND(({f_sum}-5)*16.7/5, 1)")
-    cell.number_format = '0.0'
-    cell.alignment = center
-    cell.fill = fill_color
-    cell.border = thin_border
+    sheet.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
+    sheet.cell(row=current_row, column=2, value="전체 총점", alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
+
+    # 카테고리 안의 점수 행은 이어져 있으므로 D3+D4+D5... 대신 범위 합 SUM(D3:D5)+SUM(D7)...
+    d_sum = "+".join(f"SUM(D{s}:D{e})" if e > s else f"SUM(D{s})" for s, e in score_spans)
+    f_sum = "+".join(f"SUM(F{s}:F{e})" if e > s else f"SUM(F{s})" for s, e in score_spans)
+
+    sheet.cell(row=current_row, column=4, value=f"=ROUND(({d_sum}-5)*16.7/5, 1)", number_format='0.0', alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
+    sheet.cell(row=current_row, column=6, value=f"=ROUND(({f_sum}-5)*16.7/5, 1)", number_format='0.0', alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
 
     for col in [5, 7]:
-        cell = ws.cell(row=current_row, column=col)
-        cell.fill = fill_color
-        cell.border = thin_border
+        sheet.cell(row=current_row, column=col, fill=fill_color, border=thin_border)
 
     # 팀 라벨 병합
     total_rows = current_row - (row_start + 1) + 1
     if total_rows > 0:
-        ws.merge_cells(start_row=row_start + 1, start_column=1, end_row=current_row, end_column=1)
-        cell = ws.cell(row=row_start + 1, column=1, value=team_label)
+        sheet.merge_cells(start_row=row_start + 1, start_column=1, end_row=current_row, end_column=1)
+        label_row = row_start + 1
     else:
-        cell = ws.cell(row=current_row, column=1, value=team_label)
+        label_row = current_row
         current_row += 1
 
-    cell.alignment = center
-    cell.fill = fill_color
-    cell.border = thin_border
+    sheet.cell(row=label_row, column=1, value=team_label, alignment=CENTER_ALIGN, fill=fill_color, border=thin_border)
 
     return current_row + 1, current_row
 
 
 
+def _json_files(folder):
+    """folder 바로 아래의 .json 파일 → {파일명: 경로} (glob처럼 숨김 파일 제외, 읽을 수 없는 폴더는 빈 dict)"""
+    try:
+        with os.scandir(folder) as it:
+            return {e.name: e.path for e in it if e.name.endswith(".json") and not e.name.startswith(".")}
+    except OSError:
+        return {}
+
+
+def _index_json_dir(root_path, week_num, storage_folder):
+    """
+    root_path 아래 작업자 폴더별 해당 주차 JSON 목록
+    반환: {작업자폴더: {"": {파일명: 경로}, "storageX": {파일명: 경로}}}
+    """
+    index = {}
+    with os.scandir(root_path) as it:  # DirEntry가 파일 종류를 들고 있어 폴더마다 stat 하지 않음
+        folders = [e.name for e in it if e.is_dir()]
+    for folder in folders:
+        json_dir = os.path.join(root_path, folder, f"week{week_num:02d}_{folder}", storage_folder)
+        index[folder] = {
+            "": _json_files(json_dir),
+            "storageX": _json_files(os.path.join(json_dir, "storageX")),
+        }
+    return index
+
+
+def zip_root_folder(zf):
+    """폴더째 압축한 ZIP의 최상위 폴더명 (없으면 None)"""
+    for name in zf.namelist():
+        top, sep, _ = name.partition("/")
+        if sep and top and top != "__MACOSX":
+            return top
+    return None
+
+
+def _index_json_zip(zf, root, week_num, storage_folder):
+    """_index_json_dir와 같은 구조로, 값은 경로 대신 ZipInfo (해제 없이 이름만 한 번 훑음)"""
+    index = {}
+    prefix = root + "/"
+    for zi in zf.infolist():
+        if not zi.filename.startswith(prefix):
+            continue
+        parts = zi.filename[len(prefix):].split("/")
+        folder = parts[0]
+        if len(parts) < 2 or not folder:
+            continue
+        entry = index.setdefault(folder, {"": {}, "storageX": {}})
+        if parts[1:3] != [f"week{week_num:02d}_{folder}", storage_folder]:
+            continue
+        rest = parts[3:]
+        if len(rest) == 1:
+            sub = ""
+        elif len(rest) == 2 and rest[0] == "storageX":
+            sub = "storageX"
+        else:
+            continue
+        fname = rest[-1]
+        if fname.endswith(".json") and not fname.startswith("."):
+            entry[sub][fname] = zi
+    return index
+
+
 def json_to_excel_stacked(root_path, week_num, storage_folder):
-    def get_team_and_worker(folder_name):
-        return folder_name[0], folder_name[1:]
+    """root_path(압축 해제된 폴더)에서 수합 → root_path/summary_eval_all.xlsx 저장"""
+    index = _index_json_dir(root_path, week_num, storage_folder)
+
+    def load(path):
+        with open(path, 'rb') as f:
+            return fast_json.loads(f.read())
+
+    save_path = os.path.join(root_path, "summary_eval_all.xlsx")
+    _build_stacked_workbook(index, load).save(save_path)
+    print(f"✅ 저장 완료: {save_path}")
+
+
+def json_zip_to_excel_stacked(zf, week_num, storage_folder):
+    """
+    업로드 ZIP을 해제하지 않고 zf.read()로 바로 읽어 수합 → xlsx bytes 반환 (디스크 사용 없음)
+    - ZIP 최상위 폴더가 없으면 ValueError
+    """
+    root = zip_root_folder(zf)
+    if root is None:
+        raise ValueError("압축 내부에 폴더가 없습니다. 폴더째 압축한 zip만 지원합니다.")
+    index = _index_json_zip(zf, root, week_num, storage_folder)
+
+    def load(zi):
+        return fast_json.loads(zf.read(zi))
+
+    out = BytesIO()
+    _build_stacked_workbook(index, load).save(out)
+    return out.getvalue()
 
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin'))
 
-    all_folders = [f for f in os.listdir(root_path) if os.path.isdir(os.path.join(root_path, f))]
+def _first_summary(team_data, sc_key):
+    """팀 순서(A → B → C)대로 처음 나오는 비어 있지 않은 요약문"""
+    for data in team_data.values():
+        if sc_key in data:
+            summary = data[sc_key].get("summary", "")
+            if summary:
+                return summary
+    return ""
+
+
+def _ai_flag_teams(team_data, sc_key):
+    """ai_flag가 켜진 팀 이름 목록 (예: "A팀, C팀")"""
+    return ", ".join(f"{t}팀" for t, data in team_data.items() if sc_key in data and data[sc_key].get("ai_flag", False))
+
+
+def _build_stacked_workbook(index, load_json):
+    """index: _index_json_dir/_index_json_zip 결과, load_json: index 값 → dict"""
     workers = {}
-    for folder in all_folders:
+    for folder in index:
         if len(folder) >= 4:
             team, worker_id = get_team_and_worker(folder)
             workers.setdefault(worker_id, {})[team] = folder
 
-    wb = Workbook()
-    default_sheet = wb.active
-    wb.remove(default_sheet)  # 기본 시트 제거
+    # write-only 워크북: 문서 블록을 다 쓸 때마다 그 행들을 바로 스트리밍 (셀 격자를 워크북에 만들지 않음)
+    wb = Workbook(write_only=True)
 
     incomplete_records = []  # 미완료 문서 기록 리스트
 
@@ -231,22 +360,18 @@ def json_to_excel_stacked(root_path, week_num, storage_folder):
             folder = teams.get(team)
             if not folder:
                 continue
-            json_dir = os.path.join(root_path, folder, f"week{week_num:02d}_{folder}", storage_folder)
-            if not os.path.exists(json_dir):
-                continue
-            files = glob.glob(os.path.join(json_dir, "*.json"))
-            files += glob.glob(os.path.join(json_dir, "storageX", "*.json"))
-            files = [os.path.basename(f) for f in files]
-            all_json_files.update(files)
+            all_json_files.update(index[folder][""])
+            all_json_files.update(index[folder]["storageX"])
 
         if not all_json_files:
             continue  # 세 팀 모두 문서 없으면 스킵
 
         sheet_name = "W" + (worker_id if not worker_id[0].isalpha() else worker_id[1:])
         ws = wb.create_sheet(title=sheet_name)
-
-        center = Alignment(horizontal='center', vertical='center')
-        left = Alignment(horizontal='left', vertical='top', wrap_text=True)
+        col_widths = {"A":10,"B":14,"C":16,"D":12,"E":40,"F":12,"G":40,"H":30}
+        for col, w in col_widths.items():
+            ws.column_dimensions[col].width = w  # 열 너비는 첫 행을 쓰기 전에 정해야 함
+        sheet = _SheetRows(ws)
 
         start_row = 1
         label_index = 1
@@ -259,17 +384,14 @@ def json_to_excel_stacked(root_path, week_num, storage_folder):
                 folder = teams.get(team)
                 if not folder:
                     continue
-                json_dir = os.path.join(root_path, folder, f"week{week_num:02d}_{folder}", storage_folder)
-                json_path = os.path.join(json_dir, base_fname)
-                json_path_storageX = os.path.join(json_dir, "storageX", base_fname)
+                json_src = index[folder][""].get(base_fname)
+                json_src_storageX = index[folder]["storageX"].get(base_fname)
 
-                if os.path.exists(json_path):
-                    with open(json_path, encoding='utf-8') as f:
-                        team_data[team] = json.load(f)
+                if json_src is not None:
+                    team_data[team] = load_json(json_src)
                     team_data[team]['_incomplete'] = False
-                elif os.path.exists(json_path_storageX):
-                    with open(json_path_storageX, encoding='utf-8') as f:
-                        team_data[team] = json.load(f)
+                elif json_src_storageX is not None:
+                    team_data[team] = load_json(json_src_storageX)
                     team_data[team]['_incomplete'] = True
                     doc_id = team_data[team].get("id", "")
                     incomplete_records.append({
@@ -286,230 +408,168 @@ def json_to_excel_stacked(root_path, week_num, storage_folder):
 
             print(f"[{worker_id}] 사용된 파일명: {base_fname}")
 
+            # team_data는 A → B → C 순으로 채워지므로 팀 순서대로 훑을 때 바로 순회
             # 대표 doc_id, 제목, 본문은 가능한 A팀 기준으로, 없으면 B팀, 없으면 C팀 순으로
-            doc_source = None
-            for t in ['A','B','C']:
-                if t in team_data:
-                    doc_source = team_data[t]
-                    break
-
-            if not doc_source:
-                continue
+            doc_source = next(iter(team_data.values()))
 
             doc_id = doc_source.get("id", "")
 
             paragraphs = doc_source.get("paragraph", [])
             if paragraphs:
                 title = paragraphs[0].get("form", "")
-                body = "".join(p.get("form", "") for p in paragraphs[1:])
+                body = "".join([p.get("form", "") for p in paragraphs[1:]])  # join은 어차피 리스트로 모으므로 바로 리스트로 전달
             else:
                 title = ""
                 body = ""
 
-            def get_summary(team_data, sc_key):
-                for t in ['A', 'B', 'C']:
-                    if t in team_data and sc_key in team_data[t]:
-                        summary = team_data[t][sc_key].get("summary", "")
-                        if summary:
-                            return summary
-                return ""
-
-            sc1_summary = get_summary(team_data, "SC1")
-            sc2_summary = get_summary(team_data, "SC2")
+            sc1_summary = _first_summary(team_data, "SC1")
+            sc2_summary = _first_summary(team_data, "SC2")
 
             metadata = doc_source.get("metadata", {})
 
             # 문서번호
-            ws.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=3)
-            cell = ws.cell(row=start_row, column=1, value="문서번호")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=3)
+            sheet.cell(row=start_row, column=1, value="문서번호", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row, start_column=4, end_row=start_row, end_column=7)
-            cell = ws.cell(row=start_row, column=4, value=doc_id)
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row, start_column=4, end_row=start_row, end_column=7)
+            sheet.cell(row=start_row, column=4, value=doc_id, alignment=CENTER_ALIGN)
 
             # 제목
-            ws.merge_cells(start_row=start_row + 1, start_column=1, end_row=start_row + 1, end_column=3)
-            cell = ws.cell(row=start_row + 1, column=1, value="제목")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 1, start_column=1, end_row=start_row + 1, end_column=3)
+            sheet.cell(row=start_row + 1, column=1, value="제목", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 1, start_column=4, end_row=start_row + 1, end_column=7)
-            cell = ws.cell(row=start_row + 1, column=4, value=title)
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 1, start_column=4, end_row=start_row + 1, end_column=7)
+            sheet.cell(row=start_row + 1, column=4, value=title, alignment=CENTER_ALIGN)
 
             # 신문 사설 정보 라벨 (H열)
-            cell = ws.cell(row=start_row + 1, column=8, value="신문 사설 정보")
-            cell.alignment = center
+            sheet.cell(row=start_row + 1, column=8, value="신문 사설 정보", alignment=CENTER_ALIGN)
 
             # 신문 사설 정보 내용 (H열 아래)
+            # (행 높이는 같은 행의 원문 높이 140으로 정해짐)
             if metadata:
-                info_lines = [f"{k}: {v}" for k, v in metadata.items()]
-                info_text = "\n".join(info_lines)
-                cell = ws.cell(row=start_row + 2, column=8, value=info_text)
-                cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-                ws.row_dimensions[start_row + 2].height = 15 * len(info_lines)
+                info_text = "\n".join([f"{k}: {v}" for k, v in metadata.items()])
+                sheet.cell(row=start_row + 2, column=8, value=info_text, alignment=LEFT_WRAP_ALIGN)
 
             # 원문
-            ws.merge_cells(start_row=start_row + 2, start_column=1, end_row=start_row + 2, end_column=3)
-            cell = ws.cell(row=start_row + 2, column=1, value="원문")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 2, start_column=1, end_row=start_row + 2, end_column=3)
+            sheet.cell(row=start_row + 2, column=1, value="원문", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 2, start_column=4, end_row=start_row + 2, end_column=7)
-            cell = ws.cell(row=start_row + 2, column=4, value=body)
-            cell.alignment = left
+            sheet.merge_cells(start_row=start_row + 2, start_column=4, end_row=start_row + 2, end_column=7)
+            sheet.cell(row=start_row + 2, column=4, value=body, alignment=LEFT_WRAP_ALIGN)
             ws.row_dimensions[start_row + 2].height = 140
 
             # 요약문 작성자
-            ws.merge_cells(start_row=start_row + 3, start_column=1, end_row=start_row + 3, end_column=3)
-            cell = ws.cell(row=start_row + 3, column=1, value="요약문 작성자")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 3, start_column=1, end_row=start_row + 3, end_column=3)
+            sheet.cell(row=start_row + 3, column=1, value="요약문 작성자", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 3, start_column=4, end_row=start_row + 3, end_column=5)
-            cell = ws.cell(row=start_row + 3, column=4, value="A")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 3, start_column=4, end_row=start_row + 3, end_column=5)
+            sheet.cell(row=start_row + 3, column=4, value="A", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 3, start_column=6, end_row=start_row + 3, end_column=7)
-            cell = ws.cell(row=start_row + 3, column=6, value="B")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 3, start_column=6, end_row=start_row + 3, end_column=7)
+            sheet.cell(row=start_row + 3, column=6, value="B", alignment=CENTER_ALIGN)
 
             # 요약문
-            ws.merge_cells(start_row=start_row + 4, start_column=1, end_row=start_row + 4, end_column=3)
-            cell = ws.cell(row=start_row + 4, column=1, value="요약문")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 4, start_column=1, end_row=start_row + 4, end_column=3)
+            sheet.cell(row=start_row + 4, column=1, value="요약문", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 4, start_column=4, end_row=start_row + 4, end_column=5)
-            cell = ws.cell(row=start_row + 4, column=4, value=sc1_summary)
-            cell.alignment = left
+            sheet.merge_cells(start_row=start_row + 4, start_column=4, end_row=start_row + 4, end_column=5)
+            sheet.cell(row=start_row + 4, column=4, value=sc1_summary, alignment=LEFT_WRAP_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 4, start_column=6, end_row=start_row + 4, end_column=7)
-            cell = ws.cell(row=start_row + 4, column=6, value=sc2_summary)
-            cell.alignment = left
+            sheet.merge_cells(start_row=start_row + 4, start_column=6, end_row=start_row + 4, end_column=7)
+            sheet.cell(row=start_row + 4, column=6, value=sc2_summary, alignment=LEFT_WRAP_ALIGN)
 
             ws.row_dimensions[start_row + 4].height = 140
 
             # 요약문 글자수
-            ws.merge_cells(start_row=start_row + 5, start_column=1, end_row=start_row + 5, end_column=3)
-            cell = ws.cell(row=start_row + 5, column=1, value="요약문 글자수")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 5, start_column=1, end_row=start_row + 5, end_column=3)
+            sheet.cell(row=start_row + 5, column=1, value="요약문 글자수", alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 5, start_column=4, end_row=start_row + 5, end_column=5)
-            cell = ws.cell(row=start_row + 5, column=4, value=len(sc1_summary))
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 5, start_column=4, end_row=start_row + 5, end_column=5)
+            sheet.cell(row=start_row + 5, column=4, value=len(sc1_summary), alignment=CENTER_ALIGN)
 
-            ws.merge_cells(start_row=start_row + 5, start_column=6, end_row=start_row + 5, end_column=7)
-            cell = ws.cell(row=start_row + 5, column=6, value=len(sc2_summary))
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row + 5, start_column=6, end_row=start_row + 5, end_column=7)
+            sheet.cell(row=start_row + 5, column=6, value=len(sc2_summary), alignment=CENTER_ALIGN)
 
             start_row += 6  # 빈 행 없이 이어서 작성
 
-            def get_ai_flag_teams(team_data, sc_key):
-                flagged_teams = []
-                for t in ['A', 'B', 'C']:
-                    if t in team_data and sc_key in team_data[t]:
-                        if team_data[t][sc_key].get("ai_flag", False):
-                            flagged_teams.append(f"{t}팀")
-                return ", ".join(flagged_teams)
-
-            sc1_ai_flag_teams = get_ai_flag_teams(team_data, "SC1")
-            sc2_ai_flag_teams = get_ai_flag_teams(team_data, "SC2")
+            sc1_ai_flag_teams = _ai_flag_teams(team_data, "SC1")
+            sc2_ai_flag_teams = _ai_flag_teams(team_data, "SC2")
 
             # 라벨
-            ws.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=3)
-            cell = ws.cell(row=start_row, column=1, value="생성 AI 의심")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=3)
+            sheet.cell(row=start_row, column=1, value="생성 AI 의심", alignment=CENTER_ALIGN)
 
             # SC1 - O 여부
-            ws.merge_cells(start_row=start_row, start_column=4, end_row=start_row, end_column=5)
-            cell = ws.cell(row=start_row, column=4, value="O" if sc1_ai_flag_teams else "")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row, start_column=4, end_row=start_row, end_column=5)
+            sheet.cell(row=start_row, column=4, value="O" if sc1_ai_flag_teams else "", alignment=CENTER_ALIGN)
 
             # SC2 - O 여부
-            ws.merge_cells(start_row=start_row, start_column=6, end_row=start_row, end_column=7)
-            cell = ws.cell(row=start_row, column=6, value="O" if sc2_ai_flag_teams else "")
-            cell.alignment = center
+            sheet.merge_cells(start_row=start_row, start_column=6, end_row=start_row, end_column=7)
+            sheet.cell(row=start_row, column=6, value="O" if sc2_ai_flag_teams else "", alignment=CENTER_ALIGN)
 
             # SC1 팀명 (H열)
-            cell = ws.cell(row=start_row, column=8, value=sc1_ai_flag_teams)
-            cell.alignment = left
+            sheet.cell(row=start_row, column=8, value=sc1_ai_flag_teams, alignment=LEFT_WRAP_ALIGN)
 
             # SC2 팀명 (I열)
-            cell = ws.cell(row=start_row, column=9, value=sc2_ai_flag_teams)
-            cell.alignment = left
+            sheet.cell(row=start_row, column=9, value=sc2_ai_flag_teams, alignment=LEFT_WRAP_ALIGN)
             start_row += 1
 
             total_score_cells_D = []  # SC1 전체 총점 셀 주소 저장
             total_score_cells_F = []  # SC2 전체 총점 셀 주소 저장
 
             # 평가표 작성 함수는 별도로 정의했다고 가정 (원래 쓰던 write_eval_table 재사용)
-            for team, label_base in zip(['A', 'B', 'C'], ['A', 'B', 'C']):
-                if team in team_data:
-                    label = label_base + str(label_index)
-                    start_row, total_score_row = write_eval_table(ws, start_row, label, team_data[team], center, left)
+            for team, data in team_data.items():
+                label = team + str(label_index)
+                start_row, total_score_row = write_eval_table(sheet, start_row, label, data)
 
-                    total_score_cells_D.append(f"D{total_score_row}")
-                    total_score_cells_F.append(f"F{total_score_row}")
+                total_score_cells_D.append(f"D{total_score_row}")
+                total_score_cells_F.append(f"F{total_score_row}")
 
-                    if team_data[team].get('_incomplete', False):
-                        cell = ws.cell(row=start_row - 1, column=8, value="미완료")
-                        cell.alignment = center
+                if data.get('_incomplete', False):
+                    sheet.cell(row=start_row - 1, column=8, value="미완료", alignment=CENTER_ALIGN)
 
             label_index += 1
 
             # 팀 평균 행 추가
             if total_score_cells_D and total_score_cells_F:
                 avg_row = start_row
-                avg_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-
-                ws.merge_cells(start_row=avg_row, start_column=1, end_row=avg_row, end_column=3)
-                cell = ws.cell(row=avg_row, column=1, value="평균(A,B,C)")
-                cell.alignment = center
-                cell.fill = avg_fill
-                cell.border = thin_border
-
-                cell = ws.cell(row=avg_row, column=4, value=f"=ROUND(AVERAGE({','.join(total_score_cells_D)}), 1)")
-                cell.number_format = '0.0'
-                cell.alignment = center
-                cell.fill = avg_fill
-                cell.border = thin_border
-
-                cell = ws.cell(row=avg_row, column=6, value=f"=ROUND(AVERAGE({','.join(total_score_cells_F)}), 1)")
-                cell.number_format = '0.0'
-                cell.alignment = center
-                cell.fill = avg_fill
-                cell.border = thin_border
+                avg_fill = AVG_FILL
+
+                sheet.merge_cells(start_row=avg_row, start_column=1, end_row=avg_row, end_column=3)
+                sheet.cell(row=avg_row, column=1, value="평균(A,B,C)", alignment=CENTER_ALIGN, fill=avg_fill, border=thin_border)
+                sheet.cell(row=avg_row, column=4, value=f"=ROUND(AVERAGE({','.join(total_score_cells_D)}), 1)", number_format='0.0', alignment=CENTER_ALIGN, fill=avg_fill, border=thin_border)
+                sheet.cell(row=avg_row, column=6, value=f"=ROUND(AVERAGE({','.join(total_score_cells_F)}), 1)", number_format='0.0', alignment=CENTER_ALIGN, fill=avg_fill, border=thin_border)
 
                 for col in [5, 7]:
-                    cell = ws.cell(row=avg_row, column=col)
-                    cell.fill = avg_fill
-                    cell.border = thin_border
+                    sheet.cell(row=avg_row, column=col, fill=avg_fill, border=thin_border)
 
                 start_row += 1
 
-        col_widths = {"A":10,"B":14,"C":16,"D":12,"E":40,"F":12,"G":40,"H":30}
-        for col, w in col_widths.items():
-            ws.column_dimensions[col].width = w
+            sheet.flush(start_row)  # 다음 문서는 start_row부터 쓰므로 앞 행은 모두 완성됨
+
+        sheet.flush()
 
     # --- 미완료 문서 시트 추가 ---
     if incomplete_records:
         ws_incomplete = wb.create_sheet(title="미완료 문서")
+        for col_letter in ['A', 'B', 'C', 'D']:
+            ws_incomplete.column_dimensions[col_letter].width = 20
+        sheet = _SheetRows(ws_incomplete)
         headers = ["문서번호", "파일명", "팀", "작업자 ID"]
         for col, h in enumerate(headers, 1):
-            cell = ws_incomplete.cell(row=1, column=col, value=h)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+            sheet.cell(row=1, column=col, value=h, alignment=CENTER_ALIGN, fill=INCOMPLETE_HEADER_FILL)
 
         for row_idx, record in enumerate(incomplete_records, start=2):
-            ws_incomplete.cell(row=row_idx, column=1, value=record["doc_id"]).alignment = center
-            ws_incomplete.cell(row=row_idx, column=2, value=record["filename"]).alignment = center
-            ws_incomplete.cell(row=row_idx, column=3, value=record["team"]).alignment = center
-            ws_incomplete.cell(row=row_idx, column=4, value=record["worker"]).alignment = center
-
-        for col_letter in ['A', 'B', 'C', 'D']:
-            ws_incomplete.column_dimensions[col_letter].width = 20
-
-    save_path = os.path.join(root_path, "summary_eval_all.xlsx")
-    wb.save(save_path)
-    print(f"✅ 저장 완료: {save_path}")
+            sheet.cell(row=row_idx, column=1, value=record["doc_id"], alignment=CENTER_ALIGN)
+            sheet.cell(row=row_idx, column=2, value=record["filename"], alignment=CENTER_ALIGN)
+            sheet.cell(row=row_idx, column=3, value=record["team"], alignment=CENTER_ALIGN)
+            sheet.cell(row=row_idx, column=4, value=record["worker"], alignment=CENTER_ALIGN)
+            sheet.flush(row_idx + 1)
+
+    if not wb.sheetnames:
+        # 시트 없는 파일은 만들 수 없으므로 수합할 문서가 없다고 알림
+        raise ValueError("해당 주차/storage 폴더에서 수합할 JSON 파일을 찾지 못했습니다.")
+    return wb
 
 #
 # # 사용 예시
@@ -11,7 +11,6 @@
   : ZIP(엑셀+단일 JSON)을 받아 엑셀의 '설명 문장'을 JSON에 반영해 반환
 """
 
-import json
 import math
 import re
 import zipfile
@@ -19,11 +18,12 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple, Optional
 from collections import defaultdict
+from itertools import chain
 
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+import xlsxwriter
+
+from dataly_manager.dataly_tools import excel_read, fast_json
 
 # 표시 순서(메타 키)
 META_ORDER = [
@@ -31,61 +31,102 @@ META_ORDER = [
     "title", "url", "Medium_category", "domain", "media_id",
     "publisher", "term", "source_id",
 ]
+# metadata 셀 문자열 틀 (META_ORDER 순서, 마지막 줄만 쉼표 없음)
+META_CELL_PREFIX = "metadata : "
+_META_CELL_TEMPLATE = META_CELL_PREFIX + "{{\n" + ",\n".join(f'  "{k}": "{{}}"' for k in META_ORDER) + "\n}}"
+_META_URL_IDX = META_ORDER.index("url")
 
 _ILLEGAL_XML_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
 
-def _collect_metadata_by_id(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+def _excel_ids(df: pd.DataFrame) -> pd.Series:
+    # 병합 셀 보정(ffill) + 문자열화 + 공백 제거한 id 열 (id별 수집 함수들이 함께 사용)
+    return df["id"].ffill().astype(str).str.strip()
+
+
+def _collect_meta_maps_by_id(
+    df: pd.DataFrame, ids: Optional[pd.Series] = None
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], Dict[str, str]]:
     """
-    엑셀 DF에서 id별로 metadata 셀을 파싱해 전체 metadata dict를 수집.
-    - id는 ffill
-    - 각 id에 대해 '비어있지 않은 첫 metadata dict'를 채택
+    엑셀 DF를 한 번만 훑어 id별 (metadata dict, Medium_category, note)를 수집.
+    - id는 ffill (병합 셀 보정), Medium_category도 ffill
+    - metadata 셀은 행마다 한 번만 파싱해 metadata/note에 함께 사용
+    - 각 id에 대해 '비어있지 않은 첫 값'을 채택
+    - ids: 이미 만든 _excel_ids(df) 결과가 있으면 재사용
+    반환: (metadata_map, medium_map, note_map)
     """
-    if "id" not in df.columns or "metadata" not in df.columns:
-        return {}
+    metadata_map: Dict[str, Dict[str, Any]] = {}
+    medium_map: Dict[str, str] = {}
+    note_map: Dict[str, str] = {}
+    if "id" not in df.columns:
+        return metadata_map, medium_map, note_map
+
+    has_meta = "metadata" in df.columns
+    # Medium_category가 없거나 전부 빈 셀이면 ffill/문자열 변환과 행별 확인을 생략
+    mc_col = df.get("Medium_category")
+    has_mc = mc_col is not None and bool(mc_col.notna().any())
+    if not (has_meta or has_mc):
+        return metadata_map, medium_map, note_map
 
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str)
+    # 열이 없으면 None/"" 로 채워 같은 zip 루프를 사용 (각 map이 비게 됨)
+    ids = (_excel_ids(df) if ids is None else ids).tolist()
+    metas = df["metadata"].tolist() if has_meta else [None] * len(ids)
+    mcs = mc_col.ffill().fillna("").astype(str).tolist() if has_mc else [""] * len(ids)
 
-    out: Dict[str, Dict[str, Any]] = {}
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
+    for _id, meta_cell, mc in zip(ids, metas, mcs):
         if not _id:
             continue
-        meta_dict = _parse_metadata_cell(row["metadata"])
-        # 빈 dict는 무시
-        if meta_dict and _id not in out:
-            out[_id] = meta_dict
-    return out
 
+        if has_mc and _id not in medium_map:
+            mc = mc.strip()
+            if mc:
+                medium_map[_id] = mc
+
+        if has_meta and (_id not in metadata_map or _id not in note_map):
+            meta_dict = _parse_metadata_cell(meta_cell)
+            if meta_dict and _id not in metadata_map:
+                metadata_map[_id] = meta_dict
+            note = str(meta_dict.get("note", "") or "").strip()
+            if note and _id not in note_map:
+                note_map[_id] = note
+
+    return metadata_map, medium_map, note_map
 
 def xls_safe(val) -> str:
     """
-    openpyxl이 허용하지 않는 XML 제어문자를 제거.
+    엑셀(XML)이 허용하지 않는 제어문자를 제거.
     숫자/None도 문자열로 안전 변환.
     """
     if val is None:
         return ""
     s = str(val)
-    # 흔한 보정: 고아 따옴표/널문자 등
-    s = s.replace("\x00", "")  # 널은 빈문자로
-    s = _ILLEGAL_XML_RE.sub("", s)
-    return s
+    # 널문자도 _ILLEGAL_XML_RE 범위에 포함. 제어문자가 없는 셀(대부분)은 그대로 반환
+    if _ILLEGAL_XML_RE.search(s) is None:
+        return s
+    return _ILLEGAL_XML_RE.sub("", s)
 
 META_NOTE_RE = re.compile(r'"note"\s*:\s*"(?P<note>.*?)"', re.DOTALL)
 
 # 엑셀 metadata 셀에서 { ... } 블록을 찾아 dict로 파싱
 def _parse_metadata_cell(cell_text: Any) -> Dict[str, Any]:
     """
-    'metadata : { ... }' 형태의 멀티라인 문자열에서 { ... } 만 추출하여 json.loads 시도.
+    'metadata : { ... }' 형태의 멀티라인 문자열에서 { ... } 만 추출하여 JSON 파싱 시도 (orjson 우선).
     엑셀에서 따옴표가 이중("...")으로 들어간 경우도 복원.
     실패 시 최소한 "note"만 정규식으로 추출.
     """
-    if cell_text is None:
-        return {}
-    s = str(cell_text).strip()
+    if not isinstance(cell_text, str):
+        return {}  # None/NaN(병합 셀 아래 행)/숫자 등은 {..}를 담을 수 없음
+    s = cell_text.strip()
     if not s:
         return {}
 
+    # 빠른 경로: 이 도구가 내보낸 'metadata : {...}' 또는 '{...}' 셀은 찾기/자르기 없이 바로 파싱
+    body = s[len(META_CELL_PREFIX):] if s.startswith(META_CELL_PREFIX) else s
+    if body[0] == "{" and body[-1] == "}":
+        try:
+            return fast_json.loads(body)
+        except Exception:
+            pass  # 따옴표 이중화 등은 아래 일반 경로에서 보정
+
     i, j = s.find("{"), s.rfind("}")
     if i == -1 or j == -1 or i >= j:
         s_fix = s.replace('""', '"')
@@ -96,7 +137,7 @@ def _parse_metadata_cell(cell_text: Any) -> Dict[str, Any]:
     # json 파싱 시도 (따옴표 이중화 보정 포함)
     for candidate in (blob, blob.replace('""', '"')):
         try:
-            return json.loads(candidate)
+            return fast_json.loads(candidate)
         except Exception:
             pass
 
@@ -104,35 +145,7 @@ def _parse_metadata_cell(cell_text: Any) -> Dict[str, Any]:
     m = META_NOTE_RE.search(s_fix)
     return {"note": m.group("note")} if m else {}
 
-def _collect_note_by_id(df: pd.DataFrame) -> Dict[str, str]:
-    """
-    엑셀 DF에서 id별로 metadata 셀을 파싱해 note를 수집.
-    - id는 ffill
-    - 각 id에 대해 '비어있지 않은 첫 note'를 채택
-    """
-    if "id" not in df.columns or "metadata" not in df.columns:
-        return {}
-
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str)
-
-    out: Dict[str, str] = {}
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
-        if not _id:
-            continue
-        meta_dict = _parse_metadata_cell(row["metadata"])
-        note = str(meta_dict.get("note", "") or "").strip()
-        if note and _id not in out:
-            out[_id] = note
-    return out
-
-THIN_BORDER = Border(
-    left=Side(style="thin"), right=Side(style="thin"),
-    top=Side(style="thin"), bottom=Side(style="thin"),
-)
-HEADER_FILL = PatternFill(start_color="EEECE1", end_color="EEECE1", fill_type="solid")
-LINK_BLUE = "0563C1"
+LINK_BLUE = "#0563C1"
 
 # [타입] 문장 형태 파싱용 ([Type] 내용)
 TYPE_BRACKET_RE = re.compile(r"^\s*\[(.+?)\]\s*(.*)$")
@@ -147,6 +160,7 @@ def extract_sentences(doc: Dict[str, Any]) -> List[Tuple[str, str]]:
     (type, sentence) 튜플 리스트로 반환
     """
     out: List[Tuple[str, str]] = []
+    type_match = TYPE_BRACKET_RE.match
     for ex in doc.get("EX", []):
         for item in ex.get("exp_sentence", []) or []:
             if not isinstance(item, dict):
@@ -157,7 +171,7 @@ def extract_sentences(doc: Dict[str, Any]) -> List[Tuple[str, str]]:
                     if not s:
                         continue
                     text = str(s).strip()
-                    m = TYPE_BRACKET_RE.match(text)
+                    m = type_match(text) if "[" in text else None
                     if m:
                         out.append((m.group(1).strip(), m.group(2).strip()))
                     else:
@@ -179,14 +193,9 @@ def format_metadata_and_url(meta: Dict[str, Any]) -> Tuple[str, str]:
     metadata를 멀티라인 문자열로 정리하고, url만 분리해서 반환
     """
     url_only = _clean_url(meta.get("url", ""))
-    lines = ['metadata : {']
-    for k in META_ORDER:
-        v = meta.get(k, "")
-        if k == "url":
-            v = url_only or meta.get("url", "")
-        lines.append(f'  "{k}": "{v}",' if k != META_ORDER[-1] else f'  "{k}": "{v}"')
-    lines.append("}")
-    return "\n".join(lines), url_only
+    values = [meta.get(k, "") for k in META_ORDER]
+    values[_META_URL_IDX] = url_only or values[_META_URL_IDX]
+    return _META_CELL_TEMPLATE.format(*values), url_only
 
 
 def extract_mdfcn_memo(mdfcn_infos):
@@ -203,7 +212,7 @@ def extract_mdfcn_memo(mdfcn_infos):
         if not raw:
             continue
         try:
-            arr = json.loads(raw)
+            arr = fast_json.loads(raw)
             if isinstance(arr, list):
                 for obj in arr:
                     val = str((obj or {}).get("value", "")).strip()
@@ -218,15 +227,37 @@ def extract_mdfcn_memo(mdfcn_infos):
     return "\n\n".join(out)
 
 
+# 행 튜플 필드 순서: 엑셀 A~G열 + 하이퍼링크용 meta_url(엑셀 열에는 포함 안 함)
+ROW_FIELDS = (
+    "id", "worker_id_cnst", "Medium_category", "유형", "설명 문장",
+    "metadata", "mdfcn_memo(검수자 수정 이력)", "meta_url",
+)
+
+
 def to_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     JSON(dict) -> 행 리스트
     """
-    rows: List[Dict[str, Any]] = []
     docs = data.get("document", [])
     if not isinstance(docs, list):
-        return rows
+        return []
+    return docs_to_rows(docs)
 
+
+def docs_to_rows(docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    document 이터러블 -> 행 리스트 (스트리밍 파서 결과도 그대로 사용 가능)
+    """
+    return [dict(zip(ROW_FIELDS, t)) for t in _docs_to_row_tuples(docs)]
+
+
+def _docs_to_row_tuples(docs: Iterable[Dict[str, Any]]) -> List[Tuple[str, ...]]:
+    """
+    document 이터러블 -> ROW_FIELDS 순서의 행 튜플 리스트
+    (엑셀 작성용: 행마다 dict를 만들고 키로 다시 꺼내지 않음)
+    """
+    rows: List[Tuple[str, ...]] = []
+    append = rows.append
     for doc in docs:
         img_id = str(doc.get("id", ""))
         meta = doc.get("metadata", {}) or {}
@@ -238,172 +269,136 @@ def to_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
 
         pairs = extract_sentences(doc) or [("", "")]
         for typ, sent in pairs:
-            rows.append({
-                "id": img_id,
-                "worker_id_cnst": worker_id_cnst,
-                "Medium_category": medium_category,
-                "유형": typ,
-                "설명 문장": sent,
-                "metadata": md_text,
-                "meta_url": md_url,  # 하이퍼링크용(엑셀 열에는 포함 안 함)
-                "mdfcn_memo(검수자 수정 이력)": memo_text,
-            })
+            append((img_id, worker_id_cnst, medium_category, typ, sent, md_text, memo_text, md_url))
     return rows
 
 
 def estimate_wrapped_lines(text: str, col_chars: int) -> int:
     if not text:
         return 1
+    per_line = max(col_chars, 5) * 1.08
+    s = str(text)
+    if "\n" not in s:  # 대부분의 셀: 문단 하나 → split/루프 없이 계산
+        return max(1, math.ceil(len(s) / per_line))
     total = 0
-    width = max(col_chars, 5)
-    for para in str(text).split("\n"):
-        total += max(1, math.ceil(len(para) / (width * 1.08)))
+    for para in s.split("\n"):
+        total += max(1, math.ceil(len(para) / per_line))
     return max(1, total)
 
 
-def _write_excel_to_bytes(all_rows: List[Dict[str, Any]]) -> bytes:
+def _write_excel_to_bytes(all_rows: List[Tuple[str, ...]]) -> bytes:
     """
-    행 리스트 -> Excel bytes
+    행 튜플(ROW_FIELDS 순서) 리스트 -> Excel bytes (xlsxwriter로 메모리에서 바로 생성)
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "result"
-
     headers = [
         "id", "worker_id_cnst", "Medium_category",
         "유형", "설명 문장", "metadata", "mdfcn_memo\n(검수자 수정 이력)"
     ]
-    ws.append(headers)
-
-    # 헤더 스타일
-    for c in range(1, len(headers) + 1):
-        cell = ws.cell(row=1, column=c)
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        cell.border = THIN_BORDER
-        cell.fill = HEADER_FILL
-
-    # 열 너비(문자폭 기준 추정)
-    widths = {1: 12, 2: 16, 3: 14, 4: 16, 5: 80, 6: 60, 7: 50}
-    for col_idx, w in widths.items():
-        ws.column_dimensions[get_column_letter(col_idx)].width = w
-
-    # 그룹 시작/개수 추적
-    start_row_by_group: Dict[Tuple[str], int] = {}
-    count_by_group: Dict[Tuple[str], int] = {}
-
-    current_row = 2
-    for row in all_rows:
-        ws.append([
-            xls_safe(row.get("id", "")),
-            xls_safe(row.get("worker_id_cnst", "")),
-            xls_safe(row.get("Medium_category", "")),
-            xls_safe(row.get("유형", "")),
-            xls_safe(row.get("설명 문장", "")),
-            xls_safe(row.get("metadata", "")),
-            xls_safe(row.get("mdfcn_memo(검수자 수정 이력)", "")),
-        ])
-        for c in range(1, len(headers) + 1):
-            ws.cell(row=current_row, column=c).alignment = Alignment(
-                vertical="top", wrap_text=(c in (5, 6, 7))
-            )
-            ws.cell(row=current_row, column=c).border = THIN_BORDER
-
-        key = (row.get("id",""),)
-        if key not in start_row_by_group:
-            start_row_by_group[key] = current_row
-            count_by_group[key] = 0
-        count_by_group[key] += 1
-        current_row += 1
-
-    # 병합: 같은 id 블록에서 [id, worker, Medium_category, metadata, mdfcn_memo] 병합
-    merge_cols = [1, 2, 3, 6, 7]
-    for key, start in start_row_by_group.items():
-        cnt = count_by_group[key]
-        if cnt > 1:
-            end = start + cnt - 1
-            for col in merge_cols:
-                ws.merge_cells(start_row=start, start_column=col, end_row=end, end_column=col)
-                ws.cell(row=start, column=col).alignment = Alignment(vertical="top", wrap_text=True)
-
-    # metadata 하이퍼링크(같은 id 첫 행만)
-    first_url_by_id: Dict[str, str] = {}
-    for _r, row in enumerate(all_rows, start=2):
-        rid = row.get("id", "")
-        if rid and rid not in first_url_by_id:
-            first_url_by_id[rid] = row.get("meta_url", "") or ""
-
-    from openpyxl.cell.cell import MergedCell
-    try:
-        from openpyxl.worksheet.hyperlink import Hyperlink
-    except Exception:
-        Hyperlink = None  # 구버전 대비
-
-    for key, start in start_row_by_group.items():
-        doc_id = key[0]
-        url = str(first_url_by_id.get(doc_id, "") or "").strip()
-        if not (url and url.startswith(("http://", "https://"))):
-            continue
-
-        c = ws.cell(row=start, column=6)
-
-        # 병합셀인 경우 top-left 좌표가 맞는지 확인
-        if isinstance(c, MergedCell):
-            # 보통 start,6은 top-left라 정상 Cell이어야 하지만
-            # 드물게 MergedCell로 잡히면 한 번 해제/재설정이 필요할 수 있음.
-            # 여기서는 하이퍼링크를 워크시트 레벨에 직접 추가하는 fallback 사용
-            if Hyperlink is not None:
-                ws._hyperlinks.append(Hyperlink(ref=c.coordinate, target=url, display=url))
+    # 열 너비(문자폭 기준 추정), 0-based
+    widths = [12, 16, 14, 16, 80, 60, 50]
+
+    # 셀 값 + id별 첫 행(인덱스, URL) + 같은 id가 연속된 구간(시작 인덱스, 개수) 수집
+    # (병합은 연속 구간 단위 — 같은 id가 떨어져 나와도 병합 범위가 겹치지 않음)
+    values: List[List[str]] = []
+    first_rows: Dict[str, Tuple[int, Any]] = {}
+    runs: List[List[int]] = []
+    for i, row in enumerate(all_rows):
+        values.append([xls_safe(v) for v in row[:7]])
+        doc_id = row[0]
+        if doc_id not in first_rows:
+            first_rows[doc_id] = (i, row[7] or "")
+        if i and doc_id == all_rows[i - 1][0]:
+            runs[-1][1] += 1
         else:
+            runs.append([i, 1])
+
+    output = BytesIO()
+    # 문장/metadata가 '='나 'http'로 시작해도 수식/링크로 바뀌지 않도록 문자열 그대로 기록
+    wb_options = {"in_memory": True, "strings_to_formulas": False, "strings_to_urls": False}
+    with xlsxwriter.Workbook(output, wb_options) as wb:
+        ws = wb.add_worksheet("result")
+
+        # 서식은 한 번만 만들어 재사용
+        header_fmt = wb.add_format({
+            "align": "center", "valign": "vcenter", "text_wrap": True,
+            "border": 1, "bg_color": "#EEECE1",
+        })
+        top_fmt = wb.add_format({"valign": "top", "border": 1})
+        wrap_fmt = wb.add_format({"valign": "top", "text_wrap": True, "border": 1})
+        link_fmt = wb.add_format({
+            "valign": "top", "text_wrap": True, "border": 1,
+            "font_color": LINK_BLUE,  # 밑줄 없음
+        })
+
+        for c, w in enumerate(widths):
+            ws.set_column(c, c, w)
+        for c, h in enumerate(headers):
+            ws.write_string(0, c, h, header_fmt)
+
+        # 데이터 영역: A~D는 위쪽 정렬, E~G(설명 문장/metadata/memo)는 줄바꿈
+        col_fmts = [top_fmt, top_fmt, top_fmt, top_fmt, wrap_fmt, wrap_fmt, wrap_fmt]
+        for r, vals in enumerate(values, start=1):
+            for c, v in enumerate(vals):
+                if v:
+                    ws.write_string(r, c, v, col_fmts[c])
+                else:
+                    ws.write_blank(r, c, None, col_fmts[c])  # 빈 값은 서식만 있는 빈 셀
+
+        # 병합: 같은 id 연속 구간에서 [id, worker, Medium_category, metadata, mdfcn_memo] 병합
+        merge_cols = [0, 1, 2, 5, 6]
+        for start, cnt in runs:
+            if cnt > 1:
+                r = start + 1
+                for col in merge_cols:
+                    ws.merge_range(r, col, r + cnt - 1, col, values[start][col], wrap_fmt)
+
+        # metadata 하이퍼링크(같은 id 첫 행만)
+        for doc_id, (start, url) in first_rows.items():
+            url = str(url).strip()
+            if not (doc_id and url.startswith(("http://", "https://"))):
+                continue
+            text = values[start][5]
             try:
-                # 신버전 권장 경로: 문자열 직접 대입
-                c.hyperlink = url
-            except AttributeError:
-                # 구버전/특수환경: Hyperlink 객체 직접 추가
-                if Hyperlink is not None:
-                    ws._hyperlinks.append(Hyperlink(ref=c.coordinate, target=url, display=url))
-
-        # 스타일 (밑줄 끄기: 일부 버전은 None 대신 "none"이 안전)
-        c.font = Font(color=LINK_BLUE, underline="none")
-        c.alignment = Alignment(vertical="top", wrap_text=True)
-        c.border = THIN_BORDER
-
-    # 행 높이 대략 조정
-    LINE_HEIGHT_PT = 18
-    group_starts = set(start_row_by_group.values())
-    for r in range(2, current_row):
-        desc = ws.cell(row=r, column=5).value or ""
-        desc_lines = estimate_wrapped_lines(desc, widths[5])
-        if r in group_starts:
-            meta_plain = ws.cell(row=r, column=6).value or ""
-            memo_plain = ws.cell(row=r, column=7).value or ""
-            need = max(
-                desc_lines,
-                estimate_wrapped_lines(meta_plain, widths[6]),
-                estimate_wrapped_lines(memo_plain, widths[7]),
-            )
-        else:
-            need = desc_lines
-        ws.row_dimensions[r].height = max(1, need) * LINE_HEIGHT_PT
-
-    # 틀 고정
-    ws.freeze_panes = "A2"
-
-    # 메모리로 저장
-    bio = BytesIO()
-    wb.save(bio)
-    bio.seek(0)
-    return bio.getvalue()
+                ok = ws.write_url(start + 1, 5, url, link_fmt, string=text) == 0
+            except ValueError:
+                ok = False
+            if not ok:
+                ws.write_string(start + 1, 5, text, wrap_fmt)  # URL 형식이 아니면 텍스트만 유지
+
+        # 행 높이 대략 조정 (메타/메모는 블록 첫 행에서만 반영)
+        LINE_HEIGHT_PT = 18
+        group_starts = {start for start, _ in runs}
+        for i, (_, _, _, _, desc, meta_plain, memo_plain) in enumerate(values):
+            need = estimate_wrapped_lines(desc, widths[4])
+            if i in group_starts:
+                need = max(
+                    need,
+                    estimate_wrapped_lines(meta_plain, widths[5]),
+                    estimate_wrapped_lines(memo_plain, widths[6]),
+                )
+            ws.set_row(i + 1, max(1, need) * LINE_HEIGHT_PT)
+
+        # 틀 고정
+        ws.freeze_panes(1, 0)
+
+    return output.getvalue()
 
 
 def photo_json_to_xlsx_bytes(data: Dict[str, Any]) -> bytes:
     """
     datalyManager에서 호출하는 공개 API
     """
-    rows = to_rows(data)
-    if not rows:
-        # 빈 통합문서라도 반환(다운로드 버튼 활성 목적)
-        return _write_excel_to_bytes([])
-    return _write_excel_to_bytes(rows)
+    docs = data.get("document", [])
+    # 빈 통합문서라도 반환(다운로드 버튼 활성 목적)
+    return _write_excel_to_bytes(_docs_to_row_tuples(docs) if isinstance(docs, list) else [])
+
+
+def photo_json_bytes_to_xlsx_bytes(raw: bytes) -> bytes:
+    """
+    업로드 원본(bytes)을 document 단위로 스트리밍 파싱해 변환.
+    전체 JSON 트리를 메모리에 만들지 않고 문서 하나씩 행으로 바꾼다.
+    """
+    return _write_excel_to_bytes(_docs_to_row_tuples(fast_json.iter_items(raw, "document.item")))
 
 def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) -> pd.DataFrame:
     """
@@ -416,12 +411,16 @@ def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) ->
     """
     need_cols = ["id", "설명 문장"]
     opt_cols  = ["유형", "Medium_category"]
+    read_cols = set(need_cols + opt_cols + ["metadata"])
+
+    # 변환에 쓰는 열만 읽음 (나머지 열은 DataFrame으로 만들지 않음)
+    def _keep(c: str) -> bool:
+        return c in read_cols
 
     if sheet_name is None:
-        sheets = pd.read_excel(ef, sheet_name=None)  # OrderedDict[시트명 -> DF]
+        sheets = excel_read.read_sheets(ef, keep=_keep)
         dfs = []
         for name, df in sheets.items():
-            df = df.copy()
             for c in need_cols + opt_cols:
                 if c not in df.columns:
                     df[c] = ""
@@ -434,8 +433,7 @@ def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) ->
 
     # 단일 시트명 (str)
     if isinstance(sheet_name, str):
-        df = pd.read_excel(ef, sheet_name=sheet_name)
-        df = df.copy()
+        df = excel_read.read_sheets(ef, [sheet_name], keep=_keep)[sheet_name]
         for c in need_cols + opt_cols:
             if c not in df.columns:
                 df[c] = ""
@@ -448,12 +446,12 @@ def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) ->
     except TypeError:
         raise TypeError("sheet_name은 None, 문자열, 또는 문자열 리스트여야 합니다.")
     dfs = []
-    all_sheets = pd.read_excel(ef, sheet_name=None)
+    all_sheets = excel_read.read_sheets(ef, names, keep=_keep, ignore_missing=True)
     for nm in names:
         if nm not in all_sheets:
             # 없는 시트는 건너뜀(필요 시 에러로 바꿔도 됨)
             continue
-        df = all_sheets[nm].copy()
+        df = all_sheets[nm]
         for c in need_cols + opt_cols:
             if c not in df.columns:
                 df[c] = ""
@@ -483,10 +481,61 @@ def _delete_slot(slot_descriptor):
             obj.pop(key, None)
 
 
+def _delete_slots(slot_descriptors) -> None:
+    """
+    슬롯 목록(순회 순서)을 뒤에서부터 삭제.
+    같은 리스트의 연속 인덱스(남은 슬롯 일괄 삭제 등)는 pop을 반복하지 않고 슬라이스 한 번으로 삭제
+    """
+    i = len(slot_descriptors) - 1
+    while i >= 0:
+        desc = slot_descriptors[i]
+        if desc[0] == "list" and 0 <= desc[2] < len(desc[1]):
+            lst, hi = desc[1], desc[2]
+            lo = hi
+            while i > 0:
+                prev = slot_descriptors[i - 1]
+                if prev[0] != "list" or prev[1] is not lst or prev[2] != lo - 1 or lo == 0:
+                    break
+                lo -= 1
+                i -= 1
+            del lst[lo:hi + 1]
+        else:
+            _delete_slot(desc)
+        i -= 1
+
+
+def _is_clean_text(v: Any) -> bool:
+    # 정리해도 그대로 남는 문자열 (비어 있지 않고 앞뒤 공백 없음)
+    return isinstance(v, str) and v != "" and v.strip() == v
+
+
+def _is_clean_value(v: Any) -> bool:
+    # 구형 값(str 또는 list[str])이 정리 후에도 그대로인지
+    if isinstance(v, list):
+        return bool(v) and all(_is_clean_text(s) for s in v)
+    return _is_clean_text(v)
+
+
+def _needs_cleanup(exp: Any) -> bool:
+    """
+    _cleanup_exp_sentences가 exp를 바꿀지 미리 확인.
+    이미 정리된 구조(대부분의 JSON)는 새 dict/list를 만들지 않고 그대로 둠.
+    """
+    if isinstance(exp, list):
+        return not (exp and all(
+            isinstance(item, dict) and item and all(_is_clean_value(v) for v in item.values())
+            for item in exp
+        ))
+    if isinstance(exp, dict):
+        return not (exp and all(_is_clean_value(v) for v in exp.values()))
+    return False
+
+
 def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
     """
     빈 문자열/빈 리스트/빈 딕셔너리를 걷어내서 exp_sentence 구조를 가볍게 정리.
     (키 자체도 제거)
+    값이 이미 문자열이면 str() 변환 없이 strip (결과는 str(v or "").strip()과 동일)
     """
     ex_list = doc.get("EX", [])
     if not isinstance(ex_list, list):
@@ -494,7 +543,7 @@ def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
 
     for ex in ex_list:
         exp = ex.get("exp_sentence")
-        if exp is None:
+        if exp is None or not _needs_cleanup(exp):
             continue
 
         # list 형태
@@ -505,11 +554,11 @@ def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
                     new_item = {}
                     for k, v in item.items():
                         if isinstance(v, list):
-                            vv = [str(s).strip() for s in v if str(s or "").strip()]
+                            vv = [t for s in v if (t := s.strip() if type(s) is str else str(s or "").strip())]
                             if vv:
                                 new_item[k] = vv
                         else:
-                            s = str(v or "").strip()
+                            s = v.strip() if type(v) is str else str(v or "").strip()
                             if s:
                                 new_item[k] = s
                     if new_item:
@@ -525,11 +574,11 @@ def _cleanup_exp_sentences(doc: Dict[str, Any]) -> None:
             new_exp = {}
             for k, v in exp.items():
                 if isinstance(v, list):
-                    vv = [str(s).strip() for s in v if str(s or "").strip()]
+                    vv = [t for s in v if (t := s.strip() if type(s) is str else str(s or "").strip())]
                     if vv:
                         new_exp[k] = vv
                 else:
-                    s = str(v or "").strip()
+                    s = v.strip() if type(v) is str else str(v or "").strip()
                     if s:
                         new_exp[k] = s
             if new_exp:
@@ -549,7 +598,8 @@ def _compose_text_with_type(old_text: str, new_sentence: str, excel_type: str) -
 
     # [타입] 파싱
     old_text_str = str(old_text or "")
-    m = TYPE_BRACKET_RE.match(old_text_str)
+    # "[" 가 없으면 정규식이 맞을 수 없으므로 호출 생략 (대부분의 문장)
+    m = TYPE_BRACKET_RE.match(old_text_str) if "[" in old_text_str else None
     old_type = (m.group(1).strip() if m else "")
     old_body = (m.group(2).strip() if m else old_text_str.strip())
 
@@ -610,46 +660,46 @@ def _iter_sentence_slots_with_old(doc: Dict[str, Any]):
 
 
 def _assign_text_to_slot(slot_descriptor, new_text: str):
+    # 현재 값과 같으면 쓰지 않음 (이미 반영된 JSON을 다시 돌리는 경우가 흔함)
     mode = slot_descriptor[0]
     if mode == "list":
         lst, idx = slot_descriptor[1], slot_descriptor[2]
-        lst[idx] = new_text
+        if lst[idx] != new_text:
+            lst[idx] = new_text
     elif mode == "dict_scalar":
         obj, key = slot_descriptor[1], slot_descriptor[2]
-        obj[key] = new_text
+        if obj.get(key) != new_text:
+            obj[key] = new_text
 
 
-def _collect_excel_pairs_by_id(df: pd.DataFrame, skip_blank: bool = True) -> Dict[str, List[Tuple[str, str]]]:
+def _collect_excel_pairs_by_id(
+    df: pd.DataFrame, skip_blank: bool = True, ids: Optional[pd.Series] = None
+) -> Dict[str, List[Tuple[str, str]]]:
     """
     엑셀에서 id별 (유형, 설명 문장) 시퀀스를 원본 행 순서대로 수집.
     - 병합 셀로 인해 비는 id/유형은 ffill로 채움
     - skip_blank=True면 빈 '설명 문장'은 건너뜀
+    - ids: 이미 만든 _excel_ids(df) 결과가 있으면 재사용
     반환: { id: [(type, sentence), ...], ... }
     """
     required = {"id", "설명 문장"}
     if not required.issubset(set(df.columns)):
         raise ValueError("엑셀에 'id', '설명 문장' 컬럼이 필요합니다.")
 
-    tmp = df.copy()
-    # 병합 셀 보정
-    if "id" in tmp.columns:
-        tmp["id"] = tmp["id"].ffill()
-    if "유형" in tmp.columns:
-        tmp["유형"] = tmp["유형"].ffill()
-
-    tmp["id"] = tmp["id"].astype(str)
-    if "유형" not in tmp.columns:
-        tmp["유형"] = ""  # 유형 컬럼이 없어도 동작하게
-    tmp["유형"] = tmp["유형"].fillna("").astype(str)
-    tmp["설명 문장"] = tmp["설명 문장"].fillna("").astype(str)
+    # 병합 셀 보정: DataFrame 전체를 복사하지 않고 필요한 열만 변환 (strip/빈 문장 제외도 열 단위로)
+    if ids is None:
+        ids = _excel_ids(df)
+    sents = df["설명 문장"].fillna("").astype(str).str.strip()
+    if "유형" in df.columns:
+        types = df["유형"].ffill().fillna("").astype(str).str.strip()
+    else:
+        types = pd.Series("", index=df.index)  # 유형 컬럼이 없어도 동작하게
+    if skip_blank:
+        keep = sents != ""
+        ids, types, sents = ids[keep], types[keep], sents[keep]
 
     bucket: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
-        typ = row["유형"].strip()
-        sent = row["설명 문장"].strip()
-        if skip_blank and not sent:
-            continue
+    for _id, typ, sent in zip(ids.tolist(), types.tolist(), sents.tolist()):
         bucket[_id].append((typ, sent))
     return bucket
 
@@ -672,10 +722,10 @@ def apply_excel_desc_to_photo_json(
       * id별로 엑셀에서 수집한 Medium_category가 존재하면 document.metadata.Medium_category에 기록
       * skip_blank=True이면 공백값은 무시
     """
-    mapping = _collect_excel_pairs_by_id(excel_df, skip_blank=skip_blank)
-    metadata_map = _collect_metadata_by_id(excel_df)
-    medium_map = _collect_medium_by_id(excel_df)
-    note_map = _collect_note_by_id(excel_df)
+    # id 열 보정(ffill/strip)은 한 번만 하고 두 수집 함수가 함께 사용
+    ids = _excel_ids(excel_df) if "id" in excel_df.columns else None
+    mapping = _collect_excel_pairs_by_id(excel_df, skip_blank=skip_blank, ids=ids)
+    metadata_map, medium_map, note_map = _collect_meta_maps_by_id(excel_df, ids=ids)
 
     docs = json_obj.get("document", [])
     if not isinstance(docs, list):
@@ -712,9 +762,11 @@ def apply_excel_desc_to_photo_json(
 
         # 2-2) 설명 문장/유형 반영 (기존 로직 그대로)
         seq = mapping.get(doc_id, [])
-        slots = list(_iter_sentence_slots_with_old(doc))
+        # 슬롯은 리스트로 만들지 않고 엑셀 행과 함께 한 번만 순회
+        slot_iter = _iter_sentence_slots_with_old(doc)
+        first_slot = next(slot_iter, None)
         # --- [추가] exp_sentence가 전혀 없고, 엑셀 시퀀스가 있으면 안전 생성 후 append ---
-        if not slots and seq:
+        if first_slot is None and seq:
             ex_list = doc.get("EX")
             if not isinstance(ex_list, list) or not ex_list:
                 doc["EX"] = [{"exp_sentence": []}]
@@ -735,57 +787,53 @@ def apply_excel_desc_to_photo_json(
             _cleanup_exp_sentences(doc)
             continue
         # --- [추가 끝] ---
-        n = min(len(seq), len(slots))
-        delete_slot_indices = []
+        slots = chain((first_slot,), slot_iter) if first_slot is not None else iter(())
+        delete_slots = []  # 삭제할 슬롯 (순회 순서)
 
-        for i in range(n):
-            (slot_desc, old_text) = slots[i]
-            typ, new_sent = seq[i]
+        # zip은 seq를 먼저 꺼내므로 엑셀 행이 끝나면 남은 슬롯은 소비되지 않음
+        for (typ, new_sent), (slot_desc, old_text) in zip(seq, slots):
             typ_clean = (typ or "").strip()
             sent_clean = (new_sent or "").strip()
 
             if typ_clean == "" and sent_clean == "":
-                delete_slot_indices.append(i)
+                delete_slots.append(slot_desc)
                 continue
 
             composed = _compose_text_with_type(old_text, sent_clean, typ_clean)
             _assign_text_to_slot(slot_desc, composed)
 
-        if len(slots) > len(seq):
-            delete_slot_indices.extend(range(n, len(slots)))
-
-        for idx in sorted(delete_slot_indices, reverse=True):
-            _delete_slot(slots[idx][0])
+        # 남은 슬롯도 삭제 대상 (리스트 인덱스가 밀리지 않도록 뒤에서부터 삭제)
+        delete_slots.extend(slot_desc for slot_desc, _ in slots)
+        _delete_slots(delete_slots)
 
         _cleanup_exp_sentences(doc)
 
     return json_obj
 
 
-def _collect_medium_by_id(df: pd.DataFrame) -> Dict[str, str]:
+def _pick_zip_members(zf: zipfile.ZipFile):
     """
-    엑셀에서 id별 Medium_category 값을 수집.
-    - 병합 셀 보정을 위해 id, Medium_category ffill
-    - 각 id에 대해 '비어있지 않은 첫 값'을 채택
+    ZIP에서 JSON 1개, XLSX 1개를 추출 대상으로 선택 (중앙 디렉터리 목록을 한 번만 순회).
+    - JSON은 project_*.json 우선, 그 외 첫 번째 .json
+    - Excel은 .xlsx 우선(.xls는 의존성에 따라 미지원일 수 있음)
     """
-    if "id" not in df.columns:
-        return {}
-
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str)
-
-    if "Medium_category" not in tmp.columns:
-        return {}
+    json_member = first_json = xlsx_member = xls_member = None
+    for m in zf.namelist():
+        low = m.lower()
+        if low.endswith(".json"):
+            if first_json is None:
+                first_json = m
+            if json_member is None and Path(m).name.startswith("project_"):
+                json_member = m
+        elif low.endswith(".xlsx"):
+            if xlsx_member is None:
+                xlsx_member = m
+        elif low.endswith(".xls") and xls_member is None:
+            xls_member = m
 
-    tmp["Medium_category"] = tmp["Medium_category"].ffill().fillna("").astype(str)
+    # JSON 우선순위: project_* → 첫 번째 .json / Excel 우선순위: .xlsx → .xls
+    return json_member or first_json, xlsx_member or xls_member
 
-    out: Dict[str, str] = {}
-    for _, row in tmp.iterrows():
-        _id = row["id"].strip()
-        mc = row["Medium_category"].strip()
-        if _id and mc and _id not in out:
-            out[_id] = mc
-    return out
 
 def apply_excel_desc_to_json_from_zip(
     zip_bytes: bytes,
@@ -800,20 +848,7 @@ def apply_excel_desc_to_json_from_zip(
         raise TypeError("zip_bytes는 bytes/bytearray여야 합니다.")
 
     with zipfile.ZipFile(BytesIO(zip_bytes), "r") as zf:
-        # 구성 파일 선택
-        json_members = [m for m in zf.namelist() if m.lower().endswith(".json")]
-        xlsx_members = [m for m in zf.namelist() if m.lower().endswith(".xlsx")]
-        xls_members  = [m for m in zf.namelist() if m.lower().endswith(".xls")]
-
-        json_member = None
-        for m in json_members:
-            if Path(m).name.startswith("project_"):
-                json_member = m
-                break
-        if json_member is None and json_members:
-            json_member = json_members[0]
-
-        excel_member = xlsx_members[0] if xlsx_members else (xls_members[0] if xls_members else None)
+        json_member, excel_member = _pick_zip_members(zf)
 
         if not json_member:
             raise FileNotFoundError("ZIP 안에 JSON 파일이 없습니다.")
@@ -821,12 +856,10 @@ def apply_excel_desc_to_json_from_zip(
             raise FileNotFoundError("ZIP 안에 Excel 파일(.xlsx/.xls)이 없습니다.")
 
         # JSON 로드
-        with zf.open(json_member) as jf:
-            json_obj = json.loads(jf.read().decode("utf-8"))
+        json_obj = fast_json.loads(zf.read(json_member))
 
-        # Excel 로드
-        with zf.open(excel_member) as ef:
-            df = _read_excel_multi(ef, sheet_name=sheet_name)
+        # Excel 로드 (메모리 버퍼로: ZipExtFile은 뒤로 seek할 때마다 처음부터 다시 압축 해제)
+        df = _read_excel_multi(BytesIO(zf.read(excel_member)), sheet_name=sheet_name)
 
         # 반영
         updated = apply_excel_desc_to_photo_json(json_obj, df, skip_blank=skip_blank)
@@ -835,5 +868,4 @@ def apply_excel_desc_to_json_from_zip(
         base = Path(json_member).name
         out_name = (base[:-5] if base.lower().endswith(".json") else base) + "_updated.json"
 
-        text = json.dumps(updated, ensure_ascii=False, indent=2)
-        return text.encode("utf-8"), out_name
+        return fast_json.dumps_bytes(updated), out_name
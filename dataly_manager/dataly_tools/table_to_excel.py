@@ -8,19 +8,20 @@
 - 같은 id 블록 기준으로 [A:id, D:metadata] 병합
 - metadata 첫 행에만 URL 하이퍼링크
 """
-import json
-from collections import defaultdict
+from collections import defaultdict, deque
 from io import BytesIO
 from typing import Any, Dict, Iterable, List, Tuple, Optional
 
 import pandas as pd
-from openpyxl.styles import Alignment, PatternFill, Font, Border, Side
+import xlsxwriter
 
 import zipfile
 from pathlib import Path
 
 import unicodedata as ud
 
+from dataly_manager.dataly_tools import excel_read, fast_json
+
 def _norm_colname(s: str) -> str:
     if s is None:
         return ""
@@ -144,61 +145,64 @@ def _pick_sentence(exp_item) -> str:
 
 def extract_mdfcn_values(obj, sep: str = "\n") -> str:
     """mdfcn_infos에서 value만 추출(중복 제거, 순서 유지) 후 sep로 결합"""
-    values: List[str] = []
-
-    def _dedup_keep_order(items: List[str]) -> List[str]:
-        seen, out = set(), []
-        for it in items:
-            if it and it not in seen:
-                seen.add(it)
-                out.append(it)
-        return out
-
-    def _walk(x):
-        if x is None:
-            return
+    # 빠른 경로: 비어 있음(None, "", [], {}) / 공백 문자열
+    if not obj or (isinstance(obj, str) and not obj.strip()):
+        return ""
+
+    out: List[str] = []
+    seen = set()
+
+    # 빠른 경로: JSON 문자열이 섞이지 않은 평평한 문자열 리스트는 순회 없이 바로 처리
+    if isinstance(obj, list) and all(isinstance(x, str) and x.lstrip()[:1] not in ("[", "{") for x in obj):
+        for x in obj:
+            s = x.strip()
+            if s and s not in TYPE_TAGS and s not in seen:
+                seen.add(s)
+                out.append(s)
+        return sep.join(out)
+
+    # 재귀 대신 명시적 스택으로 DFS (자식은 역순으로 쌓아 기존 순서 유지)
+    stack = deque([obj])
+    while stack:
+        x = stack.pop()
+        found = None
         if isinstance(x, str):
             s = x.strip()
-            if not s:
-                return
             if s[:1] in ("[", "{"):
                 try:
-                    _walk(json.loads(s))
-                    return
+                    stack.append(fast_json.loads(s))
+                    continue
                 except Exception:
-                    if s not in TYPE_TAGS:
-                        values.append(s)
-                    return
+                    pass
             if s not in TYPE_TAGS:
-                values.append(s)
-            return
-        if isinstance(x, dict):
+                found = s
+        elif isinstance(x, dict):
             v = x.get("value")
             if isinstance(v, str):
-                v = v.strip()
-                if v:
-                    values.append(v)
+                found = v.strip()
+            children = []
             mm = x.get("mdfcn_memo")
             if isinstance(mm, str):
                 mm_s = mm.strip()
                 if mm_s:
                     try:
-                        _walk(json.loads(mm_s))
+                        children.append(fast_json.loads(mm_s))
                     except Exception:
                         pass
             for k, sub in x.items():
                 if k in ("value", "mdfcn_memo"):
                     continue
                 if isinstance(sub, (list, dict)):
-                    _walk(sub)
-            return
-        if isinstance(x, (list, tuple)):
-            for it in x:
-                _walk(it)
-            return
+                    children.append(sub)
+            stack.extend(reversed(children))
+        elif isinstance(x, (list, tuple)):
+            stack.extend(reversed(x))
+
+        if found and found not in seen:
+            seen.add(found)
+            out.append(found)
 
-    _walk(obj)
-    return sep.join(_dedup_keep_order([v for v in values if isinstance(v, str)]))
+    return sep.join(out)
 
 
 def extract_url(meta: Any) -> str:
@@ -211,117 +215,145 @@ def extract_url(meta: Any) -> str:
     return ""
 
 
-def table_json_to_xlsx_bytes(data: Dict[str, Any]) -> bytes:
-    """datalyManager에서 호출하는 공개 API
-    - worker_id_cnst, mdfcn_infos 컬럼 제거 버전
-    """
-    rows: List[Dict[str, Any]] = []
-    group_counts = defaultdict(int)
-
+def _iter_table_records(data: Dict[str, Any]):
+    """document → EX → exp_sentence를 (id, reference_type, 설명 문장, metadata, url) 레코드로 평탄화"""
     for doc in data.get("document", []) or []:
         doc_id = doc.get("id", "")
         metadata = doc.get("metadata", {}) or {}
 
-        # URL 추출
+        # metadata 문자열/URL은 문서당 한 번만 계산
+        metadata_str = fast_json.dumps(metadata)
         url = extract_url(metadata)
 
         for ex in doc.get("EX", []) or []:
             ref_type = ex.get("reference", {}).get("reference_type", "")
             for exp_item in _iter_exp_items(ex):
-                sentence = _pick_sentence(exp_item)  # ← 키 변형 안전 처리
-                rows.append({
-                    "id": doc_id,
-                    "유형": REF_MAP.get(ref_type, ref_type),
-                    "설명 문장": sentence,
-                    "metadata": json.dumps(metadata, ensure_ascii=False, indent=2),
-                    "url": url,
-                })
-                group_counts[doc_id] += 1
+                yield doc_id, ref_type, _pick_sentence(exp_item), metadata_str, url  # ← 키 변형 안전 처리
+
+
+TABLE_COLUMNS = ("id", "reference_type", "설명 문장", "metadata", "url")
+
+
+def _records_to_columns(records: Iterable[tuple]) -> Dict[str, list]:
+    """레코드를 컬럼별 리스트로 모음 (행마다 dict/tuple을 DataFrame이 다시 풀지 않도록)"""
+    ids: List[Any] = []
+    ref_types: List[Any] = []
+    sentences: List[str] = []
+    metas: List[str] = []
+    urls: List[str] = []
+    for doc_id, ref_type, sentence, metadata_str, url in records:
+        ids.append(doc_id)
+        ref_types.append(ref_type)
+        sentences.append(sentence)
+        metas.append(metadata_str)
+        urls.append(url)
+    return dict(zip(TABLE_COLUMNS, (ids, ref_types, sentences, metas, urls)))
+
+
+def table_json_to_xlsx_bytes(data: Dict[str, Any]) -> bytes:
+    """datalyManager에서 호출하는 공개 API
+    - worker_id_cnst, mdfcn_infos 컬럼 제거 버전
+    """
+    return _table_columns_to_xlsx_bytes(_records_to_columns(_iter_table_records(data)))
+
+
+def table_json_bytes_to_xlsx_bytes(raw: bytes) -> bytes:
+    """
+    업로드 원본(bytes)을 document 단위로 스트리밍 파싱해 변환.
+    전체 JSON 트리를 메모리에 만들지 않고 문서 하나씩 레코드로 바꾼다.
+    """
+    docs = fast_json.iter_items(raw, "document.item")
+    return _table_columns_to_xlsx_bytes(_records_to_columns(_iter_table_records({"document": docs})))
+
+
+def _table_columns_to_xlsx_bytes(columns: Dict[str, list]) -> bytes:
+    df = pd.DataFrame(columns, columns=list(TABLE_COLUMNS))
+
+    # 컬럼 단위 변환
+    df["유형"] = df["reference_type"].map(REF_MAP).fillna(df["reference_type"])
+    group_counts = df.groupby("id", sort=False, dropna=False).size().to_dict()
 
     # 빈 데이터여도 헤더만 있는 파일 생성
-    df = pd.DataFrame(
-        rows,
-        columns=["id", "유형", "설명 문장", "metadata"]
-    ).fillna("")
+    out_df = df[["id", "유형", "설명 문장", "metadata"]].fillna("")
 
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="sheet1")
-        ws = writer.sheets["sheet1"]
-
-        # 열 너비 (A: id, B: 유형, C: 설명 문장, D: metadata)
-        widths = {"A": 18, "B": 16, "C": 80, "D": 50}
-        for col, w in widths.items():
-            ws.column_dimensions[col].width = w
-
-        # 머리글 스타일
-        header_fill = PatternFill("solid", fgColor="D9E1F2")
-        header_font = Font(bold=True)
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-        # metadata 헤더 강조
-        ws["D1"].fill = PatternFill("solid", fgColor="BDD7EE")
-
-        # 데이터 영역: 줄바꿈 + 상단 정렬 + 테두리
-        thin = Side(style="thin", color="999999")
-        border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-        max_row = ws.max_row
-        max_col = ws.max_column
-
-        for r in range(2, max_row + 1):
-            for c in range(1, max_col + 1):
-                cell = ws.cell(row=r, column=c)
-                if c >= 3:  # 설명 문장, metadata
-                    cell.alignment = Alignment(wrap_text=True, vertical="top")
-                else:
-                    cell.alignment = Alignment(vertical="top")
-                cell.border = border
+    # 문장/metadata가 '='나 'http'로 시작해도 수식/링크로 바뀌지 않도록 문자열 그대로 기록
+    wb_options = {"in_memory": True, "strings_to_formulas": False, "strings_to_urls": False}
+    with xlsxwriter.Workbook(output, wb_options) as wb:
+        ws = wb.add_worksheet("sheet1")
+
+        # 본문: pandas to_excel을 거치지 않고 컬럼 단위로 바로 기록 (머리글은 아래에서 서식과 함께)
+        for c, name in enumerate(out_df.columns):
+            ws.write_column(1, c, out_df[name].tolist())
+
+        # 서식은 한 번만 만들어 재사용
+        header_fmt = wb.add_format({
+            "bold": True, "bg_color": "#D9E1F2", "border": 1,
+            "align": "center", "valign": "vcenter", "text_wrap": True,
+        })
+        meta_header_fmt = wb.add_format({
+            "bold": True, "bg_color": "#BDD7EE", "border": 1,
+            "align": "center", "valign": "vcenter", "text_wrap": True,
+        })
+        top_fmt = wb.add_format({"valign": "top"})
+        wrap_fmt = wb.add_format({"valign": "top", "text_wrap": True})
+        merged_fmt = wb.add_format({
+            "valign": "top", "text_wrap": True,
+            "border": 1, "border_color": "#999999",
+        })
+        border_fmt = wb.add_format({"border": 1, "border_color": "#999999"})
+
+        # 열 너비 + 데이터 영역 정렬 (A: id, B: 유형, C: 설명 문장, D: metadata)
+        ws.set_column("A:A", 18, top_fmt)
+        ws.set_column("B:B", 16, top_fmt)
+        ws.set_column("C:C", 80, wrap_fmt)   # 설명 문장: 줄바꿈
+        ws.set_column("D:D", 50, wrap_fmt)   # metadata: 줄바꿈
+
+        # 머리글 스타일 (metadata 헤더 강조)
+        for c, name in enumerate(out_df.columns):
+            ws.write_string(0, c, str(name), meta_header_fmt if c == 3 else header_fmt)
+
+        n_rows = len(out_df)
+        if n_rows:
+            # 데이터 영역 테두리: 셀 단위 대신 범위 한 번에 적용
+            ws.conditional_format(1, 0, n_rows, len(out_df.columns) - 1,
+                                  {"type": "no_errors", "format": border_fmt})
 
         # id 블록 병합: A(id), D(metadata)
-        cur_row = 2
+        merged_rows = set()  # 병합되어 값이 비는 행(블록의 첫 행 제외)
+        cur_row = 1
         for doc_id, count in group_counts.items():
             if count > 1:
-                for col in (1, 4):  # A, D
-                    ws.merge_cells(
-                        start_row=cur_row, start_column=col,
-                        end_row=cur_row + count - 1, end_column=col
-                    )
-                    top_cell = ws.cell(row=cur_row, column=col)
-                    top_cell.alignment = Alignment(vertical="top", wrap_text=True)
-                    for rr in range(cur_row, cur_row + count):
-                        ws.cell(row=rr, column=col).border = border
+                for col in (0, 3):  # A, D
+                    ws.merge_range(cur_row, col, cur_row + count - 1, col,
+                                   out_df.iat[cur_row - 1, col], merged_fmt)
+                merged_rows.update(range(cur_row + 1, cur_row + count))
             cur_row += count
 
         # 하이퍼링크: 같은 id의 첫 행만 D열(metadata)에 설정
-        first_row_for_id: Dict[str, int] = {}
-        for idx, row in enumerate(rows, start=2):
-            first_row_for_id.setdefault(row["id"], idx)
-
-        for idx, row in enumerate(rows, start=2):
-            url = row.get("url", "")
-            if not url:
-                continue
-            if idx != first_row_for_id[row["id"]]:
-                continue
-            ws.cell(row=idx, column=4).hyperlink = url  # D열
-
-        # 행 높이: C/D의 개행 수 기준 근사 조절
-        for r in range(2, max_row + 1):
-            max_lines = 1
-            for c in (3, 4):  # C, D
-                val = ws.cell(row=r, column=c).value
-                if isinstance(val, str) and "\n" in val:
-                    lines = val.count("\n") + 1
-                    if lines > max_lines:
-                        max_lines = lines
-            ws.row_dimensions[r].height = min(15 + (max_lines - 1) * 12, 200)
+        link_mask = ~df["id"].duplicated() & df["url"].astype(bool)
+        for pos, doc_id, url in zip(df.index[link_mask], df["id"][link_mask], df["url"][link_mask]):
+            idx = pos + 1
+            fmt = merged_fmt if group_counts.get(doc_id, 1) > 1 else wrap_fmt
+            text = out_df.iat[idx - 1, 3]
+            try:
+                ok = ws.write_url(idx, 3, url, fmt, string=text) == 0  # D열
+            except ValueError:
+                ok = False
+            if not ok:
+                ws.write_string(idx, 3, text, fmt)  # URL 형식이 아니면 텍스트만 유지
+
+        # 행 높이: C/D의 개행 수 기준 근사 조절 (병합으로 비는 D칸은 제외)
+        covered = out_df.index.isin([r - 1 for r in merged_rows])
+        desc_lines = out_df["설명 문장"].astype(str).str.count("\n")
+        meta_lines = out_df["metadata"].astype(str).str.count("\n").where(~covered, 0)
+        lines = pd.concat([desc_lines, meta_lines], axis=1).max(axis=1) + 1
+        heights = (15 + (lines - 1) * 12).clip(upper=200)
+        for r, h in enumerate(heights.tolist(), start=1):
+            ws.set_row(r, h)
 
         # 틀 고정
-        ws.freeze_panes = "A2"
+        ws.freeze_panes(1, 0)
 
     output.seek(0)
     return output.getvalue()
@@ -331,15 +363,13 @@ def table_json_to_xlsx_bytes(data: Dict[str, Any]) -> bytes:
 def _collect_excel_sentences_by_id(df: pd.DataFrame) -> Dict[str, List[str]]:
     if "id" not in df.columns or "설명 문장" not in df.columns:
         raise ValueError("엑셀에 'id'와 '설명 문장' 컬럼이 필요합니다.")
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str).map(_norm_key)
-    tmp["설명 문장"] = tmp["설명 문장"].fillna("").astype(str)
+    # DataFrame 전체를 복사하지 않고 필요한 열만 변환해서 순회
+    ids = df["id"].ffill().astype(str).map(_norm_key).tolist()
+    sents = df["설명 문장"].fillna("").astype(str).tolist()
 
     bucket: Dict[str, List[str]] = defaultdict(list)
-    for _, row in tmp.iterrows():
-        _id = row["id"]
-        sent = row["설명 문장"].strip()
-        bucket[_id].append(sent)
+    for _id, sent in zip(ids, sents):
+        bucket[_id].append(sent.strip())
     return bucket
 
 
@@ -460,15 +490,19 @@ def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) ->
     need_cols = ["id", "유형", "설명 문장"]  # 유형은 없어도 동작하지만, 여기선 기본 세트로 맞춤
 
     def _prep(df: pd.DataFrame, name: str) -> pd.DataFrame:
-        df = _normalize_excel_columns(df.copy())
+        df = _normalize_excel_columns(df)  # rename은 새 DataFrame을 반환
         for c in need_cols:
             if c not in df.columns:
                 df[c] = ""
         df["__sheet__"] = str(name)
         return df
 
+    # 정규화 후 need_cols에 해당하는 열만 읽음
+    def _keep(c: str) -> bool:
+        return _norm_colname(c) in need_cols
+
     if sheet_name is None:
-        sheets = pd.read_excel(ef, sheet_name=None)
+        sheets = excel_read.read_sheets(ef, keep=_keep)
         dfs = []
         for name, df in sheets.items():
             dfs.append(_prep(df, name))
@@ -477,12 +511,12 @@ def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) ->
         return pd.concat(dfs, ignore_index=True)
 
     if isinstance(sheet_name, str):
-        df = pd.read_excel(ef, sheet_name=sheet_name)
+        df = excel_read.read_sheets(ef, [sheet_name], keep=_keep)[sheet_name]
         return _prep(df, sheet_name)
 
-    # 시트명 리스트
+    # 시트명 리스트 (없는 시트는 건너뜀)
     names = list(sheet_name)
-    all_sheets = pd.read_excel(ef, sheet_name=None)
+    all_sheets = excel_read.read_sheets(ef, names, keep=_keep, ignore_missing=True)
     dfs = []
     for nm in names:
         if nm in all_sheets:
@@ -493,48 +527,43 @@ def _read_excel_multi(ef, sheet_name: Optional[Iterable[str] or str] = None) ->
 
 def _pick_zip_members(zf: zipfile.ZipFile):
     """
-    ZIP에서 JSON 1개, XLSX 1개를 추출 대상으로 선택.
+    ZIP에서 JSON 1개, XLSX 1개를 추출 대상으로 선택 (중앙 디렉터리 목록을 한 번만 순회).
     - JSON은 project_*.json 우선, 그 외 첫 번째 .json
     - Excel은 .xlsx 우선(.xls는 의존성에 따라 미지원일 수 있음)
     """
-    json_members = [m for m in zf.namelist() if m.lower().endswith(".json")]
-    xlsx_members = [m for m in zf.namelist() if m.lower().endswith(".xlsx")]
-    xls_members  = [m for m in zf.namelist() if m.lower().endswith(".xls")]
-
-    # JSON 우선순위: project_*
-    json_member = None
-    for m in json_members:
-        name = Path(m).name
-        if name.startswith("project_"):
-            json_member = m
-            break
-    if json_member is None and json_members:
-        json_member = json_members[0]
-
-    # Excel 우선순위: .xlsx → (가능하면 .xls 대체)
-    excel_member = xlsx_members[0] if xlsx_members else (xls_members[0] if xls_members else None)
-
-    return json_member, excel_member
+    json_member = first_json = xlsx_member = xls_member = None
+    for m in zf.namelist():
+        low = m.lower()
+        if low.endswith(".json"):
+            if first_json is None:
+                first_json = m
+            if json_member is None and Path(m).name.startswith("project_"):
+                json_member = m
+        elif low.endswith(".xlsx"):
+            if xlsx_member is None:
+                xlsx_member = m
+        elif low.endswith(".xls") and xls_member is None:
+            xls_member = m
+
+    # JSON 우선순위: project_* → 첫 번째 .json / Excel 우선순위: .xlsx → .xls
+    return json_member or first_json, xlsx_member or xls_member
 
 def _collect_excel_sentences_by_id_type(df: pd.DataFrame, skip_blank: bool = False) -> Dict[str, Dict[str, List[str]]]:
     required = {"id", "유형", "설명 문장"}
     if not required.issubset(set(df.columns)):
         raise ValueError("엑셀에 'id', '유형', '설명 문장' 컬럼이 모두 필요합니다.")
 
-    tmp = df.copy()
-    tmp["id"] = tmp["id"].ffill().astype(str).map(_norm_key)
-    tmp["유형"] = tmp["유형"].ffill().astype(str)
-    tmp["설명 문장"] = tmp["설명 문장"].fillna("").astype(str)
+    # DataFrame 전체를 복사하지 않고 필요한 열만 변환해서 순회
+    ids = df["id"].ffill().astype(str).map(_norm_key).tolist()
+    labels = df["유형"].ffill().astype(str).tolist()
+    sents = df["설명 문장"].fillna("").astype(str).tolist()
 
     bucket: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
-    for _, row in tmp.iterrows():
-        _id = row["id"]
-        label = row["유형"].strip()
-        sent = row["설명 문장"].strip()
+    for _id, label, sent in zip(ids, labels, sents):
+        sent = sent.strip()
         if skip_blank and not sent:
             continue
-        ref_type = _label_to_ref_type(label)
-        bucket[_id][ref_type].append(sent)
+        bucket[_id][_label_to_ref_type(label.strip())].append(sent)
     return bucket
 
 
@@ -694,12 +723,10 @@ def apply_excel_desc_to_json_from_zip(
             raise FileNotFoundError("ZIP 안에 Excel(.xlsx) 파일이 없습니다.")
 
         # JSON 로드
-        with zf.open(json_member) as jf:
-            json_obj = json.loads(jf.read().decode("utf-8"))
+        json_obj = fast_json.loads(zf.read(json_member))
 
-        # Excel 로드
-        with zf.open(excel_member) as ef:
-            df = _read_excel_multi(ef, sheet_name=sheet_name)
+        # Excel 로드 (메모리 버퍼로: ZipExtFile은 뒤로 seek할 때마다 처음부터 다시 압축 해제)
+        df = _read_excel_multi(BytesIO(zf.read(excel_member)), sheet_name=sheet_name)
 
         # 반영 (유형 컬럼이 있으면 정밀 매핑 분기 사용)
         updated = apply_excel_desc_to_json(json_obj, df, skip_blank=skip_blank)
@@ -708,4 +735,4 @@ def apply_excel_desc_to_json_from_zip(
         base = Path(json_member).name
         out_name = (base[:-5] if base.lower().endswith(".json") else base) + "_updated.json"
 
-        return json.dumps(updated, ensure_ascii=False, indent=2).encode("utf-8"), out_name
+        return fast_json.dumps_bytes(updated), out_name
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+ZIP 해제 헬퍼
+- extractall 대신 항목별 open + copyfileobj(1MiB 버퍼)로 해제
+- 경로 정리는 ZipFile.extract와 같이 절대경로/'..' 구성요소를 제거 (zip-slip 방지)
+"""
+import os
+import shutil
+import zipfile
+from typing import Callable, Optional
+
+COPY_BUFSIZE = 1 << 20  # 1 MiB
+
+
+def _safe_member_path(dest_dir: str, filename: str) -> Optional[str]:
+    parts = [p for p in filename.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+    if not parts:
+        return None
+    return os.path.join(dest_dir, *parts)
+
+
+def extract_members(
+    zf: zipfile.ZipFile,
+    dest_dir: str,
+    keep: Optional[Callable[[zipfile.ZipInfo], bool]] = None,
+) -> int:
+    """
+    zf의 항목을 dest_dir에 해제하고 해제한 파일 수를 반환.
+    - keep이 주어지면 keep(zi)가 True인 파일만 해제 (폴더 항목은 항상 생성)
+    """
+    count = 0
+    for zi in zf.infolist():
+        target = _safe_member_path(dest_dir, zi.filename)
+        if target is None:
+            continue
+        if zi.is_dir():
+            os.makedirs(target, exist_ok=True)
+            continue
+        if keep is not None and not keep(zi):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with zf.open(zi) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=COPY_BUFSIZE)
+        count += 1
+    return count
@@ -0,0 +1,71 @@
+# ui/background.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+POLL_SEC = 0.5
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    """프로세스 전체에서 하나만 만드는 스레드 풀 (세션/모듈 재로드와 무관)"""
+    return ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 4), thread_name_prefix="dataly-bg")
+
+
+def pending(job_key):
+    """job_key 작업이 제출되어 아직 결과를 가져가지 않았으면 True"""
+    return job_key in st.session_state
+
+
+def discard_stale(job_key, token):
+    """
+    남은 작업의 대상이 token과 다르면(업로드가 지워졌으면 token=None) 세션에서 제거.
+    아직 시작 전이면 취소하고, 이미 실행 중이면 결과만 버림.
+    """
+    job = st.session_state.get(job_key)
+    if job is not None and job[0] != token:
+        job[1].cancel()
+        del st.session_state[job_key]
+
+
+def submit(job_key, token, build):
+    """
+    build()를 스레드 풀에 제출 (같은 대상의 작업이 이미 있으면 그대로 둠).
+    - build는 스크립트 스레드 밖에서 돌므로 st.* / st.cache_data 함수를 부르지 않는 순수 변환이어야 함
+      (업로드 bytes 등 입력은 호출하는 쪽에서 미리 꺼내 둠)
+    - token: 작업 대상 식별자(업로드 file_id 등)
+    """
+    discard_stale(job_key, token)
+    if job_key not in st.session_state:
+        st.session_state[job_key] = (token, get_executor().submit(build))
+
+
+def _poll(job_key, message):
+    """작업이 끝날 때까지 진행 표시만 다시 그림. 끝나면 앱을 한 번 다시 실행해 호출한 쪽이 결과를 가져가게 함"""
+    job = st.session_state.get(job_key)
+    if job is None or job[1].done():
+        st.rerun()
+    st.info(f"⏳ {message}")
+    if not hasattr(st, "fragment"):  # 구버전: 앱 전체를 POLL_SEC마다 다시 실행
+        time.sleep(POLL_SEC)
+        st.rerun()
+
+
+# 진행 표시 영역(fragment)만 POLL_SEC마다 다시 실행 → 작업 중에도 탭 전체가 재실행되지 않음
+if hasattr(st, "fragment"):
+    _poll = st.fragment(_poll, run_every=POLL_SEC)
+
+
+def result(job_key, message="처리 중..."):
+    """
+    제출한 작업이 끝났으면 세션에서 꺼내 결과를 반환 (예외는 그대로 전달), 아직이면 None.
+    결과 보관(upload_cache 등)은 이 함수를 부른 스크립트 스레드에서 처리.
+    """
+    future = st.session_state[job_key][1]
+    if not future.done():
+        _poll(job_key, message)
+        return None
+    del st.session_state[job_key]
+    return future.result()
@@ -1,9 +1,8 @@
 # ui/newspaper_eval_merged_ui.py
 import streamlit as st
 import zipfile
-import tempfile
-import os
-from dataly_manager.dataly_tools.newspaper_eval_merged import json_to_excel_stacked
+from dataly_manager.dataly_tools.newspaper_eval_merged import json_zip_to_excel_stacked, zip_root_folder
+
 
 def render_sum_eval_tab():
     st.header("📰 신문평가 JSON → 엑셀 자동 수합기")
@@ -18,33 +17,24 @@ def render_sum_eval_tab():
             st.error("ZIP 파일을 업로드하세요.")
             return
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            zip_path = os.path.join(temp_dir, "data.zip")
-            with open(zip_path, "wb") as f:
-                f.write(uploaded_zip.read())
-
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            folder_list = [f for f in os.listdir(temp_dir) if os.path.isdir(os.path.join(temp_dir, f))]
-            if not folder_list:
+        # 업로드 ZIP을 해제하지 않고 필요한 JSON만 zf.read()로 읽어, 엑셀도 메모리에서 바로 전달
+        uploaded_zip.seek(0)
+        with zipfile.ZipFile(uploaded_zip, "r") as zip_ref:
+            if zip_root_folder(zip_ref) is None:
                 st.error("압축 내부에 폴더가 없습니다. 폴더째 압축한 zip만 지원합니다.")
                 return
 
-            root_path = os.path.join(temp_dir, folder_list[0])
             st.info("엑셀 변환 중입니다…")
+            try:
+                xlsx_bytes = json_zip_to_excel_stacked(zip_ref, sum_week_num, storage_folder)
+            except Exception as e:
+                st.error(f"엑셀 파일 생성 실패: {e}")
+                return
 
-            json_to_excel_stacked(root_path, sum_week_num, storage_folder)
-            excel_path = os.path.join(root_path, "summary_eval_all.xlsx")
-
-            if os.path.exists(excel_path):
-                with open(excel_path, "rb") as f:
-                    st.success("엑셀 변환 완료!")
-                    st.download_button(
-                        label="summary_eval_all.xlsx 다운로드",
-                        data=f,
-                        file_name="summary_eval_all.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-            else:
-                st.error("엑셀 파일 생성 실패. 내부 오류를 확인하세요.")
+        st.success("엑셀 변환 완료!")
+        st.download_button(
+            label="summary_eval_all.xlsx 다운로드",
+            data=xlsx_bytes,
+            file_name="summary_eval_all.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
@@ -1,7 +1,19 @@
 # ui/photo_to_excel_ui.py
 import streamlit as st
-import json, importlib
+from dataly_manager.dataly_tools import fast_json
 from dataly_manager.dataly_tools import photo_to_excel as p2e
+from dataly_manager.ui import upload_cache
+
+
+# 같은 업로드 바이트로 다시 실행하면 변환 결과를 바로 재사용
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_photo_xlsx(raw: bytes) -> bytes:
+    return p2e.photo_json_bytes_to_xlsx_bytes(raw)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_apply_desc(zip_bytes: bytes, sheet_arg):
+    return p2e.apply_excel_desc_to_json_from_zip(zip_bytes, sheet_arg)
 
 
 def render_photo_to_excel():
@@ -11,23 +23,29 @@ def render_photo_to_excel():
     if st.button("엑셀 변환 실행", key="btn_photo"):
         if not uploaded_json_img:
             st.error("JSON 파일을 업로드하세요.")
+        elif not fast_json.looks_like_json(uploaded_json_img.getvalue()):
+            # 잘못 올린 엑셀/ZIP 등은 전체 파싱 전에 바로 거절
+            st.error("JSON 형식의 파일이 아닙니다. (첫 글자가 '{' 또는 '['가 아님)")
         else:
             try:
-                raw = uploaded_json_img.getvalue()
-                data = json.loads(raw)
-            except Exception as e:
+                with st.spinner("엑셀 생성 중..."):
+                    upload_cache.get_or_build(
+                        uploaded_json_img, "_photo_xlsx_cache", lambda: _cached_photo_xlsx(uploaded_json_img.getvalue())
+                    )
+            except ValueError as e:  # JSONDecodeError / UnicodeDecodeError
                 st.error(f"JSON 파싱 실패: {e}")
             else:
-                with st.spinner("엑셀 생성 중..."):
-                    importlib.reload(p2e)  # 최신 코드 보장
-                    xlsx_bytes = p2e.photo_json_to_xlsx_bytes(data)
                 st.success("엑셀 생성 완료!")
-                st.download_button(
-                    label="사진_변환.xlsx 다운로드",
-                    data=xlsx_bytes,
-                    file_name="사진_변환.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+
+    # 변환 결과는 세션에 남아 있으므로 다른 위젯 조작/재실행 후에도 다운로드 버튼 유지
+    xlsx_bytes = upload_cache.lookup(uploaded_json_img, "_photo_xlsx_cache")
+    if xlsx_bytes is not None:
+        st.download_button(
+            label="사진_변환.xlsx 다운로드",
+            data=xlsx_bytes,
+            file_name="사진_변환.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
 
     st.divider()
     st.subheader("🔁 엑셀의 ‘설명 문장’ → JSON 반영 (ZIP)")
@@ -35,22 +53,27 @@ def render_photo_to_excel():
     apply_zip_img = st.file_uploader("ZIP 업로드 (Excel + JSON)", type=["zip"], key="zip_apply_desc_tab5")
     sheet_name_img = st.text_input("엑셀 시트명(선택)", value="", key="sheet_apply_desc_tab5")
 
+    sheet_arg = sheet_name_img.strip() or None
     if st.button("적용 실행 (사진)", key="btn_apply_desc_tab5"):
         if not apply_zip_img:
             st.error("ZIP 파일을 업로드하세요.")
         else:
             try:
-                importlib.reload(p2e)  # 최신 코드 보장
-                zip_bytes = apply_zip_img.getvalue()
-                sheet_arg = sheet_name_img.strip() or None
-                updated_bytes, suggested_name = p2e.apply_excel_desc_to_json_from_zip(zip_bytes, sheet_arg)
+                upload_cache.get_or_build(
+                    apply_zip_img, "_photo_apply_cache", lambda: _cached_apply_desc(apply_zip_img.getvalue(), sheet_arg),
+                    extra=sheet_arg,
+                )
             except Exception as e:
                 st.error(f"적용 중 오류: {e}")
             else:
                 st.success("JSON 업데이트 완료!")
-                st.download_button(
-                    label=f"{suggested_name} 다운로드",
-                    data=updated_bytes,
-                    file_name=suggested_name,
-                    mime="application/json"
-                )
+
+    applied = upload_cache.lookup(apply_zip_img, "_photo_apply_cache", extra=sheet_arg)
+    if applied is not None:
+        updated_bytes, suggested_name = applied
+        st.download_button(
+            label=f"{suggested_name} 다운로드",
+            data=updated_bytes,
+            file_name=suggested_name,
+            mime="application/json"
+        )
@@ -26,6 +26,7 @@ from dataly_manager.dataly_tools.srl_argument_del import (
     srl_argument_cleanup,
     make_vx_removed_only_excel,   # ✅ 최소 추가: VX-only 엑셀 생성 함수 임포트
 )
+from dataly_manager.dataly_tools.zip_extract import extract_members
 
 
 def _zip_jsons_keep_structure(dir_path: Path, extra_files: list[tuple[str, bytes]] | None = None) -> bytes:
@@ -34,9 +35,10 @@ def _zip_jsons_keep_structure(dir_path: Path, extra_files: list[tuple[str, bytes
     - 모든 JSON 파일은 ZIP 루트에 위치 (하위 폴더 구조 제거)
     - 파일명이 중복될 경우 '_1', '_2' ... 를 자동 덧붙여 충돌 회피
     - extra_files: [(파일명, 바이트)] 를 ZIP 루트에 그대로 추가 (예: vx_removed_only.xlsx)
+    - JSON은 compresslevel=1로 빠르게 압축, 이미 압축된 .xlsx는 무압축(STORED)으로 담음
     """
     mem = io.BytesIO()
-    with zipfile.ZipFile(mem, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(mem, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
         used_names: set[str] = set()
 
         def _unique_name(name: str) -> str:
@@ -64,7 +66,10 @@ def _zip_jsons_keep_structure(dir_path: Path, extra_files: list[tuple[str, bytes
         if extra_files:
             for fname, data in extra_files:
                 arcname = _unique_name(fname)
-                zf.writestr(arcname, data)
+                if fname.lower().endswith(".xlsx"):
+                    zf.writestr(arcname, data, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(arcname, data)
 
     mem.seek(0)
     return mem.getvalue()
@@ -104,8 +109,9 @@ def render_srl_argument_del_ui():
 
             # 1) ZIP 해제
             try:
+                up.seek(0)
                 with zipfile.ZipFile(up) as zf:
-                    zf.extractall(tdir)
+                    extract_members(zf, str(tdir))
             except Exception as e:
                 st.error(f"ZIP 해제 실패: {e}")
                 st.stop()
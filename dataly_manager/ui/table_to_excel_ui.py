@@ -1,33 +1,50 @@
 # ui/table_to_excel_ui.py
 import streamlit as st
-import json, importlib
+from dataly_manager.dataly_tools import fast_json
 from dataly_manager.dataly_tools import table_to_excel as t2e
+from dataly_manager.ui import background, upload_cache
 
 
 def render_table_to_excel():
     st.header("📊 표 변환 (단일 JSON → Excel)")
     st.info("project_*.json 1개를 업로드하면 표 형태 엑셀로 변환합니다.")
     uploaded_json = st.file_uploader("JSON 업로드 (project_*.json)", type=["json"], key="json_table")
+    # 업로드가 지워졌거나 바뀌면 남은 작업 제거
+    background.discard_stale("_table_xlsx_job", upload_cache.upload_key(uploaded_json) if uploaded_json else None)
+    # 변환은 백그라운드 스레드에서 실행, 결과는 스크립트 스레드에서 upload_cache(세션)에 보관
     if st.button("엑셀 변환 실행", key="btn_table"):
         if not uploaded_json:
             st.error("JSON 파일을 업로드하세요.")
+        elif not fast_json.looks_like_json(uploaded_json.getvalue()):
+            # 잘못 올린 엑셀/ZIP 등은 전체 파싱 전에 바로 거절
+            st.error("JSON 형식의 파일이 아닙니다. (첫 글자가 '{' 또는 '['가 아님)")
+        elif upload_cache.lookup(uploaded_json, "_table_xlsx_cache") is not None:
+            st.success("엑셀 생성 완료!")
         else:
-            try:
-                raw = uploaded_json.getvalue()
-                data = json.loads(raw)
-            except Exception as e:
-                st.error(f"JSON 파싱 실패: {e}")
-            else:
-                with st.spinner("엑셀 생성 중..."):
-                    importlib.reload(t2e)  # 최신 코드 보장
-                    xlsx_bytes = t2e.table_json_to_xlsx_bytes(data)
+            raw = uploaded_json.getvalue()
+            background.submit(
+                "_table_xlsx_job", upload_cache.upload_key(uploaded_json),
+                lambda: t2e.table_json_bytes_to_xlsx_bytes(raw),
+            )
+    if background.pending("_table_xlsx_job"):
+        try:
+            built = background.result("_table_xlsx_job", message="엑셀 생성 중...")
+        except ValueError as e:  # JSONDecodeError / UnicodeDecodeError
+            st.error(f"JSON 파싱 실패: {e}")
+        else:
+            if built is not None:
+                upload_cache.get_or_build(uploaded_json, "_table_xlsx_cache", lambda: built)
                 st.success("엑셀 생성 완료!")
-                st.download_button(
-                    label="표_변환.xlsx 다운로드",
-                    data=xlsx_bytes,
-                    file_name="표_변환.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+
+    # 변환 결과는 세션에 남아 있으므로 다른 위젯 조작/재실행 후에도 다운로드 버튼 유지
+    xlsx_bytes = upload_cache.lookup(uploaded_json, "_table_xlsx_cache")
+    if xlsx_bytes is not None:
+        st.download_button(
+            label="표_변환.xlsx 다운로드",
+            data=xlsx_bytes,
+            file_name="표_변환.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
 
     st.divider()
     st.subheader("🔁 엑셀의 ‘설명 문장’ → JSON 반영 (ZIP)")
@@ -35,27 +52,35 @@ def render_table_to_excel():
     apply_zip = st.file_uploader("ZIP 업로드 (Excel + JSON)", type=["zip"], key="zip_apply_desc_tab4")
     sheet_name = st.text_input("엑셀 시트명(선택)", value="", key="sheet_apply_desc_tab4")
 
+    sheet_arg = sheet_name.strip() or None
+    background.discard_stale("_table_apply_job", (upload_cache.upload_key(apply_zip), sheet_arg) if apply_zip else None)
     if st.button("적용 실행", key="btn_apply_desc_tab4"):
         if not apply_zip:
             st.error("ZIP 파일을 업로드하세요.")
+        elif upload_cache.lookup(apply_zip, "_table_apply_cache", extra=sheet_arg) is not None:
+            st.success("JSON 업데이트 완료!")
         else:
-            try:
-                zip_bytes = apply_zip.getvalue()
-                sheet_arg = sheet_name.strip() or None
-
-                importlib.reload(t2e)  # 최신 코드 보장
-                if not hasattr(t2e, "apply_excel_desc_to_json_from_zip"):
-                    st.error("table_to_excel 모듈에 apply_excel_desc_to_json_from_zip가 없습니다.")
-                    st.caption(f"loaded from: {t2e.__file__}")
-                else:
-                    updated_bytes, suggested_name = t2e.apply_excel_desc_to_json_from_zip(zip_bytes, sheet_arg)
-            except Exception as e:
-                st.error(f"적용 중 오류: {e}")
-            else:
+            zip_bytes = apply_zip.getvalue()
+            background.submit(
+                "_table_apply_job", (upload_cache.upload_key(apply_zip), sheet_arg),
+                lambda: t2e.apply_excel_desc_to_json_from_zip(zip_bytes, sheet_arg),
+            )
+    if background.pending("_table_apply_job"):
+        try:
+            built = background.result("_table_apply_job", message="JSON 반영 중...")
+        except Exception as e:
+            st.error(f"적용 중 오류: {e}")
+        else:
+            if built is not None:
+                upload_cache.get_or_build(apply_zip, "_table_apply_cache", lambda: built, extra=sheet_arg)
                 st.success("JSON 업데이트 완료!")
-                st.download_button(
-                    label=f"{suggested_name} 다운로드",
-                    data=updated_bytes,
-                    file_name=suggested_name,
-                    mime="application/json"
-                )
+
+    applied = upload_cache.lookup(apply_zip, "_table_apply_cache", extra=sheet_arg)
+    if applied is not None:
+        updated_bytes, suggested_name = applied
+        st.download_button(
+            label=f"{suggested_name} 다운로드",
+            data=updated_bytes,
+            file_name=suggested_name,
+            mime="application/json"
+        )
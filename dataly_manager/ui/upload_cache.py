@@ -0,0 +1,33 @@
+# ui/upload_cache.py
+import streamlit as st
+
+
+def upload_key(uploaded):
+    """업로드 파일 식별자 (file_id가 없는 구버전은 이름+크기)"""
+    return getattr(uploaded, "file_id", None) or (uploaded.name, uploaded.size)
+
+
+def lookup(uploaded, store_key, extra=None):
+    """get_or_build로 보관된 결과 조회 (업로드가 없거나 결과가 없으면 None)"""
+    if uploaded is None:
+        return None
+    return st.session_state.get(store_key, {}).get((upload_key(uploaded), extra))
+
+
+def get_or_build(uploaded, store_key, build, extra=None, max_entries=4):
+    """
+    st.session_state[store_key]에 업로드 파일별 결과를 보관하고 재사용.
+    - 같은 파일로 다시 실행하면 getvalue()/해시 없이 바로 반환
+    - extra: 결과에 영향을 주는 다른 입력(시트명 등)을 키에 함께 포함
+    - max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    """
+    cache = st.session_state.setdefault(store_key, {})
+    key = (upload_key(uploaded), extra)
+    if key in cache:
+        cache[key] = cache.pop(key)  # 최근 사용으로 이동
+        return cache[key]
+    value = build()
+    cache[key] = value
+    while len(cache) > max_entries:
+        cache.pop(next(iter(cache)))
+    return value
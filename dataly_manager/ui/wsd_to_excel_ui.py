@@ -13,6 +13,8 @@ if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
 from dataly_manager.dataly_tools.wsd_to_excel import jsons_to_wsd_excel
+from dataly_manager.dataly_tools.zip_extract import extract_members
+from dataly_manager.ui.upload_cache import upload_key
 
 def render_wsd_to_excel_ui():
     st.header("📄 WSD/DP/SRL/ZA → 엑셀 변환")
@@ -48,79 +50,118 @@ def render_wsd_to_excel_ui():
 
     run = st.button("🚀 변환 실행", type="primary", use_container_width=True)
 
+    # ---------------- 세션 키 안전 초기화 ----------------
+    st.session_state.setdefault("wsd_last_key", None)      # (업로드 file_id, 옵션...) 업로드 기준 키
+    st.session_state.setdefault("wsd_excel_bytes", None)   # bytes
+    st.session_state.setdefault("wsd_excel_path", None)    # 표시용 경로
+    st.session_state.setdefault("wsd_preview", None)       # 미리보기 DataFrame (재실행마다 엑셀을 다시 읽지 않음)
+
+    # 업로드로 만든 결과인데 업로드가 지워졌거나 다른 파일로 바뀌었으면 결과/미리보기 제거
+    last_key = st.session_state["wsd_last_key"]
+    if last_key is not None and (not uploaded_zip or last_key[0] != upload_key(uploaded_zip)):
+        st.session_state["wsd_last_key"] = None
+        st.session_state["wsd_excel_bytes"] = None
+        st.session_state["wsd_excel_path"] = None
+        st.session_state["wsd_preview"] = None
+
     if run:
         # 입력 검증
         if not uploaded_zip and not (base_dir and os.path.isdir(base_dir)):
             st.error("ZIP을 업로드하거나, 유효한 폴더 경로를 입력해 주세요.")
             return
 
-        excel_bytes = None
-        out_path_display = None
-
-        with st.status("변환 중입니다...", expanded=True) as status:
-            try:
-                if uploaded_zip:
-                    # ZIP → 임시 폴더로 해제 후 그 폴더를 대상으로 변환
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        zpath = os.path.join(tmpdir, "input.zip")
-                        with open(zpath, "wb") as f:
-                            f.write(uploaded_zip.getbuffer())
-
-                        with zipfile.ZipFile(zpath) as zf:
-                            zf.extractall(tmpdir)
-
-                        # ZIP 파일명으로 기본 결과 이름 제안
-                        if excel_name.strip() == "SRL_ZA.xlsx" and uploaded_zip.name:
-                            base_name = os.path.splitext(os.path.basename(uploaded_zip.name))[0]
-                            excel_out_name = f"{base_name}_SRL_ZA.xlsx"
-                        else:
-                            excel_out_name = excel_name
+        # 같은 ZIP/옵션이면 해제+변환을 다시 하지 않음 (폴더 경로는 내용이 바뀔 수 있어 매번 변환)
+        # (file_id 기준이라 이름/크기가 같은 다른 ZIP을 다시 올려도 새로 변환)
+        run_key = (
+            (upload_key(uploaded_zip), excel_name, include_memo_sheet, memo_placement, memo_sep)
+            if uploaded_zip else None
+        )
+        reuse = (
+            run_key is not None
+            and run_key == st.session_state["wsd_last_key"]
+            and st.session_state["wsd_excel_bytes"] is not None
+        )
 
+        if not reuse:
+            excel_bytes = None
+            out_path_display = None
+
+            with st.status("변환 중입니다...", expanded=True) as status:
+                try:
+                    if uploaded_zip:
+                        # ZIP → 임시 폴더로 해제 후 그 폴더를 대상으로 변환
+                        # (업로드 파일을 디스크에 복사하지 않고 바로 열어 항목만 해제)
+                        with tempfile.TemporaryDirectory() as tmpdir:
+                            uploaded_zip.seek(0)
+                            with zipfile.ZipFile(uploaded_zip) as zf:
+                                extract_members(zf, tmpdir)
+
+                            # ZIP 파일명으로 기본 결과 이름 제안
+                            if excel_name.strip() == "SRL_ZA.xlsx" and uploaded_zip.name:
+                                base_name = os.path.splitext(os.path.basename(uploaded_zip.name))[0]
+                                excel_out_name = f"{base_name}_SRL_ZA.xlsx"
+                            else:
+                                excel_out_name = excel_name
+
+                            out_path = jsons_to_wsd_excel(
+                                base_dir=tmpdir,
+                                excel_name=excel_out_name,
+                                include_memo_sheet=include_memo_sheet,
+                                memo_placement=memo_placement,
+                                memo_sep=memo_sep,
+                            )
+                            out_path_display = out_path  # 표시용
+                            with open(out_path, "rb") as f:
+                                excel_bytes = f.read()
+                    else:
+                        # 폴더 직접 처리
                         out_path = jsons_to_wsd_excel(
-                            base_dir=tmpdir,
-                            excel_name=excel_out_name,
+                            base_dir=base_dir,
+                            excel_name=excel_name,
                             include_memo_sheet=include_memo_sheet,
                             memo_placement=memo_placement,
                             memo_sep=memo_sep,
                         )
-                        out_path_display = out_path  # 표시용
+                        out_path_display = out_path
                         with open(out_path, "rb") as f:
                             excel_bytes = f.read()
-                else:
-                    # 폴더 직접 처리
-                    out_path = jsons_to_wsd_excel(
-                        base_dir=base_dir,
-                        excel_name=excel_name,
-                        include_memo_sheet=include_memo_sheet,
-                        memo_placement=memo_placement,
-                        memo_sep=memo_sep,
-                    )
-                    out_path_display = out_path
-                    with open(out_path, "rb") as f:
-                        excel_bytes = f.read()
-
-                status.update(label="완료!", state="complete")
-            except Exception as e:
-                status.update(label="에러 발생", state="error")
-                st.exception(e)
-                return
-
-        if excel_bytes:
-            st.success(f"엑셀 파일 생성: {out_path_display}")
-            st.download_button(
-                label="⬇️ 엑셀 다운로드",
-                data=excel_bytes,
-                file_name=os.path.basename(out_path_display),
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-
-            # 미리보기(상위 100행) — 메모리 바이트로 로드
+
+                    status.update(label="완료!", state="complete")
+                except Exception as e:
+                    status.update(label="에러 발생", state="error")
+                    st.exception(e)
+                    return
+
+            # 미리보기(상위 100행)는 변환할 때 한 번만 읽어 둠
             try:
                 import pandas as pd
-                xbio = io.BytesIO(excel_bytes)
-                df_preview = pd.read_excel(xbio, sheet_name="SRL_ZA", nrows=100)
-                st.subheader("미리보기 (SRL_ZA 시트 상위 100행)")
-                st.dataframe(df_preview, use_container_width=True, height=400)
+                preview = pd.read_excel(io.BytesIO(excel_bytes), sheet_name="SRL_ZA", nrows=100)
             except Exception:
-                st.info("미리보기를 열 수 없습니다. 파일을 직접 확인해주세요.")
+                preview = None
+
+            # 세션에 저장(재실행에도 다운로드 버튼/미리보기 유지)
+            st.session_state["wsd_last_key"] = run_key
+            st.session_state["wsd_excel_bytes"] = excel_bytes
+            st.session_state["wsd_excel_path"] = out_path_display
+            st.session_state["wsd_preview"] = preview
+
+    # ---------------- 결과 표시(세션 기반, 항상 렌더) ----------------
+    excel_bytes = st.session_state.get("wsd_excel_bytes")
+    out_path_display = st.session_state.get("wsd_excel_path")
+    if excel_bytes:
+        st.success(f"엑셀 파일 생성: {out_path_display}")
+        st.download_button(
+            label="⬇️ 엑셀 다운로드",
+            data=excel_bytes,
+            file_name=os.path.basename(out_path_display),
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True
+        )
+
+        # 미리보기(상위 100행) — 변환 시 읽어 둔 DataFrame 사용
+        df_preview = st.session_state.get("wsd_preview")
+        if df_preview is not None:
+            st.subheader("미리보기 (SRL_ZA 시트 상위 100행)")
+            st.dataframe(df_preview, use_container_width=True, height=400)
+        else:
+            st.info("미리보기를 열 수 없습니다. 파일을 직접 확인해주세요.")
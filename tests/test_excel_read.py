@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""excel_read.read_sheets가 pd.read_excel과 같은 DataFrame을 만드는지 비교 (python -m unittest / pytest 모두 실행 가능)"""
+import datetime
+import io
+import unittest
+
+import openpyxl
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from dataly_manager.dataly_tools import excel_read
+
+
+def _workbook_bytes():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "merged"
+    ws.append(["id", "유형", "설명 문장", "metadata"])
+    ws.append(["A", "형태", "문장1", "m1"])
+    ws.append([None, None, "문장2", None])
+    ws.append(["B", "색채", "문장3", "m2"])
+    ws.append([None, "", "", None])  # 중간 빈 행은 유지
+    ws.append(["C", None, "문장4", None])
+    ws.merge_cells("A2:A3")
+    ws.merge_cells("D2:D3")
+    ws.append([])
+    ws.append([])  # 끝의 빈 행은 제거
+
+    ws = wb.create_sheet("mixed")
+    ws.append(["id", "n", "n", None, "when"])  # 중복/빈 헤더
+    ws.append([1, 1.0, 2.5, "x", datetime.datetime(2025, 1, 2)])
+    ws.append(["2", 3, "t", None, None])
+    ws.append([3.0, None, 4, 5, datetime.datetime(2025, 3, 4, 5, 6)])
+
+    wb.create_sheet("empty")
+
+    ws = wb.create_sheet("header_only")
+    ws.append(["id", "설명 문장"])
+
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+class ReadSheetsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.raw = _workbook_bytes()
+        cls.expected = pd.read_excel(io.BytesIO(cls.raw), sheet_name=None)
+
+    def test_matches_read_excel(self):
+        got = excel_read.read_sheets(io.BytesIO(self.raw))
+        self.assertEqual(list(got), list(self.expected))
+        for name, df in self.expected.items():
+            with self.subTest(sheet=name):
+                assert_frame_equal(got[name], df)
+
+    def test_keep_selects_columns(self):
+        keep = {"id", "설명 문장", "n.1"}.__contains__
+        got = excel_read.read_sheets(io.BytesIO(self.raw), ["merged", "mixed"], keep=keep)
+        for name in ("merged", "mixed"):
+            with self.subTest(sheet=name):
+                df = self.expected[name]
+                assert_frame_equal(got[name], df[[c for c in df.columns if keep(c)]])
+
+    def test_missing_sheet(self):
+        with self.assertRaises(ValueError):
+            excel_read.read_sheets(io.BytesIO(self.raw), ["nope"])
+        got = excel_read.read_sheets(io.BytesIO(self.raw), ["nope", "merged"], ignore_missing=True)
+        self.assertEqual(list(got), ["merged"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""fast_json 로드/스니핑/스트리밍 테스트 (python -m unittest / pytest 모두 실행 가능)"""
+import codecs
+import json
+import unittest
+from unittest import mock
+
+from dataly_manager.dataly_tools import fast_json
+
+DOC = {"document": [{"id": "A", "v": 1.5}, {"id": "B", "v": [1, 2]}]}
+RAW = json.dumps(DOC, ensure_ascii=False).encode("utf-8")
+
+
+class LoadsTest(unittest.TestCase):
+    def test_bom_and_memoryview(self):
+        self.assertEqual(fast_json.loads(codecs.BOM_UTF8 + RAW), DOC)
+        self.assertEqual(fast_json.loads(memoryview(RAW)), DOC)
+
+    def test_bom_without_orjson(self):
+        with mock.patch.object(fast_json, "orjson", None):
+            self.assertEqual(fast_json.loads(codecs.BOM_UTF8 + RAW), DOC)
+
+    def test_invalid_input_raises_value_error(self):
+        for raw in (b"PK\x03\x04", RAW[:-5], b""):
+            with self.subTest(raw=raw[:10]):
+                with self.assertRaises(ValueError):
+                    fast_json.loads(raw)
+
+
+class LooksLikeJsonTest(unittest.TestCase):
+    def test_object_and_array_with_bom_and_whitespace(self):
+        self.assertTrue(fast_json.looks_like_json(RAW))
+        self.assertTrue(fast_json.looks_like_json(codecs.BOM_UTF8 + b"\r\n  [1]"))
+        self.assertTrue(fast_json.looks_like_json(memoryview(b" {}")))
+
+    def test_rejects_non_json(self):
+        self.assertFalse(fast_json.looks_like_json(b"PK\x03\x04zipdata"))  # ZIP/XLSX
+        self.assertFalse(fast_json.looks_like_json(b'"just a string"'))
+        self.assertFalse(fast_json.looks_like_json(b""))
+        self.assertFalse(fast_json.looks_like_json(b"   \n"))
+
+    def test_long_leading_whitespace_is_left_to_parser(self):
+        self.assertTrue(fast_json.looks_like_json(b" " * (fast_json._SNIFF_BYTES + 10) + b"{}"))
+
+
+class IterItemsTest(unittest.TestCase):
+    def _both(self, raw, prefix):
+        """ijson 경로와 _walk_prefix 폴백 경로 결과를 함께 반환"""
+        streamed = list(fast_json.iter_items(raw, prefix))
+        with mock.patch.object(fast_json, "ijson", None):
+            walked = list(fast_json.iter_items(raw, prefix))
+        return streamed, walked
+
+    def test_items_match_fallback(self):
+        streamed, walked = self._both(codecs.BOM_UTF8 + RAW, "document.item")
+        self.assertEqual(streamed, DOC["document"])
+        self.assertEqual(walked, DOC["document"])
+        self.assertIsInstance(streamed[0]["v"], float)
+
+    def test_document_not_a_list_yields_nothing(self):
+        for obj in ({"document": {"id": "A"}}, {"document": "x"}, {"other": []}, [1, 2]):
+            with self.subTest(obj=obj):
+                self.assertEqual(self._both(json.dumps(obj).encode(), "document.item"), ([], []))
+
+    def test_parse_errors_become_value_error(self):
+        for raw in (RAW[:-5], b"PK\x03\x04"):
+            with self.subTest(raw=raw[:10]):
+                with self.assertRaises(ValueError):
+                    list(fast_json.iter_items(raw, "document.item"))
+                with mock.patch.object(fast_json, "ijson", None), self.assertRaises(ValueError):
+                    list(fast_json.iter_items(raw, "document.item"))
+
+
+if __name__ == "__main__":
+    unittest.main()
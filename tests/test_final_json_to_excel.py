@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""final_json_to_excel 엑셀 생성 회귀 테스트 (python -m unittest / pytest 모두 실행 가능)"""
+import io
+import unittest
+
+import openpyxl
+
+from dataly_manager.dataly_tools import final_json_to_excel as f2e
+
+
+def _doc(doc_id, *sents):
+    return {"id": doc_id, "metadata": {"url": "https://example.com/" + sents[0]},
+            "EX": [{"exp_sentence": [{"a": list(sents)}]}]}
+
+
+def _sheet(docs):
+    wb = openpyxl.load_workbook(io.BytesIO(f2e.photo_json_to_xlsx_bytes({"document": docs})))
+    return wb["result"]
+
+
+class WriteExcelMergeTest(unittest.TestCase):
+    def test_interleaved_ids_are_merged_per_contiguous_run(self):
+        docs = [_doc("A", "a1", "a2"), _doc("B", "b1", "b2"), _doc("A", "a3", "a4"), _doc("B", "b3")]
+        ws = _sheet(docs)
+        merged = {str(r) for r in ws.merged_cells.ranges}
+        self.assertIn("A2:A3", merged)
+        self.assertIn("A4:A5", merged)
+        self.assertIn("A6:A7", merged)
+        rows_by_col = {}
+        for rng in ws.merged_cells.ranges:
+            for r in range(rng.min_row, rng.max_row + 1):
+                self.assertNotIn(r, rows_by_col.setdefault(rng.min_col, set()))
+                rows_by_col[rng.min_col].add(r)
+        self.assertEqual([ws.cell(row=r, column=5).value for r in range(2, 9)],
+                         ["a1", "a2", "b1", "b2", "a3", "a4", "b3"])
+        self.assertEqual([ws.cell(row=r, column=1).value for r in range(2, 9)],
+                         ["A", None, "B", None, "A", None, "B"])
+
+    def test_link_only_on_first_row_of_id(self):
+        ws = _sheet([_doc("A", "a1", "a2"), _doc("B", "b1"), _doc("A", "a3")])
+        links = {c.coordinate: c.hyperlink.target for row in ws.iter_rows() for c in row if c.hyperlink}
+        self.assertEqual(links, {"F2": "https://example.com/a1", "F4": "https://example.com/b1"})
+        self.assertEqual(ws["F2"].font.color.rgb[-6:], f2e.LINK_BLUE)
+        self.assertTrue(ws["F2"].alignment.wrap_text)
+        self.assertEqual(ws["F2"].border.left.style, "thin")
+
+    def test_single_row_per_id_has_no_merges(self):
+        ws = _sheet([_doc("A", "a"), _doc("B", "b"), _doc("A", "c")])
+        self.assertEqual(len(ws.merged_cells.ranges), 0)
+        self.assertEqual(ws["D2"].alignment.vertical, "top")
+        self.assertFalse(ws["D2"].alignment.wrap_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
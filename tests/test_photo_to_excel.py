@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""photo_to_excel 엑셀 생성 회귀 테스트 (python -m unittest / pytest 모두 실행 가능)"""
+import io
+import unittest
+
+import openpyxl
+
+from dataly_manager.dataly_tools import photo_to_excel as p2e
+
+
+def _doc(doc_id, *sents):
+    return {"id": doc_id, "metadata": {"url": "https://example.com/" + sents[0]},
+            "EX": [{"exp_sentence": [{"a": list(sents)}]}]}
+
+
+def _sheet(docs):
+    wb = openpyxl.load_workbook(io.BytesIO(p2e.photo_json_to_xlsx_bytes({"document": docs})))
+    return wb["result"]
+
+
+class WriteExcelMergeTest(unittest.TestCase):
+    def test_interleaved_ids_are_merged_per_contiguous_run(self):
+        docs = [_doc("A", "a1", "a2"), _doc("B", "b1", "b2"), _doc("A", "a3", "a4"), _doc("B", "b3")]
+        ws = _sheet(docs)
+        merged = {str(r) for r in ws.merged_cells.ranges}
+        self.assertIn("A2:A3", merged)
+        self.assertIn("A4:A5", merged)
+        self.assertIn("A6:A7", merged)
+        self.assertEqual([ws.cell(row=r, column=5).value for r in range(2, 9)],
+                         ["a1", "a2", "b1", "b2", "a3", "a4", "b3"])
+
+    def test_blank_ids_do_not_overlap(self):
+        # 5번째 문서마다 id가 비어 있으면 빈 id 문서들이 하나의 id로 묶임
+        docs = [_doc("" if i % 5 == 0 else f"D{i}", f"s{i}a", f"s{i}b") for i in range(15)]
+        ws = _sheet(docs)
+        self.assertEqual(ws.max_row, 31)
+        rows_by_col = {}
+        for rng in ws.merged_cells.ranges:
+            self.assertEqual(rng.max_row - rng.min_row, 1)  # 문서마다 두 행씩 병합
+            for r in range(rng.min_row, rng.max_row + 1):
+                self.assertNotIn(r, rows_by_col.setdefault(rng.min_col, set()))
+                rows_by_col[rng.min_col].add(r)
+        self.assertEqual([ws.cell(row=r, column=5).value for r in range(2, 32)],
+                         [f"s{i}{x}" for i in range(15) for x in "ab"])
+
+    def test_single_row_per_id_has_no_merges(self):
+        ws = _sheet([_doc("A", "a"), _doc("B", "b"), _doc("A", "c")])
+        self.assertEqual(len(ws.merged_cells.ranges), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
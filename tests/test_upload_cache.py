@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""upload_cache 세션 캐시(LRU, file_id 없을 때 이름+크기 키) 테스트 (python -m unittest / pytest 모두 실행 가능)"""
+import types
+import unittest
+from unittest import mock
+
+from dataly_manager.ui import upload_cache
+
+
+def _upload(file_id=None, name="a.json", size=10):
+    # UploadedFile 대신 키 계산에 쓰는 속성만 가진 객체
+    return types.SimpleNamespace(file_id=file_id, name=name, size=size)
+
+
+class GetOrBuildTest(unittest.TestCase):
+    def setUp(self):
+        self.session_state = {}
+        patcher = mock.patch.object(upload_cache, "st", types.SimpleNamespace(session_state=self.session_state))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = []
+
+    def _build(self, value):
+        def build():
+            self.calls.append(value)
+            return value
+        return build
+
+    def test_reuses_result_for_same_upload(self):
+        up = _upload("f1")
+        self.assertEqual(upload_cache.get_or_build(up, "cache", self._build("x")), "x")
+        self.assertEqual(upload_cache.get_or_build(up, "cache", self._build("y")), "x")
+        self.assertEqual(self.calls, ["x"])
+        self.assertEqual(upload_cache.lookup(up, "cache"), "x")
+        self.assertIsNone(upload_cache.lookup(None, "cache"))
+        self.assertIsNone(upload_cache.lookup(_upload("f2"), "cache"))
+
+    def test_extra_is_part_of_key(self):
+        up = _upload("f1")
+        upload_cache.get_or_build(up, "cache", self._build("s1"), extra="Sheet1")
+        upload_cache.get_or_build(up, "cache", self._build("s2"), extra="Sheet2")
+        self.assertEqual(upload_cache.lookup(up, "cache", extra="Sheet1"), "s1")
+        self.assertEqual(upload_cache.lookup(up, "cache", extra="Sheet2"), "s2")
+        self.assertIsNone(upload_cache.lookup(up, "cache"))
+
+    def test_name_size_fallback_without_file_id(self):
+        self.assertEqual(upload_cache.upload_key(_upload(None, "a.json", 10)), ("a.json", 10))
+        self.assertEqual(upload_cache.upload_key(_upload("f1", "a.json", 10)), "f1")
+        upload_cache.get_or_build(_upload(None, "a.json", 10), "cache", self._build("a"))
+        self.assertEqual(upload_cache.lookup(_upload(None, "a.json", 10), "cache"), "a")
+        self.assertIsNone(upload_cache.lookup(_upload(None, "a.json", 11), "cache"))
+        self.assertEqual(list(self.session_state["cache"]), [(("a.json", 10), None)])
+
+    def test_lru_evicts_least_recently_used(self):
+        ups = [_upload(f"f{i}") for i in range(4)]
+        for i, up in enumerate(ups[:3]):
+            upload_cache.get_or_build(up, "cache", self._build(i), max_entries=3)
+        upload_cache.get_or_build(ups[0], "cache", self._build("again"), max_entries=3)  # f0을 최근 사용으로
+        upload_cache.get_or_build(ups[3], "cache", self._build(3), max_entries=3)  # f1 제거
+        self.assertIsNone(upload_cache.lookup(ups[1], "cache"))
+        self.assertEqual([upload_cache.lookup(up, "cache") for up in (ups[0], ups[2], ups[3])], [0, 2, 3])
+        self.assertEqual(self.calls, [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
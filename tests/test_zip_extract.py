@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""zip_extract.extract_members 경로 정리(zip-slip 방지) 테스트 (python -m unittest / pytest 모두 실행 가능)"""
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from dataly_manager.dataly_tools import zip_extract
+
+
+def _zip(entries):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+    buf.seek(0)
+    return zipfile.ZipFile(buf)
+
+
+def _tree(root):
+    out = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        prefix = "" if rel == "." else rel + "/"
+        for d in dirnames:
+            out[f"{prefix}{d}/"] = None
+        for f in filenames:
+            with open(os.path.join(dirpath, f), "rb") as fh:
+                out[prefix + f] = fh.read()
+    return out
+
+
+class ExtractMembersTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.outer = self._tmp.name
+        self.dest = os.path.join(self.outer, "dest")
+        os.makedirs(self.dest)
+
+    def test_paths_stay_inside_dest(self):
+        zf = _zip([
+            ("../x.json", b"up"),
+            ("/abs/y.json", b"abs"),
+            ("a/../../z.json", b"mid"),
+            ("a\\b.json", b"backslash"),
+            ("./c/./d.json", b"dot"),
+            ("..", b""),
+        ])
+        self.assertEqual(zip_extract.extract_members(zf, self.dest), 5)
+        self.assertEqual(os.listdir(self.outer), ["dest"])  # dest 밖으로 나간 파일 없음
+        self.assertEqual(_tree(self.dest), {
+            "x.json": b"up",
+            "abs/": None, "abs/y.json": b"abs",
+            "a/": None, "a/z.json": b"mid", "a/b.json": b"backslash",
+            "c/": None, "c/d.json": b"dot",
+        })
+
+    def test_directory_entries_and_keep(self):
+        zf = _zip([
+            ("root/", b""),
+            ("root/empty/", b""),
+            ("root/A001/doc.json", b"{}"),
+            ("root/A001/skip.txt", b"x"),
+        ])
+        count = zip_extract.extract_members(zf, self.dest, keep=lambda zi: zi.filename.endswith(".json"))
+        self.assertEqual(count, 1)
+        self.assertEqual(_tree(self.dest), {
+            "root/": None, "root/empty/": None, "root/A001/": None, "root/A001/doc.json": b"{}",
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()